@@ -1,7 +1,43 @@
 """AutoGraphica_Main
 This is the main module, and is responsible forr building the foundations of the App.
+Run with '--startup-timing' (or set 'AUTOGRAPHICA_STARTUP_TIMING=1') to print how long the app took to start.
+Run with '--profile-charts' (or set 'AUTOGRAPHICA_PROFILE') to write a cProfile pstats file for every chart created.
+Run with '--watch' (or set 'AUTOGRAPHICA_WATCH') to keep the charts up to date with any rows appended to the file.
+Run with '--chart-budget N' (or set 'AUTOGRAPHICA_CHART_BUDGET') to only create the N most informative charts of each chart type.
 """
 
+import os
+import sys
+import time
+import multiprocessing
+
+# === Startup-time measurement mode ===
+# Kivy parses the command line itself, so the flag must be removed before kivy is imported.
+startup_timing = "--startup-timing" in sys.argv or os.environ.get("AUTOGRAPHICA_STARTUP_TIMING") == "1"
+if "--startup-timing" in sys.argv:
+    sys.argv.remove("--startup-timing")
+startup_clock = {"start": time.perf_counter()}
+
+# === Per-chart profiling mode ===
+# The chart modules read 'AUTOGRAPHICA_PROFILE' when they are imported (see 'root.support_profiling').
+if "--profile-charts" in sys.argv:
+    sys.argv.remove("--profile-charts")
+    os.environ.setdefault("AUTOGRAPHICA_PROFILE", "1")
+
+# === Watch mode ===
+# The display page checks the file for appended rows while 'AUTOGRAPHICA_WATCH' is set (see 'root.support_file_watcher').
+if "--watch" in sys.argv:
+    sys.argv.remove("--watch")
+    os.environ.setdefault("AUTOGRAPHICA_WATCH", "on")
+
+# === Chart budget ===
+# The chart classes only create the top 'AUTOGRAPHICA_CHART_BUDGET' charts they plan (see 'root.support_chart_plan').
+if "--chart-budget" in sys.argv:
+    flag_index = sys.argv.index("--chart-budget")
+    if flag_index + 1 < len(sys.argv):
+        os.environ.setdefault("AUTOGRAPHICA_CHART_BUDGET", sys.argv[flag_index + 1])
+    del sys.argv[flag_index:flag_index + 2]
+
 from kivy.config import Config
 Config.set('graphics', 'fullscreen', '0')
 Config.set('graphics', 'resizable', True)
@@ -9,33 +45,20 @@ Config.set('input', 'mouse', 'mouse,multitouch_on_demand')
 Config.write()
     
 
-import os
-import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
+# pandas, matplotlib and seaborn are not imported here, they are only imported once a file is chosen and a chart is created.
 from kivy.resources import resource_add_path
 from kivymd.app import MDApp
 from kivy.lang import Builder
+from kivy.clock import Clock
 from kivy.utils import platform
 from kivy.core.window import Window
 from kivymd.uix.screenmanager import MDScreenManager
-from kivymd.uix.boxlayout import MDBoxLayout
-from kivymd.uix.floatlayout import MDFloatLayout
-from kivymd.uix.toolbar import MDTopAppBar
-from kivymd.uix.menu import MDDropdownMenu
-from kivymd.uix.dialog import MDDialog
-from kivymd.uix.button import MDFlatButton, MDRaisedButton
 from kivymd.uix.segmentedbutton import MDSegmentedButton, MDSegmentedButtonItem
-from kivymd.uix.scrollview import MDScrollView
-from kivymd.uix.label.label import MDLabel
-from kivymd.icon_definitions import md_icons
 
-from root.instantiation_file_controller import FileController
-from root.instantiation_create_chart_instance import CreateChartInstance
 from app_get_attributes import DefineAttributes
 from app_topbar import TopBarTools
 from app_on_marked import OnMarked
@@ -43,10 +66,12 @@ from app_dialogs import Dialogs
 from app_facet_page import FacetPageInitialization
 from app_drop_down_menus import DropDownMenus
 from app_create_display_page import CreateDisplayPage
-from app_screens import FileModuleApp, HomePage, LinePage, ScatterPage, BarPage, BoxPage, PiePage, HistogramPage, MultiLinePage, MultiScatterPage, MultiBarPage, FacetPage, DisplayPage
+from app_screens import FileModuleApp, HomePage, DisplayPage
 
+startup_clock["imports"] = time.perf_counter()
 
 Builder.load_file(os.path.join(os.path.dirname(__file__), "AutoGraphica_Main.kv"))
+startup_clock["kv"] = time.perf_counter()
 
 class AutoGraphicaApp(FileModuleApp, MDApp):
 
@@ -86,21 +111,39 @@ class AutoGraphicaApp(FileModuleApp, MDApp):
         self.theme_cls.primary_palette = "Indigo"
         self.theme_cls.primary_hue = "100"
         
+        # The chart configuration pages are only built the first time the user navigates to them (see 'app_screens.LazyScreens').
         self.md_screen_manager = MDScreenManager()
         self.md_screen_manager.add_widget(HomePage(name="Home Page"))
-        self.md_screen_manager.add_widget(LinePage(name="Line Page"))
-        self.md_screen_manager.add_widget(ScatterPage(name="Scatter Page"))
-        self.md_screen_manager.add_widget(BarPage(name="Bar Page"))
-        self.md_screen_manager.add_widget(BoxPage(name="Box Page"))
-        self.md_screen_manager.add_widget(PiePage(name="Pie Page"))
-        self.md_screen_manager.add_widget(HistogramPage(name="Histogram Page"))
-        self.md_screen_manager.add_widget(MultiLinePage(name="MultiLine Page"))
-        self.md_screen_manager.add_widget(MultiScatterPage(name="MultiScatter Page"))
-        self.md_screen_manager.add_widget(MultiBarPage(name="MultiBar Page"))
-        self.md_screen_manager.add_widget(FacetPage(name="Facet Page"))
         self.md_screen_manager.add_widget(DisplayPage(name="Display Page"))
+        startup_clock["build"] = time.perf_counter()
         return self.md_screen_manager
     
+    def on_start(self):
+
+        "This function is called once the window has been created, and reports the startup time if the startup-time measurement mode is on."
+        
+        if startup_timing is True:
+            # The callback is only called after the next frame has been drawn.
+            Clock.schedule_once(self.report_startup_time, 0)
+    
+    @staticmethod
+    def report_startup_time(*args):
+
+        "This function prints how long each stage of the startup took, and whether any heavy modules were imported before the first frame."
+        
+        startup_clock["first_frame"] = time.perf_counter()
+        stages = ["imports", "kv", "build", "first_frame"]
+        previous = startup_clock["start"]
+        
+        print("=== AutoGraphica startup timing ===")
+        for stage in stages:
+            print(f"{stage:<12} {startup_clock[stage] - previous:7.3f}s")
+            previous = startup_clock[stage]
+        print(f"{'total':<12} {startup_clock['first_frame'] - startup_clock['start']:7.3f}s")
+        
+        heavy_modules = [module for module in ["numpy", "pandas", "matplotlib", "seaborn"] if module in sys.modules]
+        print(f"modules loaded: {len(sys.modules)}, heavy modules loaded: {heavy_modules if len(heavy_modules) > 0 else 'none'}")
+    
     # === Add to create executable with PyInstaller ===
     # we need a function to make our script look in the correct folder for files
     # when pyinstaller has created the MEIPASS directory then we need to look in there. 
@@ -271,8 +314,9 @@ class AutoGraphicaApp(FileModuleApp, MDApp):
         the chart type the user would have selected on the Home Page Nav Rail.
         """
         
-        home_instance = HomePage()
-        url_input = self.md_screen_manager.get_screen('Home Page').ids.name_input.text
+        # Use the Home Page that is already built, rather than building (and applying the KV rules to) a new one on every click.
+        home_instance = self.md_screen_manager.get_screen('Home Page')
+        url_input = home_instance.ids.name_input.text
         
         # Extract the dataframe, and any high-cardinal x, and y-axis variables for the 'Facet' Screen. 
         self.dataframe, facet_check = home_instance.call_change_nav_screen(id_, url_input, self.md_screen_manager)
@@ -397,13 +441,13 @@ class AutoGraphicaApp(FileModuleApp, MDApp):
 
         "Returns to the Home Page, when the 'Home' button is clicked"
         
-        TopBarTools.return_home(instance, self.md_screen_manager)
+        TopBarTools.return_home(self, instance, self.md_screen_manager)
         
     def back_(self):
 
         "Returns to whatever the previous page the user was on"
         
-        TopBarTools.back_(self, screen_manager=self.md_screen_manager, main_swiper=self.main_swiper)
+        TopBarTools.back_(self, screen_manager=self.md_screen_manager)
         
     def previous(self):
 
@@ -475,6 +519,9 @@ class AutoGraphicaApp(FileModuleApp, MDApp):
     
 if __name__ == "__main__":
     
+    # === Stops a worker process of the frozen executable from starting the App again ===
+    multiprocessing.freeze_support()
+    
     # === Add to create an executable with PyInstaller ===
     if hasattr(sys, '_MEIPASS'):
         resource_add_path((os.path.join(sys._MEIPASS)))
@@ -7,7 +7,7 @@ a = Analysis(
     ['AutoGraphica_Main.py'],
     pathex=["C:\\################################################\\AutoGraphica_v8\\exe"],
     binaries=[],
-    datas=[('AutoGraphica_Main.kv', '.'), ("app_create_display_page.py", "."), ("app_dialogs.py", "."), ("app_drop_down_menus.py", "."), ("app_facet_page.py", "."), ("app_get_attributes.py", "."), ("app_information.py", "."), ("app_on_marked.py", "."), ("app_screens.py", "."), ("app_topbar.py", "."), ("./root/instantiation_create_chart_instance.py", "root"), ("./root/instantiation_chart_rules.py", "root"), ("./root/instantiation_file_controller.py", "root"), ("./root/support_date_time_operations.py", "root"), ("./root/support_plotting.py", "root"), ("./root/support_facets.py", "root"), ("./root/support_rcParams.py", "root"),("./root/support_main_classes.py", "root"), ("./root/plot_bar_chart.py", "root"), ("./root/plot_box_plot.py", "root"), ("./root/plot_facet_plot.py", "root"), ("./root/plot_histogram.py", "root"), ("./root/plot_line_graph.py", "root"), ("./root/plot_multi_bar_chart.py", "root"), ("./root/plot_multi_line_graph.py", "root"), ("./root/plot_multi_scatter_plot.py", "root"),("./root/plot_pie_chart.py", ".root"), ("./root/plot_scatter_plot.py", "root"),("./images/bar_chart.png", "images"), ("./images/box_plot.png", "images"), ("./images/facet_plot.png", "images"), ("./images/histogram_chart.png", "images"), ("./images/line_chart.png", "images"), ("./images/multi_bar_chart.png", "images"), ("./images/multi_line_graph.png", "images"), ("./images/multi_scatter_plot.png", "images"), ("./images/pie_chart.png", "images"), ("./images/scatter_plot.png", "images"), ("./images/home_page_design.jpg", "images"), ("./images/page_design.png", "images"), ("./libs/garden/garden_matplotlib/backend_kivyagg.py", "garden_matplotlib")],
+    datas=[('AutoGraphica_Main.kv', '.'), ("app_create_display_page.py", "."), ("app_dialogs.py", "."), ("app_drop_down_menus.py", "."), ("app_facet_page.py", "."), ("app_get_attributes.py", "."), ("app_information.py", "."), ("app_on_marked.py", "."), ("app_screens.py", "."), ("app_topbar.py", "."), ("./root/instantiation_create_chart_instance.py", "root"), ("./root/instantiation_chart_rules.py", "root"), ("./root/instantiation_file_controller.py", "root"), ("./root/support_date_time_operations.py", "root"), ("./root/support_plotting.py", "root"), ("./root/support_facets.py", "root"), ("./root/support_rcParams.py", "root"),("./root/support_main_classes.py", "root"), ("./root/support_file_cache.py", "root"), ("./root/support_excel.py", "root"), ("./root/support_tracing.py", "root"), ("./root/support_memory.py", "root"), ("./root/support_profiling.py", "root"), ("./root/support_file_watcher.py", "root"), ("./root/support_chart_plan.py", "root"), ("./root/support_figure_pool.py", "root"), ("./root/support_chart_data.py", "root"), ("./root/support_gallery.py", "root"), ("./root/support_display_session.py", "root"), ("./root/support_temporal_axis.py", "root"), ("./root/support_column_statistics.py", "root"), ("./root/support_cardinality.py", "root"), ("./root/plot_bar_chart.py", "root"), ("./root/plot_box_plot.py", "root"), ("./root/plot_facet_plot.py", "root"), ("./root/plot_histogram.py", "root"), ("./root/plot_line_graph.py", "root"), ("./root/plot_multi_bar_chart.py", "root"), ("./root/plot_multi_line_graph.py", "root"), ("./root/plot_multi_scatter_plot.py", "root"),("./root/plot_pie_chart.py", ".root"), ("./root/plot_scatter_plot.py", "root"),("./images/bar_chart.png", "images"), ("./images/box_plot.png", "images"), ("./images/facet_plot.png", "images"), ("./images/histogram_chart.png", "images"), ("./images/line_chart.png", "images"), ("./images/multi_bar_chart.png", "images"), ("./images/multi_line_graph.png", "images"), ("./images/multi_scatter_plot.png", "images"), ("./images/pie_chart.png", "images"), ("./images/scatter_plot.png", "images"), ("./images/home_page_design.jpg", "images"), ("./images/page_design.png", "images"), ("./libs/garden/garden_matplotlib/backend_kivyagg.py", "garden_matplotlib"), ("./kv/line_page.kv", "kv"), ("./kv/scatter_page.kv", "kv"), ("./kv/bar_page.kv", "kv"), ("./kv/box_page.kv", "kv"), ("./kv/pie_page.kv", "kv"), ("./kv/histogram_page.kv", "kv"), ("./kv/multi_line_page.kv", "kv"), ("./kv/multi_scatter_page.kv", "kv"), ("./kv/multi_bar_page.kv", "kv"), ("./kv/facet_page.kv", "kv")],
     hiddenimports=["seaborn"],
     hookspath=[],
     hooksconfig={},
@@ -5,15 +5,20 @@ This module is responsible for creating the Display page of the app (i.e. where
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+# The 'root' modules import each other by name, so the tracer is shared with them by importing it the same way.
+root_dir = os.path.join(file_dir, "root")
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
 
+from functools import partial
+from kivy.clock import Clock
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.swiper.swiper import MDSwiper
 from kivymd.uix.swiper.swiper import MDSwiperItem
-from app_screens import DisplayPage
-from root.instantiation_create_chart_instance import CreateChartInstance
-from libs.garden.garden_matplotlib.backend_kivyagg import FigureCanvasKivyAgg
-from libs.garden.garden_matplotlib import backend_kivy
+from support_tracing import tracer
+from support_memory import memory_monitor
 
 
 class CreateDisplayPage:
@@ -42,33 +47,231 @@ class CreateDisplayPage:
             A boolean value dictating whether any facet operations need to be performed on the plot.
         """
         
-        main_app_instance.md_screen_manager.add_widget(DisplayPage(name="Display Page"))                           
-        main_app_instance.display_instance = main_app_instance.md_screen_manager.get_screen('Display Page')
-                                   
-        # Access the main swiper 
-        main_app_instance.main_swiper = main_app_instance.md_screen_manager.get_screen('Display Page').ids.swiper
+        from root.support_display_session import DisplaySession
         
-        if facet_chart is False:
-            main_app_instance.chart_list = CreateDisplayPage.return_chart_instance(main_app_instance, dataframe, chart_type, chart_attributes, facet_chart=False)
-        else:
-            main_app_instance.chart_list = CreateDisplayPage.return_chart_instance(main_app_instance, dataframe, chart_type, chart_attributes, facet_chart=True)
-
-        print(main_app_instance.chart_list)
+        # The Display page is built once (see 'AutoGraphica_Main.build'), and reused by every session. Any session still open is closed first.
+        CreateDisplayPage.close_display_session(main_app_instance)
+        if getattr(main_app_instance, "display_instance", None) is None:
+            main_app_instance.display_instance = main_app_instance.md_screen_manager.get_screen('Display Page')
+                                       
+            # Access the main swiper 
+            main_app_instance.main_swiper = main_app_instance.display_instance.ids.swiper
+            
+            # The live canvases follow the current slide (the swiper dispatches 'on_pre_swipe' once its current index has changed).
+            main_app_instance.main_swiper.bind(on_pre_swipe=partial(CreateDisplayPage.show_current_charts, main_app_instance))
+        
+        with tracer.span("create_charts", "chart", chart_type=chart_type, facet_chart=facet_chart) as span:
+            if facet_chart is False:
+                main_app_instance.chart_list = CreateDisplayPage.return_chart_instance(main_app_instance, dataframe, chart_type, chart_attributes, facet_chart=False)
+            else:
+                main_app_instance.chart_list = CreateDisplayPage.return_chart_instance(main_app_instance, dataframe, chart_type, chart_attributes, facet_chart=True)
+            span.set(charts=len(main_app_instance.chart_list) if main_app_instance.chart_list is not None else 0)
+        memory_monitor.record_figures(main_app_instance.chart_list)
+        
+        # The session frees the charts once the Display page is left (see 'support_display_session').
+        main_app_instance.display_session = DisplaySession(chart_type, main_app_instance.chart_list, main_app_instance.chart_instance, main_app_instance.file_refresh)
                     
         if main_app_instance.chart_list is not None:
-            for chart in main_app_instance.chart_list:
-                box = MDBoxLayout()
-                box.add_widget(FigureCanvasKivyAgg(chart))
-                
-                # create the swiper object
-                swiper = MDSwiperItem()
-                swiper.add_widget(box)
-                
-                main_app_instance.main_swiper.add_widget(swiper)
-
-        print('finding the children')
-        for child in main_app_instance.main_swiper.children:
-            print(child)
+            with memory_monitor.stage("display_page", chart_type=chart_type, charts=len(main_app_instance.chart_list)):
+                CreateDisplayPage.add_chart_items(main_app_instance, main_app_instance.chart_list)
+
+        tracer.counter("gallery", "display", swiper_items=len(main_app_instance.main_swiper.get_items()))
+        tracer.counter("memory_in_use", "display", **main_app_instance.display_session.memory_in_use())
+        
+        # In the watch mode, the file is checked for new rows for as long as this display page is shown.
+        if getattr(main_app_instance, "file_refresh", None) is not None:
+            Clock.schedule_interval(partial(CreateDisplayPage.refresh_display_page, main_app_instance, main_app_instance.file_refresh,
+                                            chart_type, chart_attributes, facet_chart),
+                                    main_app_instance.file_refresh.poll_interval())
+
+    
+    @staticmethod
+    def add_chart_items(main_app_instance, chart_list: list):
+
+        """This function adds a swiper item to the display page for each chart in the chart list. Only the current slide and its neighbours
+        are given a live canvas, the others are given one once they're shown (see 'support_gallery').
+
+        Parameters
+        ----------
+        main_app_instance: kivy.MDApp
+            The main app instance should be passed into this function.
+        chart_list: list
+            The list of Matplotlib figures to display.
+        """
+        
+        from root.support_gallery import ChartGallery
+        
+        main_app_instance.chart_boxes = []
+        main_app_instance.chart_gallery = ChartGallery(chart_list, getattr(main_app_instance, "chart_instance", None), getattr(main_app_instance, "file_refresh", None))
+        main_app_instance.display_session.chart_gallery = main_app_instance.chart_gallery
+        
+        for chart_index in range(0, len(chart_list)):
+            box = MDBoxLayout()
+            main_app_instance.chart_boxes.append(box)
+            
+            # create the swiper object
+            swiper = MDSwiperItem()
+            swiper.add_widget(box)
+            
+            main_app_instance.main_swiper.add_widget(swiper)
+        
+        CreateDisplayPage.show_current_charts(main_app_instance)
+    
+    
+    @staticmethod
+    def show_current_charts(main_app_instance, *args):
+
+        """This function gives the current slide and its neighbours a live canvas, and removes the live canvas of any other slide.
+        Any figure over the memory cap of the gallery is dropped, and created again once its slide is shown (see 'support_gallery').
+
+        Parameters
+        ----------
+        main_app_instance: kivy.MDApp
+            The main app instance should be passed into this function.
+        """
+        
+        # matplotlib (and its Kivy backend) is only imported once the first chart is displayed, rather than when the app starts.
+        from libs.garden.garden_matplotlib.backend_kivyagg import FigureCanvasKivyAgg
+        
+        chart_gallery = getattr(main_app_instance, "chart_gallery", None)
+        if chart_gallery is None or len(main_app_instance.chart_boxes) == 0:
+            return
+        
+        added, removed_indexes = chart_gallery.show(main_app_instance.main_swiper.get_current_index())
+        for chart_index in removed_indexes:
+            CreateDisplayPage.release_canvases(main_app_instance.chart_boxes[chart_index])
+        
+        for chart_index, chart in added:
+            # Creating the canvas draws the figure and uploads it as a texture (see 'backend_kivyagg.FigureCanvasKivyAgg.draw').
+            with tracer.span("display_chart", "display", chart_index=chart_index):
+                CreateDisplayPage.release_canvases(main_app_instance.chart_boxes[chart_index])
+                main_app_instance.chart_boxes[chart_index].add_widget(FigureCanvasKivyAgg(chart))
+        
+        live_canvases, figures = chart_gallery.live_count()
+        tracer.counter("gallery", "display", live_canvases=live_canvases, figures=figures)
+    
+    
+    @staticmethod
+    def release_canvases(box):
+
+        """This function removes the canvas of a slide, freeing its texture (see 'backend_kivyagg.FigureCanvasKivyAgg.release').
+
+        Parameters
+        ----------
+        box: kivymd.uix.boxlayout.MDBoxLayout
+            The box layout of the slide.
+        """
+        
+        for canvas in box.children:
+            canvas.release()
+        box.clear_widgets()
+    
+    
+    @staticmethod
+    def close_display_session(main_app_instance):
+
+        """This function closes the display session once the Display page is left (or the charts are generated again): every canvas is removed
+        and its texture freed, every slide is removed from the swiper, and the figures are released (see 'support_display_session').
+        The Display page itself is kept, and reused by the next session.
+
+        Parameters
+        ----------
+        main_app_instance: kivy.MDApp
+            The main app instance should be passed into this function.
+        """
+        
+        for box in getattr(main_app_instance, "chart_boxes", []):
+            CreateDisplayPage.release_canvases(box)
+        
+        main_swiper = getattr(main_app_instance, "main_swiper", None)
+        if main_swiper is not None:
+            # delete the 'MDSwiperItems' within the box layout, within the 'main_swiper', and start the next session from the first slide.
+            main_swiper.children[0].clear_widgets()
+            main_swiper._selected = 0
+            main_swiper.scroll_x = 0
+        
+        display_session = getattr(main_app_instance, "display_session", None)
+        if display_session is not None:
+            display_session.close(retain_dataframe=getattr(main_app_instance, "dataframe", None))
+        
+        # Stopping the watch mode ('file_refresh' no longer being the one scheduled) stops the file being checked (see 'refresh_display_page').
+        main_app_instance.display_session = None
+        main_app_instance.chart_list = None
+        main_app_instance.chart_boxes = []
+        main_app_instance.chart_gallery = None
+        main_app_instance.chart_instance = None
+        main_app_instance.file_refresh = None
+    
+    
+    @staticmethod
+    def refresh_display_page(main_app_instance, file_refresh, chart_type: str, chart_attributes: list, facet_chart: bool, *args):
+
+        """This function is called every poll interval in the watch mode (see 'support_file_watcher'), and updates the display page with any rows appended to the file.
+        Only the charts whose columns changed are drawn again. If the file changed in any other way, it is loaded again and every chart is created again.
+        Returning 'False' stops the file being watched, once the display page has been left.
+
+        Parameters
+        ----------
+        main_app_instance: kivy.MDApp
+            The main app instance should be passed into this function.
+        file_refresh: support_file_watcher.IncrementalRefresh
+            The incremental refresh of the charts on the display page.
+        chart_type: str
+            The chart type of interest selected by the user.
+        chart_attributes: list
+            A list of all the chart attributes the user wishes to configure the plot with.
+        facet_chart: bool
+            A boolean value dictating whether any facet operations need to be performed on the plot.
+        """
+        
+        from libs.garden.garden_matplotlib.backend_kivyagg import FigureCanvasKivyAgg
+        
+        if main_app_instance.file_refresh is not file_refresh:
+            return False
+        
+        status, chart_indexes = file_refresh.refresh(main_app_instance.chart_list)
+        
+        if status == "refreshed":
+            # Only the slides with a live canvas are drawn again, the others are drawn once they're shown.
+            main_app_instance.chart_gallery.refreshed(chart_indexes)
+            for chart_index in chart_indexes:
+                if chart_index in main_app_instance.chart_gallery.live_indexes:
+                    box = main_app_instance.chart_boxes[chart_index]
+                    CreateDisplayPage.release_canvases(box)
+                    box.add_widget(FigureCanvasKivyAgg(main_app_instance.chart_list[chart_index]))
+        
+        elif status in ["replotted", "reload"]:
+            current_index = main_app_instance.main_swiper.get_current_index()
+            if status == "reload":
+                from root.instantiation_file_controller import FileController
+                from root.support_display_session import DisplaySession
+                attrs = file_refresh.overview.dataframe.attrs
+                dataframe = FileController(attrs["source_path"], chart_type, attrs.get("source_sheet")).dataframe
+                if dataframe is None:
+                    return True
+                # The figures of the file as it was are freed, and a new session is opened for the file loaded again.
+                main_app_instance.dataframe = dataframe
+                CreateDisplayPage.close_display_session(main_app_instance)
+                main_app_instance.chart_list = CreateDisplayPage.return_chart_instance(main_app_instance, dataframe, chart_type, chart_attributes, facet_chart)
+                main_app_instance.display_session = DisplaySession(chart_type, main_app_instance.chart_list, main_app_instance.chart_instance, main_app_instance.file_refresh)
+            else:
+                for box in main_app_instance.chart_boxes:
+                    CreateDisplayPage.release_canvases(box)
+                main_app_instance.main_swiper.children[0].clear_widgets()
+            
+            CreateDisplayPage.add_chart_items(main_app_instance, main_app_instance.chart_list or [])
+            if 0 <= current_index < len(main_app_instance.chart_boxes):
+                main_app_instance.main_swiper.set_current(current_index)
+            
+            # A reload creates a new incremental refresh, which is watched from now on instead.
+            if status == "reload":
+                if main_app_instance.file_refresh is not None:
+                    Clock.schedule_interval(partial(CreateDisplayPage.refresh_display_page, main_app_instance, main_app_instance.file_refresh,
+                                                    chart_type, chart_attributes, facet_chart),
+                                            main_app_instance.file_refresh.poll_interval())
+                return False
+        
+        return True
 
     
     @staticmethod
@@ -90,13 +293,25 @@ class CreateDisplayPage:
             A boolean value dictating whether any facet operations need to be performed on the plot.
         """
     
+        from root.instantiation_create_chart_instance import CreateChartInstance
+        from root.support_file_watcher import IncrementalRefresh
+        
         # So now we have a DataFrame 
         chart_creator_instance = CreateChartInstance(pd_dataframe=dataframe,
                                                      chart_type=chart_type,
                                                      chart_parameters=chart_attributes)
         chart_instance = chart_creator_instance.validate_chart_attributes()
+        main_app_instance.file_refresh = None
+        # The gallery creates any figure it dropped again with the chart instance (see 'support_gallery').
+        main_app_instance.chart_instance = chart_instance
         
         if chart_instance is not None:
+            # In the watch mode, every chart created is recorded, so it can be drawn again in place from the new rows.
+            if IncrementalRefresh.is_enabled() is True and chart_instance.overview.dataframe.attrs.get("source_path") is not None:
+                main_app_instance.file_refresh = IncrementalRefresh(chart_instance)
+            
+            # Keep hold of the converted DataFrame, so that any later charts share it rather than converting (and copying) the file again.
+            main_app_instance.dataframe = chart_instance.overview.dataframe
             
             if facet_chart is False:
                 chart_list = chart_instance.plot_multiple_charts()
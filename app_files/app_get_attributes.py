@@ -2,8 +2,6 @@
 This module is responsible for collecting all the attributes entered on page by the user.
 """
 
-from matplotlib.colors import is_color_like
-
 
 class AttributeContainer:
 
@@ -253,6 +251,9 @@ class AttributeChecker:
 
         "Returns whether a color submitted is a valid color"
         
+        # matplotlib is only imported once a chart is configured, rather than when the app starts.
+        from matplotlib.colors import is_color_like
+        
         if is_color_like(color) is True:
             return color
         elif color is None:
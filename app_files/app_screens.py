@@ -5,16 +5,16 @@ This module is responsible for creating all Screens (Pages) in the app, with the
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 
-import pandas as pd
+from kivy.lang import Builder
 from kivy.uix.widget import Widget
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.filemanager import MDFileManager
 from kivymd.uix.navigationrail import MDNavigationRail
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.floatlayout import MDFloatLayout
-from root.instantiation_create_chart_instance import CreateChartInstance
 
 
 class FileModuleApp(Widget):
@@ -175,25 +175,32 @@ class HomePage(FileModuleApp, MDScreen, MDFloatLayout):
     """
     
     
-    def validate_dataframe(self, file_path: str):
+    def validate_dataframe(self, file_path: str, chart_type=None):
 
-        "This function validates the file inputted by the user, and if valid, creates a DataFrame from it."
+        """This function validates the file inputted by the user, and if valid, creates a DataFrame from it (or loads it from its sidecar).
+        If a chart type is specified, only the columns that chart type can use are loaded."""
         
-        file_path = file_path.strip()
+        # pandas is only imported once a file is chosen, rather than when the app starts.
+        from root.instantiation_file_controller import FileController
         
-        if os.path.exists(file_path) is True:   
-            if file_path.endswith(".csv"):
-                dataframe = pd.read_csv(file_path)
-            elif file_path.endswith(".xlsx"):
-                dataframe = pd.read_excel(file_path)
-            else:
-                dataframe = None    
-        else:
-            dataframe = None
-            
-        return dataframe
+        file_controller = FileController(file_path.strip(), chart_type, self.sheet_selection())
+        
+        return file_controller.dataframe
                     
                      
+    def sheet_selection(self):
+
+        """This function returns the sheet(s) of an Excel workbook entered by the user, separated by commas.
+        'None' (the first sheet) is returned if no sheet was entered."""
+        
+        sheet_names = [sheet_name.strip() for sheet_name in self.ids.sheet_input.text.split(",") if sheet_name.strip() != ""]
+        if len(sheet_names) == 0:
+            return None
+        elif len(sheet_names) == 1:
+            return sheet_names[0]
+        return sheet_names
+    
+    
     def disable_navrail(self):
 
         "This function enables/disables the nav rail depending on whether a valid file path has been inputted by the user."
@@ -205,7 +212,9 @@ class HomePage(FileModuleApp, MDScreen, MDFloatLayout):
             
         else:
             if os.path.isfile(input_text) is True:
-                dataframe = self.validate_dataframe(input_text)
+                from root.instantiation_file_controller import FileController
+                # Only the header is read here, as this is called every time the text changes. 
+                dataframe = FileController.read_header(input_text, self.sheet_selection())
                 # So now if a DataFrame is not created, the NavRail won't activate. 
                 if dataframe is not None:
                     self.ids.nav_rail.disabled = False
@@ -220,6 +229,7 @@ class HomePage(FileModuleApp, MDScreen, MDFloatLayout):
         "This function clears the URL textbox displayed on the Home Page of any text."
         
         self.ids.name_input.text = ""
+        self.ids.sheet_input.text = ""
         self.disable_navrail()
         
         
@@ -238,9 +248,12 @@ class HomePage(FileModuleApp, MDScreen, MDFloatLayout):
         """
 
         # dataframe = self.validate_dataframe(self.md_screen_manager.get_screen('Home Page').ids.name_input.text)
-        dataframe = self.validate_dataframe(home_url_path)
+        dataframe = self.validate_dataframe(home_url_path, chart_type=id_)
         
         if dataframe is not None:
+            # Each chart page is only built (and its KV rules loaded) the first time the user navigates to it.
+            LazyScreens.add_screen(screen_manager, f"{id_} Page")
+            
             if id_ == 'Line':
                 screen_manager.current = 'Line Page'
                 screen_manager.transition.direction = "left"
@@ -283,7 +296,7 @@ class HomePage(FileModuleApp, MDScreen, MDFloatLayout):
                 self.initialize_facet_variables()
                 screen_manager.current = 'Facet Page'
                 screen_manager.transition.direction = "left"
-                return dataframe, "is-facet"
+                return self.dataframe, "is-facet"
             
             return dataframe, "not-facet"
         
@@ -293,10 +306,14 @@ class HomePage(FileModuleApp, MDScreen, MDFloatLayout):
 
         "This function initializes any facet variables found within the file inputted by the user."
         
+        from root.instantiation_create_chart_instance import CreateChartInstance
+        
         chart_creator_instance = CreateChartInstance(pd_dataframe=self.dataframe,
                                                      chart_type="Facet",
                                                      chart_parameters=[None, None, None, None, None, None, None, None])
         chart_instance = chart_creator_instance.validate_chart_attributes()
+        # The Facet Page charts share the DataFrame converted here.
+        self.dataframe = chart_instance.overview.dataframe
         self.facet_high_cardinal_variables = chart_instance.high_cardinal_x_variables
         self.facet_y_variables = chart_instance.y_list
         
@@ -378,3 +395,53 @@ class DisplayPage(MDScreen):
     pass
 
 
+class LazyScreens:
+
+    """
+    This is a helper class (used through its class attributes and static methods, rather than instantiated or mixed in),
+    responsible for building each chart configuration page the first time the user navigates to it,
+    rather than building all of them (and loading all of their KV rules) when the app starts.
+    
+    Attributes
+    ----------
+    screen_classes: dict
+        The class and the KV file (within the 'kv' folder) of each chart configuration page, keyed by the name of the page.
+    loaded_kv_files: set
+        The KV files that have already been loaded by the Kivy Builder.
+    """
+
+    screen_classes = {'Line Page': (LinePage, 'line_page.kv'),
+                      'Scatter Page': (ScatterPage, 'scatter_page.kv'),
+                      'Bar Page': (BarPage, 'bar_page.kv'),
+                      'Box Page': (BoxPage, 'box_page.kv'),
+                      'Pie Page': (PiePage, 'pie_page.kv'),
+                      'Histogram Page': (HistogramPage, 'histogram_page.kv'),
+                      'MultiLine Page': (MultiLinePage, 'multi_line_page.kv'),
+                      'MultiScatter Page': (MultiScatterPage, 'multi_scatter_page.kv'),
+                      'MultiBar Page': (MultiBarPage, 'multi_bar_page.kv'),
+                      'Facet Page': (FacetPage, 'facet_page.kv')}
+    loaded_kv_files = set()
+    
+    @staticmethod
+    def add_screen(screen_manager, screen_name: str):
+
+        """This function adds a chart configuration page to the screen manager, if it has not been added already.
+        The KV rules of the page are loaded first, as they are applied when the page is created.
+
+        Parameters
+        ----------
+        screen_manager: kivyMD.MDScreenManager
+            The Kivy Screen Manager object used to manage all screens defined in the app.
+        screen_name: str
+            The name of the chart configuration page (e.g. 'Line Page').
+        """
+        
+        if screen_name not in LazyScreens.screen_classes or screen_manager.has_screen(screen_name):
+            return
+        
+        screen_class, kv_file = LazyScreens.screen_classes[screen_name]
+        if kv_file not in LazyScreens.loaded_kv_files:
+            Builder.load_file(os.path.join(os.path.dirname(__file__), "kv", kv_file))
+            LazyScreens.loaded_kv_files.add(kv_file)
+        
+        screen_manager.add_widget(screen_class(name=screen_name))
@@ -136,18 +136,18 @@ class TopBarTools:
         return "not-facet"
     
     @staticmethod
-    def return_home(instance, screen_manager):
+    def return_home(main_app_instance, instance, screen_manager):
 
         "This function returns the user to the Home screen, when the 'Home' button is selected."
         
         if screen_manager.current == "Display Page":
-            TopBarTools.remove_display_page(screen_manager)
+            TopBarTools.remove_display_page(main_app_instance)
             
         screen_manager.current = 'Home Page'
         screen_manager.transition.direction = "right"
     
     @staticmethod
-    def back_(main_app_instance, screen_manager, main_swiper):
+    def back_(main_app_instance, screen_manager):
 
         "This function goes back a previous page to either the chart configuration page the user was on, or the Home page."
         
@@ -156,10 +156,7 @@ class TopBarTools:
             screen_manager.current = main_app_instance.chosen_page
             screen_manager.transition.direction = "right"
         
-        # delete the 'MDSwiperItems' within the box layout, within the 'main_swiper'
-        swiper_box_layout = main_swiper.children[0]
-        swiper_box_layout.clear_widgets()
-        TopBarTools.remove_display_page(screen_manager)
+        TopBarTools.remove_display_page(main_app_instance)
     
     @staticmethod
     def previous(main_swiper):
@@ -178,11 +175,13 @@ class TopBarTools:
             main_swiper.set_current(main_swiper.get_current_index() + 1)    
             
     @staticmethod
-    def remove_display_page(screen_manager):
+    def remove_display_page(main_app_instance):
 
-        "This function removes the DisplayPage (blanks it) from the ScreenManager, so it can be recreated when a new chart is selected"
+        """This function blanks the DisplayPage once it is left, freeing every chart, canvas and texture it held (see 'app_create_display_page.close_display_session').
+        The DisplayPage itself is kept, and reused when a new chart is selected."""
         
-        screen_manager.remove_widget(screen_manager.get_screen('Display Page'))
+        from app_create_display_page import CreateDisplayPage
+        CreateDisplayPage.close_display_session(main_app_instance)
         
         
     @staticmethod
@@ -190,10 +189,10 @@ class TopBarTools:
 
         "This function saves a single figure when the 'Save' button is clicked"
         
-        if hasattr(main_app_instance, "chart_list"):
+        if getattr(main_app_instance, "chart_gallery", None) is not None:
 
             current_swiper_index = int(main_app_instance.main_swiper.get_current_index())
-            current_chart = main_app_instance.chart_list[current_swiper_index]
+            current_chart = main_app_instance.chart_gallery.figure(current_swiper_index)
             
             main_app_instance.open_file_manager(swiper_index=current_swiper_index,
                                                 chart_figure=current_chart,
@@ -205,9 +204,10 @@ class TopBarTools:
 
         "This function saves all figures when the 'Save All' button is clicked"
         
-        if hasattr(main_app_instance, "chart_list"):
+        if getattr(main_app_instance, "chart_gallery", None) is not None:
 
-            main_app_instance.open_file_manager(full_chart_list=main_app_instance.chart_list,
+            # Any figure the gallery dropped is created again as it is saved (see 'support_gallery').
+            main_app_instance.open_file_manager(full_chart_list=main_app_instance.chart_gallery.figures(),
                                                 chart_page=main_app_instance.chosen_page,
                                                 single_chart=False)
 
@@ -72,6 +72,7 @@ __all__ = ('FigureCanvasKivyAgg')
 import os
 import sys
 import six
+import contextlib
 
 import matplotlib
 from matplotlib._pylab_helpers import Gcf
@@ -88,6 +89,8 @@ except ImportError:
     raise ImportError("this backend requires Kivy to be installed.")
 
 from kivy.app import App
+from kivy.clock import Clock
+from kivy.core.window import Window
 from kivy.graphics.texture import Texture
 from kivy.graphics import Rectangle, Color
 from kivy.uix.widget import Widget
@@ -105,6 +108,8 @@ sys.path.append(file_dir)
 from backend_kivy import FigureCanvasKivy,\
                          FigureManagerKivy, show, new_figure_manager,\
                          NavigationToolbar2Kivy
+# 'app_create_display_page' puts AutoGraphica's 'root' directory on the path before importing this backend.
+from support_tracing import tracer
 
 register_backend('png', 'backend_kivyagg', 'PNG File Format')
 
@@ -175,67 +180,171 @@ show = Show()
 class FigureCanvasKivyAgg(FigureCanvasKivy, FigureCanvasAgg):
     '''FigureCanvasKivyAgg class. See module documentation for more
     information.
+
+    A change of size is not drawn straight away: the texture drawn last is
+    scaled to fit the widget, and the figure is only drawn again once the
+    size has stayed the same for `resize_delay` seconds (e.g. once the window
+    edge stops being dragged, or the swiper animation ends). The figure is
+    drawn at the dpi that fits its own size to the widget, rather than at a
+    fixed dpi.
     '''
 
+    # The time (in seconds) the size has to stay the same for before the
+    # figure is drawn again at the new size.
+    resize_delay = 0.15
+
+    # The lowest dpi a figure is drawn at to fit the widget. A figure that
+    # would need a lower dpi (e.g. a large Facet Plot) is given the widget's
+    # size at its own dpi instead.
+    min_dpi = 100
+
     def __init__(self, figure, **kwargs):
         self.figure = figure
-        self.bind(size=self._on_size_changed)
-        super(FigureCanvasKivyAgg, self).__init__(figure=self.figure, **kwargs)
         self.img_texture = None
         self.img_rect = None
+        self.background_rect = None
+        self.drawn_size = None
+        # The first draw waits for the layout to settle within the frame,
+        # later ones wait for the size to stop changing.
+        self._draw_trigger = Clock.create_trigger(self._draw_at_size, 0)
+        self._resize_trigger = Clock.create_trigger(self._draw_at_size,
+                                                    self.resize_delay)
+        super(FigureCanvasKivyAgg, self).__init__(figure=self.figure, **kwargs)
         self.blit()
 
+    @contextlib.contextmanager
+    def fitted_to_widget(self):
+        '''
+        Set the dpi of the figure so that it fits the widget while it is
+        drawn. The figure's own size and dpi are restored afterwards, so the
+        figure is saved (and reused) the same way whatever it was displayed at.
+        '''
+        dpi = self.figure.dpi
+        width, height = self.figure.get_size_inches()
+        fitted_dpi = min(self.width / width, self.height / height)
+        if fitted_dpi >= self.min_dpi:
+            self.figure.set_dpi(fitted_dpi)
+        else:
+            self.figure.set_size_inches(self.width / dpi, self.height / dpi,
+                                        forward=False)
+        try:
+            yield
+        finally:
+            self.figure.set_dpi(dpi)
+            self.figure.set_size_inches(width, height, forward=False)
+
     def draw(self):
         '''
         Draw the figure using the agg renderer
         '''
         self.canvas.clear()
-        FigureCanvasAgg.draw(self)
-        if self.blitbox is None:
-            l, b, w, h = self.figure.bbox.bounds
-            w, h = int(w), int(h)
-            buf_rgba = self.get_renderer().buffer_rgba()
-        else:
-            bbox = self.blitbox
-            l, b, r, t = bbox.extents
-            w = int(r) - int(l)
-            h = int(t) - int(b)
-            t = int(b) + h
-            reg = self.copy_from_bbox(bbox)
-            buf_rgba = reg.to_string()
+        with tracer.span("draw", "display", width=int(self.width),
+                         height=int(self.height)), self.fitted_to_widget():
+            FigureCanvasAgg.draw(self)
+            if self.blitbox is None:
+                l, b, w, h = self.figure.bbox.bounds
+                w, h = int(w), int(h)
+                buf_rgba = self.get_renderer().buffer_rgba()
+            else:
+                bbox = self.blitbox
+                l, b, r, t = bbox.extents
+                w = int(r) - int(l)
+                h = int(t) - int(b)
+                t = int(b) + h
+                reg = self.copy_from_bbox(bbox)
+                buf_rgba = reg.to_string()
         texture = Texture.create(size=(w, h))
         texture.flip_vertical()
         color = self.figure.get_facecolor()
         with self.canvas:
             Color(*color)
-            Rectangle(pos=self.pos, size=(w, h))
+            self.background_rect = Rectangle(pos=self.pos, size=self.size)
             Color(1.0, 1.0, 1.0, 1.0)
             self.img_rect = Rectangle(texture=texture, pos=self.pos,
                                       size=(w, h))
-        texture.blit_buffer(bytes(buf_rgba), colorfmt='rgba', bufferfmt='ubyte')
+        with tracer.span("texture_upload", "display", width=w, height=h):
+            texture.blit_buffer(bytes(buf_rgba), colorfmt='rgba', bufferfmt='ubyte')
         self.img_texture = texture
+        self.drawn_size = tuple(self.size)
+        if self.blitbox is None:
+            self._fit_rects()
 
-    filetypes = FigureCanvasKivy.filetypes.copy()
-    filetypes['png'] = 'Portable Network Graphics'
+    def _draw_at_size(self, *args):
+        if self.width <= 1 or self.height <= 1:
+            return
+        if self.img_texture is not None and tuple(self.size) == self.drawn_size:
+            self._fit_rects()
+            return
+        self.draw()
+
+    def _fit_rects(self):
+        '''
+        Scale the texture drawn last to fit the widget (keeping its aspect),
+        centred, with the figure's background colour around it.
+        '''
+        if self.img_rect is None:
+            return
+        tw, th = self.img_texture.size
+        scale = min(self.width / float(tw), self.height / float(th))
+        w, h = tw * scale, th * scale
+        self.img_rect.size = (w, h)
+        self.img_rect.pos = (self.x + (self.width - w) / 2.0,
+                             self.y + (self.height - h) / 2.0)
+        self.background_rect.pos = self.pos
+        self.background_rect.size = self.size
+
+    def _on_size_changed(self, *args):
+        '''
+        Scale the texture drawn last to the new size, and draw the figure
+        again once the size stops changing.
+        '''
+        if self.img_texture is None:
+            self._draw_trigger()
+            return
+        self._fit_rects()
+        self._resize_trigger.cancel()
+        self._resize_trigger()
 
     def _on_pos_changed(self, *args):
-        if self.img_rect is not None:
+        if self.blitbox is None:
+            self._fit_rects()
+        elif self.img_rect is not None:
             self.img_rect.pos = self.pos
 
+    def release(self):
+        '''
+        Free the texture of the canvas once it is no longer displayed. The
+        figure is given a blank canvas, so the Agg buffer of this canvas can
+        be freed too, and the figure can be drawn again by a new canvas.
+        '''
+        self._draw_trigger.cancel()
+        self._resize_trigger.cancel()
+        Window.unbind(mouse_pos=self._on_mouse_pos)
+        self.canvas.clear()
+        self.img_texture = None
+        self.img_rect = None
+        self.background_rect = None
+        if self.figure.canvas is self:
+            FigureCanvasBase(self.figure)
+
+    filetypes = FigureCanvasKivy.filetypes.copy()
+    filetypes['png'] = 'Portable Network Graphics'
+
     def _print_image(self, filename, *args, **kwargs):
         '''Write out format png. The image is saved with the filename given.
         '''
-        l, b, w, h = self.figure.bbox.bounds
-        img = None
-        if self.img_texture is None:
-            texture = Texture.create(size=(w, h))
-            texture.blit_buffer(bytes(self.get_renderer().buffer_rgba()),
-                                colorfmt='rgba', bufferfmt='ubyte')
-            texture.flip_vertical()
-            img = Image(texture)
-        else:
-            img = Image(self.img_texture)
-        img.save(filename)
+        with tracer.span("png_encode", "display", filename=str(filename)):
+            l, b, w, h = self.figure.bbox.bounds
+            img = None
+            if self.img_texture is None:
+                texture = Texture.create(size=(w, h))
+                texture.blit_buffer(bytes(self.get_renderer().buffer_rgba()),
+                                    colorfmt='rgba', bufferfmt='ubyte')
+                texture.flip_vertical()
+                img = Image(texture)
+            else:
+                img = Image(self.img_texture)
+            img.save(filename)
 
 ''' Standard names that backend.__init__ is expecting '''
 FigureCanvas = FigureCanvasKivyAgg
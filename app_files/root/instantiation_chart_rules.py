@@ -4,9 +4,14 @@ Two Mixin Classes with static methods that are designed to authorize and validat
 
 import os
 import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
 import itertools
 import pandas as pd
 from matplotlib.colors import is_color_like
+from support_tracing import tracer
 
 
 class ChartAttributeRules:
@@ -375,7 +380,6 @@ class ChartAttributeRules:
             
             try:
                 rotation_new = float(rotation_)
-                print("This should convert")
                 return True            
             except ValueError:
                 return False
@@ -646,7 +650,7 @@ class ChartRules(ChartAttributeRules):
         bool_list.append(ChartAttributeRules.orientation_check(orientation))
         bool_list.append(ChartAttributeRules.single_axes_check(single_axes))
         
-        print(bool_list)
+        tracer.instant("bar_config_check", "chart", checks=bool_list)
         
         if all(bool_list) is True:
             return True
@@ -5,20 +5,12 @@ A module that checks and validates user-submitted chart attribtues and returns a
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 
+import importlib
 import pandas as pd
 from instantiation_chart_rules import ChartRules
-from plot_line_graph import LineGraph
-from plot_scatter_plot import ScatterPlot
-from plot_bar_chart import BarChart
-from plot_box_plot import BoxPlot
-from plot_pie_chart import PieChart
-from plot_histogram import Histogram
-from plot_multi_line_graph import MultiLineGraph
-from plot_multi_scatter_plot import MultiScatterPlot
-from plot_multi_bar_chart import MultiBarChart
-from plot_facet_plot import FacetPlot
 
 
 class CreateChartInstance(ChartRules):
@@ -38,11 +30,37 @@ class CreateChartInstance(ChartRules):
         This is a list of parameters which will configure the specified chart type submitted by the user prior.
     """
     
+    # Each chart type's module (and with it, seaborn) is only imported the first time that chart type is created.
+    chart_registry = {'Line': ('plot_line_graph', 'LineGraph'),
+                      'Scatter': ('plot_scatter_plot', 'ScatterPlot'),
+                      'Bar': ('plot_bar_chart', 'BarChart'),
+                      'Box': ('plot_box_plot', 'BoxPlot'),
+                      'Pie': ('plot_pie_chart', 'PieChart'),
+                      'Histogram': ('plot_histogram', 'Histogram'),
+                      'MultiLine': ('plot_multi_line_graph', 'MultiLineGraph'),
+                      'MultiScatter': ('plot_multi_scatter_plot', 'MultiScatterPlot'),
+                      'MultiBar': ('plot_multi_bar_chart', 'MultiBarChart'),
+                      'Facet': ('plot_facet_plot', 'FacetPlot')}
+    
     def __init__(self, pd_dataframe, chart_type, chart_parameters):
         self.dataframe = pd_dataframe
         self.chart_type = chart_type
         self.chart_parameters = chart_parameters
  
+    @staticmethod
+    def load_chart_class(chart_type: str):
+
+        """This function imports the module of a chart type (if it has not been imported already) and returns its chart class.
+
+        Parameters
+        ----------
+        chart_type: str
+            This is the chart type that they selected (Line, Scatter, Bar, etc.)
+        """
+        
+        module_name, class_name = CreateChartInstance.chart_registry[chart_type]
+        return getattr(importlib.import_module(module_name), class_name)
+    
     def validate_chart_attributes(self):
 
         """This function determines which chart type was selected by the user,
@@ -64,70 +82,70 @@ class CreateChartInstance(ChartRules):
             
             if self.chart_dict is not None:
                 if ChartRules.line_config_check(*self.chart_dict.values()) is True:
-                    return LineGraph(**self.chart_dict)
+                    return self.load_chart_class('Line')(**self.chart_dict)
                 
         elif self.chart_type == 'Scatter':
             self.chart_dict = self.collect_scatter_attributes(self.chart_parameters)
             
             if self.chart_dict is not None:
                 if ChartRules.scatter_config_check(*self.chart_dict.values()) is True:
-                    return ScatterPlot(**self.chart_dict)
+                    return self.load_chart_class('Scatter')(**self.chart_dict)
  
         elif self.chart_type == "Bar":
             self.chart_dict = self.collect_bar_attributes(self.chart_parameters)
             
             if self.chart_dict is not None:
                 if ChartRules.bar_config_check(*self.chart_dict.values()) is True:
-                    return BarChart(**self.chart_dict)
+                    return self.load_chart_class('Bar')(**self.chart_dict)
             
         elif self.chart_type == "Box":
             self.chart_dict = self.collect_box_attributes(self.chart_parameters)
             
             if self.chart_dict is not None:
                 if ChartRules.box_config_check(*self.chart_dict.values()) is True:
-                    return BoxPlot(**self.chart_dict)
+                    return self.load_chart_class('Box')(**self.chart_dict)
                     
         elif self.chart_type == "Pie":
             self.chart_dict = self.collect_pie_attributes(self.chart_parameters)
             
             if self.chart_dict is not None:
                 if ChartRules.pie_config_check(*self.chart_dict.values()) is True:
-                    return PieChart(**self.chart_dict)
+                    return self.load_chart_class('Pie')(**self.chart_dict)
 
         elif self.chart_type == "Histogram":
             self.chart_dict = self.collect_histogram_attributes(self.chart_parameters)
             
             if self.chart_dict is not None:
                 if ChartRules.histogram_config_check(*self.chart_dict.values()) is True:
-                    return Histogram(**self.chart_dict)
+                    return self.load_chart_class('Histogram')(**self.chart_dict)
 
         elif self.chart_type == "MultiLine":
             self.chart_dict = self.collect_multiline_attributes(self.chart_parameters)
             
             if self.chart_dict is not None:
                 if ChartRules.multiline_config_check(*self.chart_dict.values()) is True:
-                    return MultiLineGraph(**self.chart_dict)
+                    return self.load_chart_class('MultiLine')(**self.chart_dict)
 
         elif self.chart_type == "MultiScatter":
             self.chart_dict = self.collect_multiscatter_attributes(self.chart_parameters)
             
             if self.chart_dict is not None:
                 if ChartRules.multiscatter_config_check(*self.chart_dict.values()) is True:
-                    return MultiScatterPlot(**self.chart_dict)
+                    return self.load_chart_class('MultiScatter')(**self.chart_dict)
 
         elif self.chart_type == "MultiBar":
             self.chart_dict = self.collect_multibar_attributes(self.chart_parameters)
             
             if self.chart_dict is not None:
                 if ChartRules.multibar_config_check(*self.chart_dict.values()) is True:
-                    return MultiBarChart(**self.chart_dict)
+                    return self.load_chart_class('MultiBar')(**self.chart_dict)
             
         elif self.chart_type == "Facet":
             self.chart_dict = self.collect_facet_attributes(self.chart_parameters)
                         
             if self.chart_dict is not None:
                 if ChartRules.facet_config_check(*self.chart_dict.values()) is True:
-                    return FacetPlot(**self.chart_dict)
+                    return self.load_chart_class('Facet')(**self.chart_dict)
 
     
     def collect_line_attributes(self, list_of_attributes: list) -> dict:
@@ -5,7 +5,15 @@ A module dedicated towards checking and validating the file passed to it and ret
 
 import os
 import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
 import pandas as pd
+from support_file_cache import FileCache
+from support_excel import ExcelReader
+from support_tracing import tracer
+from support_memory import memory_monitor
 
 class FileController:
 
@@ -20,10 +28,37 @@ class FileController:
         This is the path to the file (csv/xlsx) that the user has submitted.
     dataframe: pd.DataFrame, None
         This is the DataFrame created from the user's file, providing that the file path was valid, and the file extension was valid.
+    chart_type: str, None
+        The chart type that the user has selected. If specified, only the columns this chart type can use are loaded.
+    file_cache: support_file_cache.FileCache
+        An instance of the FileCache class, which stores the converted DataFrame of each file as a binary sidecar.
+    usecols: list, None
+        The columns that were loaded from the file. 'None' means that every column was loaded.
+    sheet_name: str, int, list, None
+        The sheet (or sheets) of an Excel workbook to load. 'None' loads the first sheet. Several sheets are read in parallel and stacked.
     """
     
-    def __init__(self, user_file_path):
+    # The number of rows read to profile which columns each chart type can use.
+    sample_rows = 1000
+    
+    # The data categories (see 'support_main_classes.ColumnAttributes') used by the 'chart_rules' of each chart type.
+    chart_data_categories = {'Line': ['Date', 'Time', 'Continuous'],
+                             'Scatter': ['Continuous'],
+                             'Bar': ['Nominal', 'Nominal-Binary', 'Ordinal', 'Continuous', 'Discrete'],
+                             'Box': ['Nominal', 'Nominal-Binary', 'Ordinal', 'Continuous'],
+                             'Pie': ['Nominal', 'Nominal-Binary', 'Ordinal'],
+                             'Histogram': ['Continuous', 'Discrete'],
+                             'MultiLine': ['Date', 'Time', 'Continuous', 'Nominal', 'Nominal-Binary', 'Ordinal'],
+                             'MultiScatter': ['Continuous', 'Nominal', 'Nominal-Binary', 'Ordinal'],
+                             'MultiBar': ['Nominal', 'Nominal-Binary', 'Ordinal', 'Continuous', 'Discrete'],
+                             'Facet': ['Nominal', 'Nominal-Binary', 'Ordinal', 'Continuous', 'Discrete']}
+    
+    def __init__(self, user_file_path, chart_type=None, sheet_name=None):
         self.user_file_path = user_file_path
+        self.chart_type = chart_type
+        self.sheet_name = sheet_name
+        self.file_cache = FileCache()
+        self.usecols = None
         self.pass_valid_file()
     
     def pass_valid_file(self):
@@ -40,14 +75,138 @@ class FileController:
     def create_dataframe(self):
 
         """This function checks to see if the file in the file path has the extensions '.csv' or '.xlsx'
-        If so, it creates a DataFrame from that file."""
+        If so, it creates a DataFrame from that file.
+        If the file has been opened before (and not modified since), the already converted DataFrame is memory-mapped from its sidecar instead."""
         
-        if self.user_file_path.endswith(".csv"):
-            self.dataframe = pd.read_csv(self.user_file_path)
-        elif self.user_file_path.endswith(".xlsx"):
-            self.dataframe = pd.read_excel(self.user_file_path)
+        if self.user_file_path.endswith(".csv") or self.user_file_path.endswith(".xlsx"):
+            with tracer.span("load", "file", path=self.user_file_path, chart_type=self.chart_type) as span, \
+                 memory_monitor.stage("load", path=self.user_file_path, chart_type=self.chart_type):
+                source_size = os.path.getsize(self.user_file_path)
+                
+                # Phase 1: profile a sample of the file to find the columns the chart type can use.
+                if self.chart_type in self.chart_data_categories:
+                    with tracer.span("project_columns", "file"):
+                        self.usecols = self.project_columns(self.read_file(nrows=self.sample_rows))
+                
+                # Phase 2: load (or memory-map) only those columns.
+                with tracer.span("load_sidecar", "file"):
+                    self.dataframe = self.file_cache.load(self.user_file_path, self.usecols, self.sheet_name)
+                
+                if self.dataframe is not None:
+                    # The sidecar holds the DataFrame after 'DataframeOverview' has filled its null values and converted its datetime columns.
+                    self.dataframe.attrs["converted"] = True
+                else:
+                    with tracer.span("read_file", "file"):
+                        self.dataframe = self.read_file(usecols=self.usecols)
+                
+                # 'DataframeOverview' uses the source path and columns to write the sidecar once the DataFrame has been converted.
+                self.dataframe.attrs["source_path"] = self.user_file_path
+                self.dataframe.attrs["source_columns"] = self.usecols
+                self.dataframe.attrs["source_sheet"] = self.sheet_name
+                # The watch mode (see 'support_file_watcher') reads any rows appended to the file after this size.
+                # If the file grew while it was being read, the size the DataFrame was read at is unknown.
+                self.dataframe.attrs["source_size"] = source_size if os.path.getsize(self.user_file_path) == source_size else None
+                span.set(rows=len(self.dataframe), columns=len(self.dataframe.columns), sidecar=self.dataframe.attrs.get("converted", False))
         else:
             self.dataframe = None
+            
+    def read_file(self, nrows=None, usecols=None):
+
+        """This function reads the file (csv/xlsx) into a DataFrame.
+
+        Parameters
+        ----------
+        nrows: int, None
+            The number of rows to read. 'None' reads every row, '0' reads only the header.
+        usecols: list, None
+            The columns to read. 'None' reads every column.
+        """
+        
+        if self.user_file_path.endswith(".csv"):
+            return pd.read_csv(self.user_file_path, nrows=nrows, usecols=usecols)
+        else:
+            # Workbooks are streamed (see 'support_excel.ExcelReader'), rather than built as a full object model by 'pd.read_excel'.
+            return ExcelReader(self.user_file_path).read(sheet_name=self.sheet_name, nrows=nrows, usecols=usecols)
+    
+    @staticmethod
+    def candidate_data_categories(pd_series):
+
+        """This function returns every data category a column could be given once the full file has been loaded,
+        based only on a sample of that column. The categories are deliberately conservative,
+        as a column that changes type after the sample (e.g. an integer column with nulls becoming a float column) must not be dropped.
+        A sample of numbers can't rule out text further down the column (which makes it an 'object' column), so a numeric column could also be
+        'Nominal' or 'Ordinal'.
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            A sampled column within the DataFrame.
+        """
+        
+        if pd_series.isnull().all():
+            # Nothing can be learned about an empty sample.
+            return {'Continuous', 'Discrete', 'Nominal', 'Nominal-Binary', 'Ordinal', 'Date', 'Time'}
+        elif pd.api.types.is_bool_dtype(pd_series):
+            return set()
+        elif pd.api.types.is_integer_dtype(pd_series):
+            # The number of unique values can only grow, so only a column with 2 or less unique values in the sample can be 'Nominal-Binary'.
+            if pd_series.nunique() <= 2:
+                return {'Continuous', 'Discrete', 'Nominal-Binary', 'Nominal', 'Ordinal'}
+            return {'Continuous', 'Discrete', 'Nominal', 'Ordinal'}
+        elif pd.api.types.is_float_dtype(pd_series):
+            return {'Continuous', 'Discrete', 'Nominal', 'Ordinal'}
+        elif pd.api.types.is_datetime64_any_dtype(pd_series):
+            return {'Date'}
+        elif pd.api.types.is_timedelta64_dtype(pd_series):
+            return {'Time'}
+        else:
+            # A column with text in the sample stays an 'object' column, which can hold text, dates, times
+            # or a combined date and time (which gets split into both).
+            return {'Nominal', 'Ordinal', 'Date', 'Time'}
+    
+    def project_columns(self, sample_dataframe):
+
+        """This function returns the columns of the file that the selected chart type can use, based on a sample of the file.
+        If the chart type can use every column, 'None' is returned so that the whole file is read.
+
+        Parameters
+        ----------
+        sample_dataframe: pd.DataFrame
+            The first rows of the file.
+        """
+        
+        chart_categories = set(self.chart_data_categories[self.chart_type])
+        usecols = [column for column in sample_dataframe.columns\
+                   if len(self.candidate_data_categories(sample_dataframe[column]) & chart_categories) > 0]
+        
+        if len(usecols) == len(sample_dataframe.columns):
+            return None
+        
+        return usecols
+    
+    @staticmethod
+    def read_header(user_file_path, sheet_name=None):
+
+        """This function reads only the header of a file (csv/xlsx), which is enough to check that the file can be parsed.
+        If the file can not be parsed, 'None' is returned.
+
+        Parameters
+        ----------
+        user_file_path: str
+            This is the path to the file (csv/xlsx) that the user has submitted.
+        sheet_name: str, int, list, None
+            The sheet (or sheets) of an Excel workbook to check. 'None' checks the first sheet.
+        """
+        
+        try:
+            if user_file_path.endswith(".csv"):
+                return pd.read_csv(user_file_path, nrows=0)
+            elif user_file_path.endswith(".xlsx"):
+                return ExcelReader(user_file_path).read(sheet_name=sheet_name, nrows=0)
+        except Exception as e:
+            print(str(e))
+        
+        return None
                 
     def validate_dataframe(self):
 
@@ -6,19 +6,25 @@ Small demo on instantiating it as an object if this is run as a script.
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 import warnings
 warnings.filterwarnings("ignore")
 
-import copy
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
 # import the classes from the custom modules needed during instantiation of any Chart Class
-from support_main_classes import ColumnAttributes, DataframeOverview
+from support_main_classes import ColumnAttributes
 from support_plotting import Plotting
 from support_rcParams import RCParams
+from support_tracing import tracer
+from support_memory import memory_monitor
+from support_profiling import chart_profiler
+from support_chart_plan import ChartSpec
+from support_chart_data import ChartData, chart_data_cache
+from support_figure_pool import figure_pool, layout_cache
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
@@ -52,11 +58,17 @@ class BarChart:
     rcparams: support_rcParams.RCParams
         An instance of the RCParams class which contains basic, universal characteristics for all plots generated.
     df: pd.DataFrame
-        The original DataFrame inputted.
+        A shallow copy of the converted DataFrame, sharing its data rather than duplicating it.
     chart_type: str
         The chart type that the user has selected on the app home page.
+    data_stage: support_chart_data.DataStage
+        The data stage of the chart instance (shared with any other instance of the same data), which holds the chart data each chart is drawn from.
     """
     
+    # The chart attributes which change the data the charts are drawn from, rather than only how they're drawn.
+    data_attributes = ['single_axes']
+    
+    @memory_monitor.tracked()
     def __init__(self,
                  pd_dataframe: pd.DataFrame,
                  color_code: str=None,
@@ -67,10 +79,8 @@ class BarChart:
                  orientation: str=None,
                  single_axes: str="on"):
         
-        self.overview = DataframeOverview(pd_dataframe)
         self.plot_funcs = Plotting()
         self.rcparams = RCParams()
-        self.df = copy.copy(self.overview.dataframe)
         
         self.color_code = self.plot_funcs.check_valid_color(color_code)
         self.custom_title = custom_title
@@ -81,8 +91,8 @@ class BarChart:
         self.single_axes = single_axes
         self.chart_type = 'Bar'
         
-        self.chart_rules()
-        self.plot_funcs.set_plot_style(self.current_style)
+        # The overview, the converted DataFrame and the chart rules are reused if only the style of the charts has changed (see 'support_chart_data').
+        chart_data_cache.load(self, pd_dataframe)
         self.default_xtick_rotation()
         
 
@@ -126,6 +136,44 @@ class BarChart:
                        or column.data_category == 'Discrete']   
         
         
+    def single_axes_chart_data(self, x_axis_var):
+
+        """Creates the chart data (see 'support_chart_data.ChartData') of a Bar Chart along a single axis: the number of rows in each category,
+        in the order the bars are drawn (a category with no rows still has a bar).
+        
+        Parameters
+        ----------
+        x_axis_var: pd.Series
+            A 'Nominal'/'Nominal-Binary'/'Ordinal' column within the DataFrame
+        """
+        
+        order = self.plot_funcs.category_order(self.df[x_axis_var])
+        counts = self.df[x_axis_var].value_counts().reindex(order, fill_value=0)
+        return ChartData(counts, tick_values=pd.Series(self.df[x_axis_var].unique()), order=order)
+        
+        
+    def double_axes_chart_data(self, x_axis_var, y_axis_var):
+
+        """Creates the chart data (see 'support_chart_data.ChartData') of a Bar Chart along a dual axes: the mean of the 'y-axis' in each category,
+        in the order the bars are drawn.
+        
+        Parameters
+        ----------
+        x_axis_var: pd.Series
+            A 'Nominal'/'Nominal-Binary'/'Ordinal' column within the DataFrame
+        y_axis_var: pd.Series
+            A 'Continuous'/'Discrete' column within the DataFrame
+        """
+        
+        order = self.plot_funcs.category_order(self.df[x_axis_var])
+        means = self.df[y_axis_var].groupby(self.df[x_axis_var], sort=False).mean().reindex(order)
+        return ChartData(means, tick_values=pd.Series(self.df[x_axis_var].unique()), order=order)
+        
+        
+    @tracer.traced(category="chart")
+    @memory_monitor.tracked()
+    @chart_profiler.profiled()
+    @RCParams.styled(chart_data=("single_axes_chart_data", "x_axis_var"))
     def create_single_axes_chart(self, x_axis_var): 
 
         """Creates a Bar Chart along a single axis
@@ -137,23 +185,31 @@ class BarChart:
         """
         
         # 1) DEFINE THE MATPLOTLIB FIGURE AND AXES 
-        fig, ax = plt.subplots(figsize=(4, 3))
+        fig, ax = figure_pool.subplots(self.chart_type, self.current_style, figsize=(4, 3))
         
-        # 2) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so) 
+        # 2) GET THE NUMBER OF ROWS IN EACH CATEGORY (ONLY COUNTED THE FIRST TIME THE CHART IS DRAWN)
+        chart_data = self.data_stage.get_chart_data(self.single_axes_chart_data, x_axis_var)
+        counts = chart_data.frame
+        
+        # 3) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so) 
         if self.orientation == 'horizontal':
-            plot = sns.countplot(self.df,
-                                 y=self.df[x_axis_var],
-                                 color=self.color_code,
-                                 edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
-                                 linewidth=0.6)
+            plot = sns.barplot(x=counts.to_numpy(),
+                               y=counts.index,
+                               order=chart_data.aggregates["order"],
+                               color=self.color_code,
+                               edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
+                               linewidth=0.6,
+                               errorbar=None)
         else:
-            plot = sns.countplot(self.df,
-                                 x=self.df[x_axis_var],
-                                 color=self.color_code,
-                                 edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
-                                 linewidth=0.6)
+            plot = sns.barplot(x=counts.index,
+                               y=counts.to_numpy(),
+                               order=chart_data.aggregates["order"],
+                               color=self.color_code,
+                               edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
+                               linewidth=0.6,
+                               errorbar=None)
         
-        # 3) ADD THE LABELS FOR THE AXES
+        # 4) ADD THE LABELS FOR THE AXES
         if self.orientation == 'horizontal':
             ax.set_ylabel(x_axis_var, fontsize=6)
             ax.set_xlabel("Count", fontsize=6)
@@ -161,14 +217,14 @@ class BarChart:
             ax.set_xlabel(x_axis_var, fontsize=6)
             ax.set_ylabel("Count", fontsize=6)
 
-        # 4) CREATE THE TITLE FOR THE CHART
+        # 5) CREATE THE TITLE FOR THE CHART
         self.plot_funcs.create_title(custom_title=self.custom_title,
                                      chart_type=self.chart_type,
                                      axis_variable1=x_axis_var,
                                      axis_variable2=None,
                                      current_style=self.current_style)
         
-        # 5) CREATE THE LEGEND FOR THE CHART   
+        # 6) CREATE THE LEGEND FOR THE CHART   
         self.plot_funcs.create_legend(legend_on=self.legend_on,
                                       chart_type=self.chart_type,
                                       axis_variable1=x_axis_var,
@@ -181,21 +237,25 @@ class BarChart:
                                       legend_title='',
                                       current_style=self.current_style)
         
-        # 6) ROTATE THE X-AXIS TICKS
+        # 7) ROTATE THE X-AXIS TICKS
         plt.xticks(rotation=self.plot_funcs.set_xaxis_rotation(user_xtick_rotation=self.xtick_rotation,
-                                                               pd_series=self.df[x_axis_var],
+                                                               pd_series=chart_data.tick_values,
                                                                orientation=self.orientation))        
 
-        # 7) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
+        # 8) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
         plt.xticks(fontsize=6)
         plt.yticks(fontsize=6)
-        plt.tight_layout()
+        layout_cache.tight_layout(self.chart_type, self.current_style)
         current_fig = plt.gcf()
         plt.close()
         
         return current_fig
         
         
+    @tracer.traced(category="chart")
+    @memory_monitor.tracked()
+    @chart_profiler.profiled()
+    @RCParams.styled(chart_data=("double_axes_chart_data", "x_axis_var", "y_axis_var"))
     def create_double_axes_chart(self, x_axis_var, y_axis_var):
 
         """Creates a Bar Chart along a dual axes
@@ -209,27 +269,31 @@ class BarChart:
         """
         
         # 1) DEFINE THE MATPLOTLIB FIGURE AND AXES 
-        fig, ax = plt.subplots(figsize=(4, 3))
+        fig, ax = figure_pool.subplots(self.chart_type, self.current_style, figsize=(4, 3))
+        
+        # 2) GET THE MEAN OF EACH CATEGORY (ONLY CALCULATED THE FIRST TIME THE CHART IS DRAWN)
+        chart_data = self.data_stage.get_chart_data(self.double_axes_chart_data, x_axis_var, y_axis_var)
+        means = chart_data.frame
         
-        # 2) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so) 
+        # 3) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so) 
         if self.orientation == 'horizontal':
-            double_plot = sns.barplot(self.df,
-                                      x=self.df[y_axis_var],
-                                      y=self.df[x_axis_var],
+            double_plot = sns.barplot(x=means.to_numpy(),
+                                      y=means.index,
+                                      order=chart_data.aggregates["order"],
                                       color=self.color_code,
                                       edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
                                       linewidth=0.6,
                                       errorbar=None)
         else:
-            double_plot = sns.barplot(self.df,
-                                      x=self.df[x_axis_var],
-                                      y=self.df[y_axis_var],
+            double_plot = sns.barplot(x=means.index,
+                                      y=means.to_numpy(),
+                                      order=chart_data.aggregates["order"],
                                       color=self.color_code,
                                       edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
                                       linewidth=0.6,
                                       errorbar=None)
         
-        # 3) ADD THE LABELS FOR THE AXES
+        # 4) ADD THE LABELS FOR THE AXES
         if self.orientation == 'horizontal':
             ax.set_xlabel(y_axis_var, fontsize=6)
             ax.set_ylabel(x_axis_var, fontsize=6)
@@ -237,14 +301,14 @@ class BarChart:
             ax.set_xlabel(x_axis_var, fontsize=6)
             ax.set_ylabel(y_axis_var, fontsize=6)
         
-        # 4) CREATE THE TITLE FOR THE CHART
+        # 5) CREATE THE TITLE FOR THE CHART
         self.plot_funcs.create_title(custom_title=self.custom_title,
                                      chart_type=self.chart_type,
                                      axis_variable1=y_axis_var,
                                      axis_variable2=None,
                                      current_style=self.current_style)
         
-        # 5) CREATE THE LEGEND FOR THE CHART 
+        # 6) CREATE THE LEGEND FOR THE CHART 
         self.plot_funcs.create_legend(legend_on=self.legend_on,
                               chart_type=self.chart_type,
                               axis_variable1=y_axis_var,
@@ -257,49 +321,58 @@ class BarChart:
                               legend_title='',
                               current_style=self.current_style)
         
-        # 6) ROTATE THE X-AXIS TICKS
+        # 7) ROTATE THE X-AXIS TICKS
         plt.xticks(rotation=self.plot_funcs.set_xaxis_rotation(user_xtick_rotation=self.xtick_rotation,
-                                                               pd_series=self.df[x_axis_var],
+                                                               pd_series=chart_data.tick_values,
                                                                orientation=self.orientation))   
         
-        # 7) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
+        # 8) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
         plt.xticks(fontsize=6)
         plt.yticks(fontsize=6)
-        plt.tight_layout()
+        layout_cache.tight_layout(self.chart_type, self.current_style)
         current_fig = plt.gcf()
         plt.close()
         
         return current_fig
         
         
-    def plot_multiple_charts(self):
+    def chart_specs(self):
 
-        """Creates a list of Matplotlib figures of all possible charts that can be made within the data,
-        from the user-inputted chart-type.
+        """Creates a list of chart specs (see 'support_chart_plan.ChartSpec') of all possible charts that can be made within the data,
+        from the user-inputted chart-type, without creating any of them.
         """
         
-        chart_list = []
+        chart_specs = []
         # Loop through each of the y-axis variables and for each variable, plot it with an x-axis variable
         if (self.single_axes == 'on' or self.single_axes is None) and len(self.x_list) > 0:            
             for x_variable in self.x_list:
-                chart_list.append(self.create_single_axes_chart(x_variable))
+                chart_specs.append(ChartSpec('create_single_axes_chart', x_variable))
                 
         elif self.single_axes == 'off' and len(self.x_list) > 0: 
             for x_variable in self.x_list:
                 for y_variable in self.y_list:
-                    chart_list.append(self.create_double_axes_chart(x_variable, y_variable))
-                    
-        return chart_list
-                
+                    chart_specs.append(ChartSpec('create_double_axes_chart', x_variable, y_variable))
                     
+        return chart_specs
+
+    @tracer.traced(category="chart")
+    def plot_multiple_charts(self):
+
+        """Creates a list of Matplotlib figures of the charts that can be made within the data, from the user-inputted chart-type, most informative first.
+        Mirrored and degenerate charts, and any charts beyond the chart budget, are left out (see 'support_chart_plan.ChartPlanner').
+        The charts are only planned once for the data stage, so restyling the charts draws the same charts again.
+        """
+        
+        return [chart_spec.create(self) for chart_spec in self.data_stage.planned_specs(self)]
+
+
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#                
 # if __name__ == "__main__":
     
-#     # Set the rcParams from the Python File
-#     from rcParams import RCParams
+#     # The style is only applied while each chart is created and drawn (see 'support_rcParams')
+#     from support_rcParams import RCParams
 #     params = RCParams()
-#     style = 7
-#     params.change_style(params.style_list[style])  #'dark_background'
+#     style = params.style_list[4]  #'dark_background'
     
 #     file = r'###############################################/.csv'
 #     dataframe = pd.read_csv(file)                 
@@ -6,7 +6,8 @@ Small demo on instantiating it as an object if this is run as a script.
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 import warnings
 warnings.filterwarnings("ignore")
 
@@ -16,9 +17,15 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 
 # import the classes from the custom modules needed during instantiation of any Chart Class
-from support_main_classes import ColumnAttributes, DataframeOverview
+from support_main_classes import ColumnAttributes
 from support_plotting import Plotting
 from support_rcParams import RCParams
+from support_tracing import tracer
+from support_memory import memory_monitor
+from support_profiling import chart_profiler
+from support_chart_plan import ChartSpec
+from support_chart_data import ChartData, chart_data_cache
+from support_figure_pool import figure_pool, layout_cache
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
@@ -56,11 +63,17 @@ class BoxPlot:
     rcparams: support_rcParams.RCParams
         An instance of the RCParams class which contains basic, universal characteristics for all plots generated.
     df: pd.DataFrame
-        The original DataFrame inputted.
+        A shallow copy of the converted DataFrame, sharing its data rather than duplicating it.
     chart_type: str
         The chart type that the user has selected on the app home page.
+    data_stage: support_chart_data.DataStage
+        The data stage of the chart instance (shared with any other instance of the same data), which holds the chart data each chart is drawn from.
     """
     
+    # The chart attributes which change the data the charts are drawn from, rather than only how they're drawn.
+    data_attributes = ['z_axis_color']
+    
+    @memory_monitor.tracked()
     def __init__(self,
                  pd_dataframe: pd.DataFrame,
                  color_code: str=None,
@@ -73,10 +86,8 @@ class BoxPlot:
                  palette: str=None,
                  z_axis_color: str="off"):
         
-        self.overview = DataframeOverview(pd_dataframe)
         self.plot_funcs = Plotting()
         self.rcparams = RCParams()
-        self.df = copy.copy(self.overview.dataframe)
         
         self.color_code = self.plot_funcs.check_valid_color(color_code, palette)
         self.custom_title = custom_title
@@ -89,8 +100,8 @@ class BoxPlot:
         self.z_axis_color = z_axis_color
         self.chart_type = 'Box'
         
-        self.chart_rules()   
-        self.plot_funcs.set_plot_style(self.current_style)
+        # The overview, the converted DataFrame and the chart rules are reused if only the style of the charts has changed (see 'support_chart_data').
+        chart_data_cache.load(self, pd_dataframe)
         self.outline_color = self.plot_funcs.define_edgecolor(self.current_style)
         self.default_xtick_rotation()
         
@@ -156,6 +167,24 @@ class BoxPlot:
         axes.get_legend().remove()
         return [handles, labels]
     
+    def x_axis_chart_data(self, x_axis_var):
+
+        """Creates the chart data (see 'support_chart_data.ChartData') of the 'x-axis' of a Box Plot, which is shared by every Box Plot along it.
+        Every row is drawn, so only the unique values along the 'x-axis' (which the rotation of the ticks is chosen from) are found.
+        
+        Parameters
+        ----------
+        x_axis_var: pd.Series
+            A 'Nominal'/'Nominal-Binary'/'Ordinal' column within the DataFrame
+        """
+        
+        return ChartData(self.df, tick_values=pd.Series(self.df[x_axis_var].unique()))
+        
+        
+    @tracer.traced(category="chart")
+    @memory_monitor.tracked()
+    @chart_profiler.profiled()
+    @RCParams.styled(chart_data=("x_axis_chart_data", "x_axis_var"))
     def create_chart(self, x_axis_var, y_axis_var, z_axis_var=None):
 
         """Creates a Box Plot 
@@ -171,9 +200,12 @@ class BoxPlot:
         """
         
         # 1) DEFINE THE MATPLOTLIB FIGURE AND AXES 
-        fig, axes = plt.subplots(figsize=(4, 3))
+        fig, axes = figure_pool.subplots(self.chart_type, self.current_style, figsize=(4, 3))
+        
+        # 2) GET THE 'X-AXIS' DATA (ONLY FOUND THE FIRST TIME THE COLUMN IS DRAWN)
+        chart_data = self.data_stage.get_chart_data(self.x_axis_chart_data, x_axis_var)
         
-        # 2) INSTANTIATE A 'BoxPlot' OBJECT FROM THE 'seaborn' INTERFACE (sns) 
+        # 3) INSTANTIATE A 'BoxPlot' OBJECT FROM THE 'seaborn' INTERFACE (sns) 
         if self.orientation == 'horizontal':
             box = sns.boxplot(data=self.df,
                               x=self.df[y_axis_var],
@@ -200,7 +232,7 @@ class BoxPlot:
                               medianprops={"color": self.outline_color, "linewidth": 1},
                               capprops={"color": self.outline_color, "linewidth": 1})
 
-        # 3) ADD THE LABELS FOR THE AXES
+        # 4) ADD THE LABELS FOR THE AXES
         if self.orientation == 'horizontal':
             box.set_ylabel(x_axis_var, fontsize=8)
             box.set_xlabel(y_axis_var, fontsize=8)
@@ -224,24 +256,24 @@ class BoxPlot:
         else:
             handles_labels = [None, None]
             
-        # 4) CREATE THE TITLE FOR THE CHART 
+        # 5) CREATE THE TITLE FOR THE CHART 
         self.plot_funcs.create_title(custom_title=self.custom_title,
                                      chart_type=self.chart_type,
                                      axis_variable1=x_axis_var,
                                      axis_variable2=None,
                                      current_style=self.current_style)
         
-        # 5) ROTATE THE X-AXIS TICKS
+        # 6) ROTATE THE X-AXIS TICKS
         plt.xticks(rotation=self.plot_funcs.set_xaxis_rotation(user_xtick_rotation=self.xtick_rotation,
-                                                               pd_series=self.df[x_axis_var],
+                                                               pd_series=chart_data.tick_values,
                                                                orientation=self.orientation))
         
-        # 6) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
+        # 7) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
         plt.xticks(fontsize=8)
         plt.yticks(fontsize=8)
-        plt.tight_layout()
+        layout_cache.tight_layout(self.chart_type, self.current_style)
         
-        # 7) CREATE THE LEGEND FOR THE CHART                 
+        # 8) CREATE THE LEGEND FOR THE CHART                 
         if (self.z_axis_color == "off" or self.z_axis_color is None) and self.legend_on == "on":
             self.plot_funcs.create_legend(legend_on=self.legend_on,
                                           chart_type=self.chart_type,
@@ -283,35 +315,44 @@ class BoxPlot:
         return current_fig
         
         
-    def plot_multiple_charts(self):
+    def chart_specs(self):
 
-        """Creates a list of Matplotlib figures of all possible charts that can be made within the data,
-        from the user-inputted chart-type.
+        """Creates a list of chart specs (see 'support_chart_plan.ChartSpec') of all possible charts that can be made within the data,
+        from the user-inputted chart-type, without creating any of them.
         """
         
-        chart_list = []
+        chart_specs = []
         if len(self.x_list) > 0:                
             for x_variable in self.x_list:
                 for y_variable in self.y_list:
                     
                     if self.z_axis_color is False:
-                        chart_list.append(self.create_chart(x_variable, y_variable))
+                        chart_specs.append(ChartSpec('create_chart', x_variable, y_variable))
                     else:
                         for z_variable in self.z_list:
                             if x_variable != z_variable:
-                                chart_list.append(self.create_chart(x_variable, y_variable, z_variable))
+                                chart_specs.append(ChartSpec('create_chart', x_variable, y_variable, z_variable))
                                 
-        return chart_list
+        return chart_specs
+
+    @tracer.traced(category="chart")
+    def plot_multiple_charts(self):
+
+        """Creates a list of Matplotlib figures of the charts that can be made within the data, from the user-inputted chart-type, most informative first.
+        Mirrored and degenerate charts, and any charts beyond the chart budget, are left out (see 'support_chart_plan.ChartPlanner').
+        The charts are only planned once for the data stage, so restyling the charts draws the same charts again.
+        """
+        
+        return [chart_spec.create(self) for chart_spec in self.data_stage.planned_specs(self)]
 
 
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#                
 # if __name__ == "__main__":
     
-#     # Set the rcParams from the Python File
-#     from rcParams import RCParams
+#     # The style is only applied while each chart is created and drawn (see 'support_rcParams')
+#     from support_rcParams import RCParams
 #     params = RCParams()
-#     style = 4
-#     params.change_style(params.style_list[style])  #'dark_background'
+#     style = params.style_list[4]  #'dark_background'
 
 #     file = r'###############################################/.csv'
 #     dataframe = pd.read_csv(file)
@@ -6,20 +6,24 @@ Small demo on instantiating it as an object if this is run as a script.
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 import warnings
 warnings.filterwarnings("ignore")
 
-import copy
 import math
 import pandas as pd
 import matplotlib.pyplot as plt
 
 # import the classes from the custom modules needed during instantiation of any Chart Class
-from support_main_classes import ColumnAttributes, DataframeOverview
+from support_main_classes import ColumnAttributes
 from support_plotting import Plotting
-from support_rcParams import RCParams
+from support_rcParams import RCParams, StyledFigure
+from support_tracing import tracer
+from support_memory import memory_monitor
+from support_profiling import chart_profiler
 from support_facets import Facets
+from support_chart_data import chart_data_cache
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
@@ -56,11 +60,17 @@ class FacetPlot(Facets):
     rcparams: support_rcParams.RCParams
         An instance of the RCParams class which contains basic, universal characteristics for all plots generated.
     df: pd.DataFrame
-        The original DataFrame inputted.
+        A shallow copy of the converted DataFrame, sharing its data rather than duplicating it.
     chart_type: str
         The chart type that the user has selected on the app home page.
+    data_stage: support_chart_data.DataStage
+        The data stage of the chart instance (shared with any other instance of the same data).
     """
     
+    # The chart attributes which change the data the charts are drawn from, rather than only how they're drawn.
+    data_attributes = []
+    
+    @memory_monitor.tracked()
     def __init__(self,
                  pd_dataframe: pd.DataFrame,
                  color_code: str=None,
@@ -72,10 +82,8 @@ class FacetPlot(Facets):
                  palette: str=None,
                  n_bars_per_facet: int=10):
         
-        self.overview = DataframeOverview(pd_dataframe)
         self.plot_funcs = Plotting()
         self.rcparams = RCParams()
-        self.df = copy.copy(self.overview.dataframe)
         
         self.color_code = color_code
         self.custom_title = custom_title
@@ -87,11 +95,11 @@ class FacetPlot(Facets):
         self.n_bars_per_facet = n_bars_per_facet
         self.chart_type = 'Facet'
         
-        self.chart_rules() 
+        # The overview, the converted DataFrame and the chart rules are reused if only the style of the charts has changed (see 'support_chart_data').
+        chart_data_cache.load(self, pd_dataframe)
         self.return_default_n_bars_per_facet()
         self.return_minimum_width_per_facet()
         self.return_minimum_height_per_facet()
-        self.plot_funcs.set_plot_style(self.current_style)
         self.default_xtick_rotation()
 
 
@@ -156,6 +164,10 @@ class FacetPlot(Facets):
                        or column.data_category == 'Discrete']   
                 
         
+    @tracer.traced(category="chart")
+    @memory_monitor.tracked()
+    @chart_profiler.profiled()
+    @RCParams.styled
     def create_chart(self, high_card_var, y_axis_var):
 
         """Creates a Facet Plot
@@ -181,7 +193,8 @@ class FacetPlot(Facets):
                                                    n_bars=self.n_bars_per_facet)
         
         # 3) DEFINE THE MATPLOTLIB FIGURE AND AXES 
-        fig, axes = plt.subplots(nrows=rows, ncols=cols, figsize=(self.figure_width, self.figure_height), constrained_layout=True)
+        fig, axes = plt.subplots(nrows=rows, ncols=cols, figsize=(self.figure_width, self.figure_height), constrained_layout=True,
+                                 FigureClass=StyledFigure, current_style=self.current_style)
         
         # 4) LOOP THORUGH ALL THE ROWS, LOOP THROUGH ALL THE COLUMNS
         for row_ind in range(0, rows):
@@ -244,11 +257,13 @@ class FacetPlot(Facets):
         plt.suptitle(facet_title, y=y_, fontsize='small', fontweight='normal', color=self.plot_funcs.define_edgecolor(self.current_style))
   
         # 10) TIGHTEN THE LAYOUT AND PLOT THE FIGURE
-        plt.tight_layout()
+        with tracer.span("tight_layout", "chart"):
+            plt.tight_layout()
         current_fig = plt.gcf()
         plt.close() 
         return current_fig 
         
+    @tracer.traced(category="chart")
     def plot_facet_chart(self, high_cardinal_var, y_axis_var):
 
         """Creates a list of Matplotlib figures of all possible charts that can be made within the data,
@@ -266,11 +281,10 @@ class FacetPlot(Facets):
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
 # if __name__ == "__main__":
     
-#     # Set the rcParams from the Python File
-#     from rcParams import RCParams
+#     # The style is only applied while each chart is created and drawn (see 'support_rcParams')
+#     from support_rcParams import RCParams
 #     params = RCParams()
-#     style = 7
-#     params.change_style(params.style_list[style])  #'dark_background'
+#     style = params.style_list[4]  #'dark_background'
 
 #     file = r'###############################################/.csv'
 #     dataframe = pd.read_csv(file)            
@@ -6,19 +6,26 @@ Small demo on instantiating it as an object if this is run as a script.
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 import warnings
 warnings.filterwarnings("ignore")
 
-import copy
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
 # import the classes from the custom modules needed during instantiation of any Chart Class
-from support_main_classes import ColumnAttributes, DataframeOverview
+from support_main_classes import ColumnAttributes
 from support_plotting import Plotting
 from support_rcParams import RCParams
+from support_tracing import tracer
+from support_memory import memory_monitor
+from support_profiling import chart_profiler
+from support_chart_plan import ChartSpec
+from support_chart_data import ChartData, chart_data_cache
+from support_figure_pool import figure_pool, layout_cache
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
@@ -54,11 +61,17 @@ class Histogram:
     rcparams: support_rcParams.RCParams
         An instance of the RCParams class which contains basic, universal characteristics for all plots generated.
     df: pd.DataFrame
-        The original DataFrame inputted.
+        A shallow copy of the converted DataFrame, sharing its data rather than duplicating it.
     chart_type: str
         The chart type that the user has selected on the app home page.
+    data_stage: support_chart_data.DataStage
+        The data stage of the chart instance (shared with any other instance of the same data), which holds the chart data each chart is drawn from.
     """
+    
+    # The chart attributes which change the data the charts are drawn from, rather than only how they're drawn.
+    data_attributes = ['n_bins']
 
+    @memory_monitor.tracked()
     def __init__(self,
                  pd_dataframe: pd.DataFrame,
                  color_code: str=None,
@@ -70,10 +83,8 @@ class Histogram:
                  n_bins: int=10,
                  histogram_type: str='Bars'):
         
-        self.overview = DataframeOverview(pd_dataframe)
         self.plot_funcs = Plotting()
         self.rcparams = RCParams()
-        self.df = copy.copy(self.overview.dataframe)
         
         self.color_code = self.plot_funcs.check_valid_color(color_code)
         self.custom_title = custom_title
@@ -85,8 +96,8 @@ class Histogram:
         self.histogram_type = histogram_type
         self.chart_type = 'Histogram'
         
-        self.chart_rules()
-        self.plot_funcs.set_plot_style(self.current_style)
+        # The overview, the converted DataFrame and the chart rules are reused if only the style of the charts has changed (see 'support_chart_data').
+        chart_data_cache.load(self, pd_dataframe)
         self.default_xtick_rotation()
 
 
@@ -115,6 +126,32 @@ class Histogram:
                        or column.data_category == 'Discrete']
         
         
+    def histogram_chart_data(self, x_axis_var):
+
+        """Creates the chart data (see 'support_chart_data.ChartData') of a Histogram: the edges of its bins, and a row for each bin,
+        with the left edge of the bin and the number of rows in it (drawn with the number of rows as the weight, the bars are the same as from every row).
+        
+        Parameters
+        ----------
+        x_axis_var: pd.Series
+            A 'Continuous'/'Discrete' column within the DataFrame
+        """
+        
+        if self.n_bins == "0" or self.n_bins == 0 or self.n_bins is None:
+            self.n_bins = 10
+        
+        values = self.df[x_axis_var].dropna().to_numpy(dtype="float64")
+        bin_edges = np.histogram_bin_edges(values, bins=self.n_bins)
+        counts, _ = np.histogram(values, bins=bin_edges)
+        return ChartData(pd.DataFrame({"bin": bin_edges[:-1], "count": counts}),
+                         tick_values=pd.Series(self.df[x_axis_var].unique()),
+                         bin_edges=list(bin_edges))
+        
+        
+    @tracer.traced(category="chart")
+    @memory_monitor.tracked()
+    @chart_profiler.profiled()
+    @RCParams.styled(chart_data=("histogram_chart_data", "x_axis_var"))
     def create_chart(self, x_axis_var):
 
         """Creates a Histogram
@@ -126,39 +163,42 @@ class Histogram:
         """
         
         # 1) DEFINE THE MATPLOTLIB FIGURE AND AXES 
-        fig, ax = plt.subplots(figsize=(4, 3))
+        fig, ax = figure_pool.subplots(self.chart_type, self.current_style, figsize=(4, 3))
         
-        if self.n_bins == "0" or self.n_bins == 0 or self.n_bins is None:
-            self.n_bins = 10
+        # 2) GET THE NUMBER OF ROWS IN EACH BIN (ONLY BINNED THE FIRST TIME THE CHART IS DRAWN)
+        chart_data = self.data_stage.get_chart_data(self.histogram_chart_data, x_axis_var)
+        bin_edges = chart_data.aggregates["bin_edges"]
         
-        # 2) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so)    
+        # 3) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so)    
         if self.histogram_type == 'area':
-            plot = sns.histplot(self.df,
-                                x=self.df[x_axis_var],
-                                bins=self.n_bins,
+            plot = sns.histplot(chart_data.frame,
+                                x="bin",
+                                weights="count",
+                                bins=bin_edges,
                                 color=self.color_code,
                                 edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
                                 element="poly")
         else:
-            plot = sns.histplot(self.df,
-                    x=self.df[x_axis_var],
-                    bins=self.n_bins,
+            plot = sns.histplot(chart_data.frame,
+                    x="bin",
+                    weights="count",
+                    bins=bin_edges,
                     color=self.color_code,
                     edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
                     element="bars")
       
-        # 3) ADD THE LABELS FOR THE AXES
+        # 4) ADD THE LABELS FOR THE AXES
         ax.set_xlabel(x_axis_var, fontsize=8)
         ax.set_ylabel("Count", fontsize=8)
            
-        # 4) CREATE THE TITLE FOR THE CHART
+        # 5) CREATE THE TITLE FOR THE CHART
         self.plot_funcs.create_title(custom_title=self.custom_title,
                                      chart_type=self.chart_type,
                                      axis_variable1=x_axis_var,
                                      axis_variable2=None,
                                      current_style=self.current_style)
              
-        # 5) CREATE THE LEGEND FOR THE CHART 
+        # 6) CREATE THE LEGEND FOR THE CHART 
         self.plot_funcs.create_legend(legend_on=self.legend_on,
                                       chart_type=self.chart_type,
                                       axis_variable1=x_axis_var,
@@ -171,45 +211,53 @@ class Histogram:
                                       legend_title='',
                                       current_style=self.current_style)
         
-        # 6) ROTATE THE X-AXIS TICKS
+        # 7) ROTATE THE X-AXIS TICKS
         plt.xticks(rotation=self.plot_funcs.set_xaxis_rotation(user_xtick_rotation=self.xtick_rotation,
-                                                               pd_series=self.df[x_axis_var],
+                                                               pd_series=chart_data.tick_values,
                                                                orientation=self.orientation))
         
-        # 7) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
+        # 8) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
         plt.xticks(fontsize=8)
         plt.yticks(fontsize=8)
         
-        plt.tight_layout()
+        layout_cache.tight_layout(self.chart_type, self.current_style)
         current_fig = plt.gcf()
         plt.close()
         
         return current_fig
 
     
-    def plot_multiple_charts(self):
+    def chart_specs(self):
 
-        """Creates a list of Matplotlib figures of all possible charts that can be made within the data,
-        from the user-inputted chart-type.
+        """Creates a list of chart specs (see 'support_chart_plan.ChartSpec') of all possible charts that can be made within the data,
+        from the user-inputted chart-type, without creating any of them.
         """
         
-        chart_list = []
+        chart_specs = []
         # Loop through each of the y-axis variables and for each variable, plot it with an x-axis variable
         for x_variable in self.x_list:
-            if len(self.x_list) > 0:
-                chart_list.append(self.create_chart(x_variable))
+            chart_specs.append(ChartSpec('create_chart', x_variable))
                 
-        return chart_list
+        return chart_specs
+
+    @tracer.traced(category="chart")
+    def plot_multiple_charts(self):
+
+        """Creates a list of Matplotlib figures of the charts that can be made within the data, from the user-inputted chart-type, most informative first.
+        Mirrored and degenerate charts, and any charts beyond the chart budget, are left out (see 'support_chart_plan.ChartPlanner').
+        The charts are only planned once for the data stage, so restyling the charts draws the same charts again.
+        """
+        
+        return [chart_spec.create(self) for chart_spec in self.data_stage.planned_specs(self)]
+
 
-                
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
 # if __name__ == "__main__":
     
-#     # Set the rcParams from the Python File
-#     from rcParams import RCParams
+#     # The style is only applied while each chart is created and drawn (see 'support_rcParams')
+#     from support_rcParams import RCParams
 #     params = RCParams()
-#     style = 7
-#     params.change_style(params.style_list[style])  #'dark_background'
+#     style = params.style_list[4]  #'dark_background'
     
 #     file = r'###############################################/.csv'
 #     dataframe = pd.read_csv(file)
@@ -6,7 +6,8 @@ Small demo on instantiating it as an object if this is run as a script.
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 import warnings
 warnings.filterwarnings("ignore")
 
@@ -16,9 +17,15 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 
 # import the classes from the custom modules needed during instantiation of any Chart Class
-from support_main_classes import ColumnAttributes, DataframeOverview
+from support_main_classes import ColumnAttributes
 from support_plotting import Plotting
 from support_rcParams import RCParams
+from support_tracing import tracer
+from support_memory import memory_monitor
+from support_profiling import chart_profiler
+from support_chart_plan import ChartSpec
+from support_chart_data import ChartData, chart_data_cache
+from support_figure_pool import figure_pool, layout_cache
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
@@ -56,11 +63,17 @@ class MultiBarChart:
     rcparams: support_rcParams.RCParams
         An instance of the RCParams class which contains basic, universal characteristics for all plots generated.
     df: pd.DataFrame
-        The original DataFrame inputted.
+        A shallow copy of the converted DataFrame, sharing its data rather than duplicating it.
     chart_type: str
         The chart type that the user has selected on the app home page.
+    data_stage: support_chart_data.DataStage
+        The data stage of the chart instance (shared with any other instance of the same data), which holds the chart data each chart is drawn from.
     """
     
+    # The chart attributes which change the data the charts are drawn from, rather than only how they're drawn.
+    data_attributes = ['single_axes']
+    
+    @memory_monitor.tracked()
     def __init__(self,
                  pd_dataframe: pd.DataFrame,
                  color_code: str=None,
@@ -73,10 +86,8 @@ class MultiBarChart:
                  palette: str=None,
                  single_axes: str="on"):
         
-        self.overview = DataframeOverview(pd_dataframe)
         self.plot_funcs = Plotting()
         self.rcparams = RCParams()
-        self.df = copy.copy(self.overview.dataframe)
         
         self.color_code = color_code
         self.custom_title = custom_title
@@ -89,8 +100,8 @@ class MultiBarChart:
         self.single_axes = single_axes
         self.chart_type = 'MultiBar'
         
-        self.chart_rules()   
-        self.plot_funcs.set_plot_style(self.current_style)
+        # The overview, the converted DataFrame and the chart rules are reused if only the style of the charts has changed (see 'support_chart_data').
+        chart_data_cache.load(self, pd_dataframe)
         self.default_xtick_rotation()
 
 
@@ -163,6 +174,58 @@ class MultiBarChart:
         return [handles, labels]
         
         
+    def single_chart_data(self, x_axis_var, z_axis_var):
+
+        """Creates the chart data (see 'support_chart_data.ChartData') of a Multi-Bar Chart along a single axis: the number of rows in each pair of categories,
+        in the order the bars are drawn (a pair with no rows still has a bar).
+        
+        Parameters
+        ----------
+        x_axis_var: pd.Series
+            A 'Nominal'/'Nominal-Binary'/'Ordinal' column within the DataFrame
+        z_axis_var: pd.Series
+            A 'Nominal'/'Nominal-Binary'/'Ordinal' column within the DataFrame
+        """
+        
+        order = self.plot_funcs.category_order(self.df[x_axis_var])
+        hue_order = self.plot_funcs.category_order(self.df[z_axis_var])
+        counts = self.df.groupby([self.df[x_axis_var], self.df[z_axis_var]], sort=False).size()
+        counts = counts.reindex(pd.MultiIndex.from_product([order, hue_order], names=[x_axis_var, z_axis_var]), fill_value=0)
+        return ChartData(counts,
+                         tick_values=pd.Series(self.df[x_axis_var].unique()),
+                         groups=counts.index.to_frame(index=False),
+                         order=order,
+                         hue_order=hue_order,
+                         legend_values=pd.Series(self.df[z_axis_var].unique()))
+        
+        
+    def multi_chart_data(self, x_axis_var, y_axis_var, z_axis_var):
+
+        """Creates the chart data (see 'support_chart_data.ChartData') of a Multi-Bar Chart along a dual axes: the mean of the 'y-axis' in each pair of categories.
+        
+        Parameters
+        ----------
+        x_axis_var: pd.Series
+            A 'Nominal'/'Nominal-Binary'/'Ordinal' column within the DataFrame
+        y_axis_var: pd.Series
+            A 'Continuous'/'Discrete' column within the DataFrame
+        z_axis_var: pd.Series
+            A 'Nominal'/'Nominal-Binary'/'Ordinal' column within the DataFrame
+        """
+        
+        means = self.df[y_axis_var].groupby([self.df[x_axis_var], self.df[z_axis_var]], sort=False).mean()
+        return ChartData(means,
+                         tick_values=pd.Series(self.df[x_axis_var].unique()),
+                         groups=means.index.to_frame(index=False),
+                         order=self.plot_funcs.category_order(self.df[x_axis_var]),
+                         hue_order=self.plot_funcs.category_order(self.df[z_axis_var]),
+                         legend_values=pd.Series(self.df[z_axis_var].unique()))
+        
+        
+    @tracer.traced(category="chart")
+    @memory_monitor.tracked()
+    @chart_profiler.profiled()
+    @RCParams.styled(chart_data=("single_chart_data", "x_axis_var", "z_axis_var"))
     def create_single_chart(self, x_axis_var, z_axis_var):  
 
         """Creates a Multi-Bar Chart figure along a single axis
@@ -176,27 +239,37 @@ class MultiBarChart:
         """
         
         # 1) DEFINE THE MATPLOTLIB FIGURE AND AXES 
-        fig, ax = plt.subplots(figsize=(4, 3))
+        fig, ax = figure_pool.subplots(self.chart_type, self.current_style, figsize=(4, 3))
+        
+        # 2) GET THE NUMBER OF ROWS IN EACH PAIR OF CATEGORIES (ONLY COUNTED THE FIRST TIME THE CHART IS DRAWN)
+        chart_data = self.data_stage.get_chart_data(self.single_chart_data, x_axis_var, z_axis_var)
+        groups = chart_data.aggregates["groups"]
         
-        # 2) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so) 
+        # 3) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so) 
         if self.orientation == 'horizontal':
-            plot = sns.countplot(self.df,
-                                 y=self.df[x_axis_var],
-                                 color=self.color_code,
-                                 edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
-                                 linewidth=0.6,
-                                 hue=self.df[z_axis_var],
-                                 palette=self.check_empty_palette(self.palette))
+            plot = sns.barplot(x=chart_data.frame.to_numpy(),
+                               y=groups[x_axis_var],
+                               order=chart_data.aggregates["order"],
+                               color=self.color_code,
+                               edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
+                               linewidth=0.6,
+                               errorbar=None,
+                               hue=groups[z_axis_var],
+                               hue_order=chart_data.aggregates["hue_order"],
+                               palette=self.check_empty_palette(self.palette))
         else:
-            plot = sns.countplot(self.df,
-                                 x=self.df[x_axis_var],
-                                 color=self.color_code,
-                                 edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
-                                 linewidth=0.6,
-                                 hue=self.df[z_axis_var],
-                                 palette=self.check_empty_palette(self.palette))
-        
-        # 3) ADD THE LABELS FOR THE AXES
+            plot = sns.barplot(x=groups[x_axis_var],
+                               y=chart_data.frame.to_numpy(),
+                               order=chart_data.aggregates["order"],
+                               color=self.color_code,
+                               edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
+                               linewidth=0.6,
+                               errorbar=None,
+                               hue=groups[z_axis_var],
+                               hue_order=chart_data.aggregates["hue_order"],
+                               palette=self.check_empty_palette(self.palette))
+        
+        # 4) ADD THE LABELS FOR THE AXES
         if self.orientation == 'horizontal':
             ax.set_ylabel(x_axis_var, fontsize=10)
             ax.set_xlabel("Count", fontsize=10)
@@ -211,22 +284,22 @@ class MultiBarChart:
         else:
             handles_labels = [None, None]
      
-        # 4) CREATE THE TITLE FOR THE CHART
+        # 5) CREATE THE TITLE FOR THE CHART
         self.plot_funcs.create_title(custom_title=self.custom_title,
                                      chart_type=self.chart_type,
                                      axis_variable1=x_axis_var,
                                      axis_variable2=None,
                                      current_style=self.current_style)
         
-        # 5) ROTATE THE X-AXIS TICKS
+        # 6) ROTATE THE X-AXIS TICKS
         plt.xticks(rotation=self.plot_funcs.set_xaxis_rotation(user_xtick_rotation=self.xtick_rotation,
-                                                               pd_series=self.df[x_axis_var],
+                                                               pd_series=chart_data.tick_values,
                                                                orientation=self.orientation))
              
-        # 6) CREATE THE LEGEND FOR THE CHART 
+        # 7) CREATE THE LEGEND FOR THE CHART 
         # Extract all the legend parameters
         if self.legend_on == "on":
-            legend_params = self.plot_funcs.space_legend_out(self.df[z_axis_var], self.space_legend_out)
+            legend_params = self.plot_funcs.space_legend_out(chart_data.aggregates["legend_values"], self.space_legend_out)
             legend_font, legend_bbox_anchor = legend_params[0], legend_params[1]
 
             self.plot_funcs.create_legend(legend_on=self.legend_on,
@@ -243,16 +316,20 @@ class MultiBarChart:
             # Make sure the legend tite is set to the same color as the labels (i.e. 'white' or 'black')
             ax.get_legend().get_title().set_color(self.plot_funcs.define_edgecolor(self.current_style))
 
-        # 7) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
+        # 8) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
         plt.xticks(fontsize=6)
         plt.yticks(fontsize=6)
-        plt.tight_layout()
+        layout_cache.tight_layout(self.chart_type, self.current_style)
         current_fig = plt.gcf()
         plt.close()
         
         return current_fig
         
 
+    @tracer.traced(category="chart")
+    @memory_monitor.tracked()
+    @chart_profiler.profiled()
+    @RCParams.styled(chart_data=("multi_chart_data", "x_axis_var", "y_axis_var", "z_axis_var"))
     def create_multi_chart(self, x_axis_var, y_axis_var, z_axis_var):
 
         """Creates a Multi-Bar Chart figure along a dual axes
@@ -268,31 +345,37 @@ class MultiBarChart:
         """
         
         # 1) DEFINE THE MATPLOTLIB FIGURE AND AXES 
-        fig, ax = plt.subplots(figsize=(4, 3))
+        fig, ax = figure_pool.subplots(self.chart_type, self.current_style, figsize=(4, 3))
         
-        # 2) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so) 
+        # 2) GET THE MEAN OF EACH PAIR OF CATEGORIES (ONLY CALCULATED THE FIRST TIME THE CHART IS DRAWN)
+        chart_data = self.data_stage.get_chart_data(self.multi_chart_data, x_axis_var, y_axis_var, z_axis_var)
+        groups = chart_data.aggregates["groups"]
+        
+        # 3) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so) 
         if self.orientation == 'horizontal':
-            multi_plot = sns.barplot(self.df,
-                                     y=self.df[x_axis_var],
-                                     x=self.df[y_axis_var],
+            multi_plot = sns.barplot(y=groups[x_axis_var],
+                                     x=chart_data.frame.to_numpy(),
+                                     order=chart_data.aggregates["order"],
                                      color=self.color_code,
                                      edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
                                      linewidth=0.6,
                                      errorbar=None,
-                                     hue=self.df[z_axis_var],
+                                     hue=groups[z_axis_var],
+                                     hue_order=chart_data.aggregates["hue_order"],
                                      palette=self.check_empty_palette(self.palette))
         else:
-            multi_plot = sns.barplot(self.df,
-                                     x=self.df[x_axis_var],
-                                     y=self.df[y_axis_var],
+            multi_plot = sns.barplot(x=groups[x_axis_var],
+                                     y=chart_data.frame.to_numpy(),
+                                     order=chart_data.aggregates["order"],
                                      color=self.color_code,
                                      edgecolor=self.plot_funcs.define_edgecolor(self.current_style),
                                      linewidth=0.6,
                                      errorbar=None,
-                                     hue=self.df[z_axis_var],
+                                     hue=groups[z_axis_var],
+                                     hue_order=chart_data.aggregates["hue_order"],
                                      palette=self.check_empty_palette(self.palette))
         
-        # 3) ADD THE LABELS FOR THE AXES
+        # 4) ADD THE LABELS FOR THE AXES
         if self.orientation == 'horizontal':
             ax.set_xlabel(y_axis_var, fontsize=10)
             ax.set_ylabel(x_axis_var, fontsize=10)
@@ -307,22 +390,22 @@ class MultiBarChart:
         else:
             handles_labels = [None, None]
         
-        # 4) CREATE THE TITLE FOR THE CHART
+        # 5) CREATE THE TITLE FOR THE CHART
         self.plot_funcs.create_title(custom_title=self.custom_title,
                                      chart_type=self.chart_type,
                                      axis_variable1=y_axis_var,
                                      axis_variable2=None)
         
-        # 5) ROTATE THE X-AXIS TICKS
+        # 6) ROTATE THE X-AXIS TICKS
         plt.xticks(rotation=self.plot_funcs.set_xaxis_rotation(user_xtick_rotation=self.xtick_rotation,
-                                                               pd_series=self.df[x_axis_var],
+                                                               pd_series=chart_data.tick_values,
                                                                orientation=self.orientation)) 
         
-        # 6) CREATE THE LEGEND FOR THE CHART 
+        # 7) CREATE THE LEGEND FOR THE CHART 
         # Extract all the legend parameters 
         if self.legend_on == "on":
 
-            legend_params = self.plot_funcs.space_legend_out(self.df[z_axis_var], self.space_legend_out)
+            legend_params = self.plot_funcs.space_legend_out(chart_data.aggregates["legend_values"], self.space_legend_out)
             legend_font, legend_bbox_anchor = legend_params[0], legend_params[1]
 
             self.plot_funcs.create_legend(legend_on=self.legend_on,
@@ -338,49 +421,57 @@ class MultiBarChart:
             # Make sure the legend tite is set to the same color as the labels (i.e. 'white' or 'black')
             ax.get_legend().get_title().set_color(self.plot_funcs.define_edgecolor(self.current_style))
             
-         # 7) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
+         # 8) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
         plt.xticks(fontsize=6)
         plt.yticks(fontsize=6)
-        plt.tight_layout()
+        layout_cache.tight_layout(self.chart_type, self.current_style)
         current_fig = plt.gcf()
         plt.close()
         
         return current_fig
     
         
-    def plot_multiple_charts(self):
-        
-        """Creates a list of Matplotlib figures of all possible charts that can be made within the data,
-        from the user-inputted chart-type.
+    def chart_specs(self):
+
+        """Creates a list of chart specs (see 'support_chart_plan.ChartSpec') of all possible charts that can be made within the data,
+        from the user-inputted chart-type, without creating any of them.
         """
         
-        chart_list = []
+        chart_specs = []
         # Loop through each of the y-axis variables and for each variable, plot it with an x-axis variable
         if (self.single_axes == "on" or self.single_axes is None) and len(self.x_list) > 0:            
             for x_variable in self.x_list:
                 for z_variable in self.z_list:
                     if x_variable != z_variable:
-                        chart_list.append(self.create_single_chart(x_variable, z_variable))
+                        chart_specs.append(ChartSpec('create_single_chart', x_variable, z_variable))
                 
         elif self.single_axes == "off" and len(self.x_list) > 0: 
             for x_variable in self.x_list:
                 for y_variable in self.y_list:
                     for z_variable in self.z_list:
                         if x_variable != z_variable and x_variable != y_variable:
-                            chart_list.append(self.create_multi_chart(x_variable, y_variable, z_variable))
+                            chart_specs.append(ChartSpec('create_multi_chart', x_variable, y_variable, z_variable))
             
-        return chart_list
-                            
-                            
-                            
+        return chart_specs
+
+    @tracer.traced(category="chart")
+    def plot_multiple_charts(self):
+
+        """Creates a list of Matplotlib figures of the charts that can be made within the data, from the user-inputted chart-type, most informative first.
+        Mirrored and degenerate charts, and any charts beyond the chart budget, are left out (see 'support_chart_plan.ChartPlanner').
+        The charts are only planned once for the data stage, so restyling the charts draws the same charts again.
+        """
+        
+        return [chart_spec.create(self) for chart_spec in self.data_stage.planned_specs(self)]
+
+
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
 # if __name__ == "__main__":
     
-#     # Set the rcParams from the Python File
-#     from rcParams import RCParams
+#     # The style is only applied while each chart is created and drawn (see 'support_rcParams')
+#     from support_rcParams import RCParams
 #     params = RCParams()
-#     style = 4
-#     params.change_style(params.style_list[style])  #'dark_background'
+#     style = params.style_list[4]  #'dark_background'
     
 #     file = r'###############################################/.csv'
 #     dataframe = pd.read_csv(file)
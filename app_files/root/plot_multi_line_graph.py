@@ -6,24 +6,28 @@ Small demo on instantiating it as an object if this is run as a script.
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 import warnings
 warnings.filterwarnings("ignore")
 
-import math
-import copy
 import pandas as pd
 import matplotlib.pyplot as plt
-import matplotlib.ticker as ticker
-from matplotlib.dates import DayLocator
 from matplotlib.artist import Artist
 from matplotlib.lines import Line2D
 import seaborn as sns
 
 # import the classes from the custom modules needed during instantiation of any Chart Class
-from support_main_classes import ColumnAttributes, DataframeOverview
+from support_main_classes import ColumnAttributes
 from support_plotting import Plotting
 from support_rcParams import RCParams
+from support_tracing import tracer
+from support_memory import memory_monitor
+from support_profiling import chart_profiler
+from support_chart_plan import ChartSpec
+from support_chart_data import ChartData, chart_data_cache
+from support_temporal_axis import TemporalAxis
+from support_figure_pool import figure_pool, layout_cache
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
@@ -59,11 +63,17 @@ class MultiLineGraph:
     rcparams: support_rcParams.RCParams
         An instance of the RCParams class which contains basic, universal characteristics for all plots generated.
     df: pd.DataFrame
-        The original DataFrame inputted.
+        A shallow copy of the converted DataFrame, sharing its data rather than duplicating it.
     chart_type: str
         The chart type that the user has selected on the app home page.
+    data_stage: support_chart_data.DataStage
+        The data stage of the chart instance (shared with any other instance of the same data), which holds the chart data each chart is drawn from.
     """
+    
+    # The chart attributes which change the data the charts are drawn from, rather than only how they're drawn.
+    data_attributes = []
 
+    @memory_monitor.tracked()
     def __init__(self,
                  pd_dataframe: pd.DataFrame,
                  color_code: str=None,
@@ -75,10 +85,8 @@ class MultiLineGraph:
                  orientation: str=None,
                  palette: str=None):
         
-        self.overview = DataframeOverview(pd_dataframe)
         self.plot_funcs = Plotting()
         self.rcparams = RCParams()
-        self.df = copy.copy(self.overview.dataframe)
 
         self.color_code = color_code
         self.custom_title = custom_title
@@ -90,8 +98,8 @@ class MultiLineGraph:
         self.palette = palette
         self.chart_type = 'MultiLine'
         
-        self.chart_rules()
-        self.plot_funcs.set_plot_style(self.current_style)
+        # The overview, the converted DataFrame and the chart rules are reused if only the style of the charts has changed (see 'support_chart_data').
+        chart_data_cache.load(self, pd_dataframe)
         self.default_xtick_rotation()
 
 
@@ -116,30 +124,6 @@ class MultiLineGraph:
             return self.palette
 
     
-    def locator_interval(self, date_series, optimal_tick_no=20):
-
-        """This function smoothes the interval between ticks when plotting date figures
-
-        Parameters
-        ----------
-        date_series: pd.Series
-            The column within the DataFrame that is of type 'Datetime'.
-        optimal_tick_no: int
-            The optimal number of ticks to fit along the axis.
-        """
-
-        # Calculates the optimum interval between dates, to fit around 20 major ticks on the Figure
-        date_difference = max(date_series) - min(date_series)
-        
-        # If the difference in days is actually smaller than the optimal ticks, then ideally we just want 1 tick per day. 
-        if int(date_difference.days) >= optimal_tick_no: 
-            locator_result = math.ceil(date_difference.days / optimal_tick_no)
-        else:
-            locator_result = date_difference.days
-
-        return locator_result
-
-        
     def chart_rules(self):
 
         """This function determines which columns in a DataFrame are suitable for the 'x' and 'y' columns in a Multi-Line Graph.
@@ -170,6 +154,28 @@ class MultiLineGraph:
             self.plot_funcs.check_categorical_dtype(self.df, z_variable)
 
     
+    def x_axis_chart_data(self, x_axis_var, time_var=False):
+
+        """Creates the chart data (see 'support_chart_data.ChartData') of the 'x-axis' of a Multi-Line Graph, which is shared by every Multi-Line Graph along it:
+            - a 'Time' column is converted to hours.
+            - a 'Date' column has its extents found, which its ticks are located from.
+
+        Parameters
+        ----------
+        x_axis_var: pd.Series
+            A 'Date'/'Time'/'Continuous' column within the DataFrame
+        time_var: bool
+            A boolean value indicating whether a variable representing just time is present.
+        """
+        
+        if time_var is None:
+            return ChartData(self.df, tick_values=pd.Series(self.df[x_axis_var].unique()), x_values=self.df[x_axis_var])
+        
+        # The 'Time' column is converted to hours, and the extents the ticks are located from are only found once (see 'support_temporal_axis').
+        temporal_axis = TemporalAxis(self.df[x_axis_var])
+        return ChartData(self.df, tick_values=temporal_axis.tick_values, x_values=temporal_axis.values, temporal_axis=temporal_axis)
+
+    
     def create_legend_handles_labels(self, axes):
 
         """This function takes a Matplotlib axes object and extracts the handles and lables from its legend.
@@ -187,6 +193,10 @@ class MultiLineGraph:
         return [handles, labels]
 
     
+    @tracer.traced(category="chart")
+    @memory_monitor.tracked()
+    @chart_profiler.profiled()
+    @RCParams.styled(chart_data=("x_axis_chart_data", "x_axis_var", "time_var"))
     def create_chart(self, x_axis_var, y_axis_var, z_axis_var, time_var=False):
 
         """Creates a Multi-Line Graph
@@ -204,21 +214,23 @@ class MultiLineGraph:
         """
         
         # 1) DEFINE THE MATPLOTLIB FIGURE AND AXES 
-        fig, ax = plt.subplots(figsize=(4, 3))
+        fig, ax = figure_pool.subplots(self.chart_type, self.current_style, figsize=(4, 3))
         
-        # 2) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so)    
+        # 2) GET THE 'X-AXIS' DATA (ONLY CONVERTED THE FIRST TIME THE COLUMN IS DRAWN)
+        chart_data = self.data_stage.get_chart_data(self.x_axis_chart_data, x_axis_var, time_var)
+        x_values = chart_data.aggregates["x_values"]
+        
+        # 3) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so)    
         if self.orientation == 'horizontal':
             if time_var is True:
-                # We need to serialize the TimeDelta range to hours
-                converted_time_series = self.df[x_axis_var].dt.seconds.apply(self.overview.dt.convert_timedelta)
                 plot = sns.lineplot(self.df,
                                     x=self.df[y_axis_var],
-                                    y=converted_time_series,
+                                    y=x_values,
                                     color=self.color_code,
                                     errorbar=None,
                                     hue=self.df[z_axis_var],
                                     palette=self.check_empty_palette(self.palette))
-                ax.yaxis.set_major_locator(ticker.MaxNLocator(nbins=20))
+                ax.yaxis.set_major_locator(chart_data.aggregates["temporal_axis"].locator())
             elif time_var is False:
                 plot = sns.lineplot(self.df,
                                     x=self.df[y_axis_var],
@@ -227,7 +239,7 @@ class MultiLineGraph:
                                     errorbar=None,
                                     hue=self.df[z_axis_var],
                                     palette=self.check_empty_palette(self.palette))
-                ax.yaxis.set_major_locator(DayLocator(interval=self.locator_interval(self.df[x_axis_var])))
+                ax.yaxis.set_major_locator(chart_data.aggregates["temporal_axis"].locator())
             else:
                 plot = sns.lineplot(self.df,
                                     x=self.df[y_axis_var],
@@ -239,15 +251,14 @@ class MultiLineGraph:
                 
         else:
             if time_var is True:
-                converted_time_series = self.df[x_axis_var].dt.seconds.apply(self.overview.dt.convert_timedelta)
                 plot = sns.lineplot(self.df,
-                                    x=converted_time_series,
+                                    x=x_values,
                                     y=self.df[y_axis_var],
                                     color=self.color_code,
                                     errorbar=None,
                                     hue=self.df[z_axis_var],
                                     palette=self.check_empty_palette(self.palette))
-                ax.xaxis.set_major_locator(ticker.MaxNLocator(nbins=20))
+                ax.xaxis.set_major_locator(chart_data.aggregates["temporal_axis"].locator())
             elif time_var is False:
                 plot = sns.lineplot(self.df,
                                     x=self.df[x_axis_var],
@@ -256,7 +267,7 @@ class MultiLineGraph:
                                     errorbar=None,
                                     hue=self.df[z_axis_var],
                                     palette=self.check_empty_palette(self.palette))
-                ax.xaxis.set_major_locator(DayLocator(interval=self.locator_interval(self.df[x_axis_var])))
+                ax.xaxis.set_major_locator(chart_data.aggregates["temporal_axis"].locator())
             else:
                 plot = sns.lineplot(self.df,
                                     x=self.df[x_axis_var],
@@ -266,7 +277,7 @@ class MultiLineGraph:
                                     hue=self.df[z_axis_var],
                                     palette=self.check_empty_palette(self.palette))
         
-        # 3) ADD THE LABELS FOR THE AXES
+        # 4) ADD THE LABELS FOR THE AXES
         if self.orientation == 'horizontal':
             ax.set_xlabel(y_axis_var, fontsize=10)
             ax.set_ylabel(x_axis_var, fontsize=10)
@@ -281,24 +292,19 @@ class MultiLineGraph:
         else:
             handles_labels = [None, None]
         
-        # 4) CREATE THE TITLE FOR THE CHART
+        # 5) CREATE THE TITLE FOR THE CHART
         self.plot_funcs.create_title(custom_title=self.custom_title,
                                      chart_type=self.chart_type,
                                      axis_variable1=y_axis_var,
                                      axis_variable2=x_axis_var,
                                      current_style=self.current_style)
         
-        # 5) ROTATE THE X-AXIS TICKS
-        if time_var is True:
-            plt.xticks(rotation=self.plot_funcs.set_xaxis_rotation(user_xtick_rotation=self.xtick_rotation,
-                                                                   pd_series=converted_time_series,
-                                                                   orientation=self.orientation))    
-        else:
-            plt.xticks(rotation=self.plot_funcs.set_xaxis_rotation(user_xtick_rotation=self.xtick_rotation,
-                                                                   pd_series=self.df[x_axis_var], 
-                                                                   orientation=self.orientation))  
+        # 6) ROTATE THE X-AXIS TICKS
+        plt.xticks(rotation=self.plot_funcs.set_xaxis_rotation(user_xtick_rotation=self.xtick_rotation,
+                                                               pd_series=chart_data.tick_values,
+                                                               orientation=self.orientation))    
         
-        # 6) CREATE THE LEGEND FOR THE CHART 
+        # 7) CREATE THE LEGEND FOR THE CHART 
         # Extract all the legend parameters
         if self.legend_on == "on":
             legend_params = self.plot_funcs.space_legend_out(self.df[z_axis_var], self.space_legend_out)
@@ -318,23 +324,23 @@ class MultiLineGraph:
             # Make sure the legend tite is set to the same color as the labels (i.e. 'white' or 'black')
             ax.get_legend().get_title().set_color(self.plot_funcs.define_edgecolor(self.current_style))
 
-        # 7) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
+        # 8) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
         plt.xticks(fontsize=6)
         plt.yticks(fontsize=6)
-        plt.tight_layout()
+        layout_cache.tight_layout(self.chart_type, self.current_style)
         current_fig = plt.gcf()
         plt.close()
         
         return current_fig
         
          
-    def plot_multiple_charts(self):
+    def chart_specs(self):
 
-        """Creates a list of Matplotlib figures of all possible charts that can be made within the data,
-        from the user-inputted chart-type.
+        """Creates a list of chart specs (see 'support_chart_plan.ChartSpec') of all possible charts that can be made within the data,
+        from the user-inputted chart-type, without creating any of them.
         """
         
-        chart_list = []
+        chart_specs = []
         # Loop through each of the x-axis variables and for each variable, plot it with an y-axis variable
         for x_variable in self.x_list:
             for y_variable in self.y_list:
@@ -342,25 +348,34 @@ class MultiLineGraph:
                 
                     if x_variable != y_variable:
                         if self.df[x_variable].dtype == 'datetime64[ns]':
-                            chart_list.append(self.create_chart(x_variable, y_variable, z_variable, time_var=False))
+                            chart_specs.append(ChartSpec('create_chart', x_variable, y_variable, z_variable, time_var=False))
 
                         elif self.df[x_variable].dtype == 'timedelta64[ns]':
-                            chart_list.append(self.create_chart(x_variable, y_variable, z_variable, time_var=True))
+                            chart_specs.append(ChartSpec('create_chart', x_variable, y_variable, z_variable, time_var=True))
 
-                        elif self.df[x_variable].dtype == 'float64':
-                            chart_list.append(self.create_chart(x_variable, y_variable, z_variable, time_var=None))
+                        elif pd.api.types.is_float_dtype(self.df[x_variable]):
+                            chart_specs.append(ChartSpec('create_chart', x_variable, y_variable, z_variable, time_var=None))
                             
-        return chart_list
+        return chart_specs
+
+    @tracer.traced(category="chart")
+    def plot_multiple_charts(self):
+
+        """Creates a list of Matplotlib figures of the charts that can be made within the data, from the user-inputted chart-type, most informative first.
+        Mirrored and degenerate charts, and any charts beyond the chart budget, are left out (see 'support_chart_plan.ChartPlanner').
+        The charts are only planned once for the data stage, so restyling the charts draws the same charts again.
+        """
+        
+        return [chart_spec.create(self) for chart_spec in self.data_stage.planned_specs(self)]
 
 
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
 # if __name__ == "__main__":
     
-#     # Set the rcParams from the Python File
-#     from rcParams import RCParams
+#     # The style is only applied while each chart is created and drawn (see 'support_rcParams')
+#     from support_rcParams import RCParams
 #     params = RCParams()
-#     style = 4
-#     params.change_style(params.style_list[style])  #'dark_background'
+#     style = params.style_list[4]  #'dark_background'
 
 #     file = r'###############################################/.csv'
 #     dataframe = pd.read_csv(file)
@@ -6,19 +6,25 @@ Small demo on instantiating it as an object if this is run as a script.
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 import warnings
 warnings.filterwarnings("ignore")
 
-import copy
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
 # import the classes from the custom modules needed during instantiation of any Chart Class
-from support_main_classes import ColumnAttributes, DataframeOverview
+from support_main_classes import ColumnAttributes
 from support_plotting import Plotting
 from support_rcParams import RCParams
+from support_tracing import tracer
+from support_memory import memory_monitor
+from support_profiling import chart_profiler
+from support_chart_plan import ChartSpec
+from support_chart_data import ChartData, chart_data_cache
+from support_figure_pool import figure_pool, layout_cache
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
@@ -54,11 +60,17 @@ class MultiScatterPlot:
     rcparams: support_rcParams.RCParams
         An instance of the RCParams class which contains basic, universal characteristics for all plots generated.
     df: pd.DataFrame
-        The original DataFrame inputted.
+        A shallow copy of the converted DataFrame, sharing its data rather than duplicating it.
     chart_type: str
         The chart type that the user has selected on the app home page.
+    data_stage: support_chart_data.DataStage
+        The data stage of the chart instance (shared with any other instance of the same data), which holds the chart data each chart is drawn from.
     """
     
+    # The chart attributes which change the data the charts are drawn from, rather than only how they're drawn.
+    data_attributes = []
+    
+    @memory_monitor.tracked()
     def __init__(self,
                  pd_dataframe: pd.DataFrame,
                  color_code: str=None,
@@ -70,10 +82,8 @@ class MultiScatterPlot:
                  orientation: str=None,
                  palette: str=None):
         
-        self.overview = DataframeOverview(pd_dataframe)
         self.plot_funcs = Plotting()
         self.rcparams = RCParams()
-        self.df = copy.copy(self.overview.dataframe)
         
         self.color_code = color_code
         self.custom_title = custom_title
@@ -85,8 +95,8 @@ class MultiScatterPlot:
         self.palette = palette
         self.chart_type = 'MultiScatter'
         
-        self.chart_rules()   
-        self.plot_funcs.set_plot_style(self.current_style)
+        # The overview, the converted DataFrame and the chart rules are reused if only the style of the charts has changed (see 'support_chart_data').
+        chart_data_cache.load(self, pd_dataframe)
         self.default_xtick_rotation()
 
 
@@ -158,6 +168,24 @@ class MultiScatterPlot:
         return [handles, labels]
         
         
+    def x_axis_chart_data(self, x_axis_var):
+
+        """Creates the chart data (see 'support_chart_data.ChartData') of the 'x-axis' of a Multi-Scatter Plot, which is shared by every Multi-Scatter Plot along it.
+        Every row is drawn, so only the unique values along the 'x-axis' (which the rotation of the ticks is chosen from) are found.
+        
+        Parameters
+        ----------
+        x_axis_var: pd.Series
+            A 'Continuous' column within the DataFrame
+        """
+        
+        return ChartData(self.df, tick_values=pd.Series(self.df[x_axis_var].unique()))
+        
+        
+    @tracer.traced(category="chart")
+    @memory_monitor.tracked()
+    @chart_profiler.profiled()
+    @RCParams.styled(chart_data=("x_axis_chart_data", "x_axis_var"))
     def create_chart(self, x_axis_var, y_axis_var, z_axis_var):
 
         """Create a Multi-Scatter Plot
@@ -173,9 +201,12 @@ class MultiScatterPlot:
         """
         
         # 1) DEFINE THE MATPLOTLIB FIGURE AND AXES 
-        fig, ax = plt.subplots(figsize=(4, 3))
+        fig, ax = figure_pool.subplots(self.chart_type, self.current_style, figsize=(4, 3))
+        
+        # 2) GET THE 'X-AXIS' DATA (ONLY FOUND THE FIRST TIME THE COLUMN IS DRAWN)
+        chart_data = self.data_stage.get_chart_data(self.x_axis_chart_data, x_axis_var)
         
-        # 2) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so) 
+        # 3) INSTANTIATE A 'PLOT' OBJECT FROM THE 'seaborn.objects' INTERFACE (so) 
         if self.orientation == 'horizontal':
             plot = sns.scatterplot(self.df,
                                    x=self.df[y_axis_var],
@@ -200,7 +231,7 @@ class MultiScatterPlot:
                        palette=self.check_empty_palette(self.palette))
         
         
-        # 3) ADD THE LABELS FOR THE AXES
+        # 4) ADD THE LABELS FOR THE AXES
         if self.orientation == 'horizontal':
             ax.set_xlabel(y_axis_var, fontsize=10)
             ax.set_ylabel(x_axis_var, fontsize=10)
@@ -215,19 +246,19 @@ class MultiScatterPlot:
         else:
             handles_labels = [None, None]
         
-        # 4) CREATE THE TITLE FOR THE CHART
+        # 5) CREATE THE TITLE FOR THE CHART
         self.plot_funcs.create_title(custom_title=self.custom_title,
                                      chart_type=self.chart_type,
                                      axis_variable1=y_axis_var,
                                      axis_variable2=x_axis_var,
                                      current_style=self.current_style)
         
-        # 5) ROTATE THE X-AXIS TICKS
+        # 6) ROTATE THE X-AXIS TICKS
         plt.xticks(rotation=self.plot_funcs.set_xaxis_rotation(user_xtick_rotation=self.xtick_rotation,
-                                                               pd_series=self.df[x_axis_var],
+                                                               pd_series=chart_data.tick_values,
                                                                orientation=self.orientation))
         
-        # 6) CREATE THE LEGEND FOR THE CHART 
+        # 7) CREATE THE LEGEND FOR THE CHART 
         # Extract all the legend parameters  
         if self.legend_on == "on":
             legend_params = self.plot_funcs.space_legend_out(self.df[z_axis_var], self.space_legend_out)
@@ -247,23 +278,23 @@ class MultiScatterPlot:
             # Make sure the legend tite is set to the same color as the labels (i.e. 'white' or 'black')
             ax.get_legend().get_title().set_color(self.plot_funcs.define_edgecolor(self.current_style))
 
-        # 7) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
+        # 8) TIGHTEN THE LAYOUT AND SET THE FONT SIZE OF TICKS AND LABELS
         plt.xticks(fontsize=6)
         plt.yticks(fontsize=6)
-        plt.tight_layout()
+        layout_cache.tight_layout(self.chart_type, self.current_style)
         current_fig = plt.gcf()
         plt.close()
         
         return current_fig
         
 
-    def plot_multiple_charts(self):
-        
-        """Creates a list of Matplotlib figures of all possible charts that can be made within the data,
-        from the user-inputted chart-type.
+    def chart_specs(self):
+
+        """Creates a list of chart specs (see 'support_chart_plan.ChartSpec') of all possible charts that can be made within the data,
+        from the user-inputted chart-type, without creating any of them.
         """
         
-        chart_list = []
+        chart_specs = []
         # Loop through each of the x-axis variables and for each variable, plot it with an y-axis variable
         for x_variable in self.x_list:
             for y_variable in self.y_list:
@@ -271,21 +302,28 @@ class MultiScatterPlot:
                 
                     # We need to make sure that we aren't plotting the same variable on both axes however. 
                     if x_variable != y_variable:
-                        chart_list.append(self.create_chart(y_variable, x_variable, z_variable))
-                    else:
-                        pass
+                        chart_specs.append(ChartSpec('create_chart', y_variable, x_variable, z_variable))
                     
-        return chart_list
+        return chart_specs
+
+    @tracer.traced(category="chart")
+    def plot_multiple_charts(self):
+
+        """Creates a list of Matplotlib figures of the charts that can be made within the data, from the user-inputted chart-type, most informative first.
+        Mirrored and degenerate charts, and any charts beyond the chart budget, are left out (see 'support_chart_plan.ChartPlanner').
+        The charts are only planned once for the data stage, so restyling the charts draws the same charts again.
+        """
+        
+        return [chart_spec.create(self) for chart_spec in self.data_stage.planned_specs(self)]
 
 
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
 # if __name__ == "__main__":
     
-#     # Set the rcParams from the Python File
-#     from rcParams import RCParams
+#     # The style is only applied while each chart is created and drawn (see 'support_rcParams')
+#     from support_rcParams import RCParams
 #     params = RCParams()
-#     style = 4
-#     params.change_style(params.style_list[style])  #'dark_background'
+#     style = params.style_list[4]  #'dark_background'
 
 #     file = r'###############################################/.csv'
 #     dataframe = pd.read_csv(file)
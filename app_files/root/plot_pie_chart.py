@@ -6,19 +6,25 @@ Small demo on instantiating it as an object if this is run as a script.
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 import warnings
 warnings.filterwarnings("ignore")
 
-import copy
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
 # import the classes from the custom modules needed during instantiation of any Chart Class
-from support_main_classes import ColumnAttributes, DataframeOverview
+from support_main_classes import ColumnAttributes
 from support_plotting import Plotting
 from support_rcParams import RCParams
+from support_tracing import tracer
+from support_memory import memory_monitor
+from support_profiling import chart_profiler
+from support_chart_plan import ChartSpec
+from support_chart_data import ChartData, chart_data_cache
+from support_figure_pool import figure_pool, layout_cache
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
@@ -58,11 +64,17 @@ class PieChart:
     rcparams: support_rcParams.RCParams
         An instance of the RCParams class which contains basic, universal characteristics for all plots generated.
     df: pd.DataFrame
-        The original DataFrame inputted.
+        A shallow copy of the converted DataFrame, sharing its data rather than duplicating it.
     chart_type: str
         The chart type that the user has selected on the app home page.
+    data_stage: support_chart_data.DataStage
+        The data stage of the chart instance (shared with any other instance of the same data), which holds the chart data each chart is drawn from.
     """
     
+    # The chart attributes which change the data the charts are drawn from, rather than only how they're drawn.
+    data_attributes = []
+    
+    @memory_monitor.tracked()
     def __init__(self,
                  pd_dataframe: pd.DataFrame,
                  color_code: str=None,
@@ -76,10 +88,8 @@ class PieChart:
                  chosen_slice: str=None,
                  donut: str="off"):
         
-        self.overview = DataframeOverview(pd_dataframe)
         self.plot_funcs = Plotting()
         self.rcparams = RCParams()
-        self.df = copy.copy(self.overview.dataframe)
         
         self.color_code = color_code
         self.custom_title = custom_title
@@ -93,8 +103,8 @@ class PieChart:
         self.donut = donut
         self.chart_type = 'Pie'
         
-        self.chart_rules()
-        self.plot_funcs.set_plot_style(self.current_style)
+        # The overview, the converted DataFrame and the chart rules are reused if only the style of the charts has changed (see 'support_chart_data').
+        chart_data_cache.load(self, pd_dataframe)
 
     
     def chart_rules(self):
@@ -118,6 +128,25 @@ class PieChart:
             self.plot_funcs.check_categorical_dtype(self.df, x_variable)            
         
         
+    def pie_chart_data(self, x_axis_var):
+
+        """Creates the chart data (see 'support_chart_data.ChartData') of a Pie Chart: a row for each slice (largest first), with its label and its percentage of the rows.
+        
+        Parameters
+        ----------
+        x_axis_var: pd.Series
+            A 'Nominal'/'Nominal-Binary'/'Ordinal' column within the DataFrame.
+        """
+        
+        percentages, labels = self.plot_funcs.create_percentage_data(self.df[x_axis_var])
+        return ChartData(pd.DataFrame({"label": labels, "percentage": percentages}),
+                         unique_values=pd.Series(self.df[x_axis_var].unique()))
+        
+        
+    @tracer.traced(category="chart")
+    @memory_monitor.tracked()
+    @chart_profiler.profiled()
+    @RCParams.styled(chart_data=("pie_chart_data", "x_axis_var"))
     def create_chart(self, x_axis_var):
 
         """Creates a Pie Chart
@@ -129,30 +158,32 @@ class PieChart:
         """
         
         # 1) DEFINE THE MATPLOTLIB FIGURE AND AXES 
-        fig, ax = plt.subplots(figsize=(4, 3))
+        fig, ax = figure_pool.subplots(self.chart_type, self.current_style, figsize=(4, 3))
     
-        # 2) APPLY ANY WEDGES OR EXPLODED SLICES AS SPECIFIED (IF ANY)
-        # Get the wedges, returns 'None', if 'donut' is 'False'
-        wedge_props = self.plot_funcs.apply_donut(self.donut, self.current_style)
-        # explode_slice (Can either be 'None' - 'Largest' - 'Smallest')
-        explode_ = self.plot_funcs.explode_slice(self.df[x_axis_var], self.chosen_slice)
-        
-        # 3) GET THE DATA AS A PERCENTAGE OF 100%
-        data = self.plot_funcs.create_percentage_data(self.df[x_axis_var])[0]
+        # 2) GET THE DATA AS A PERCENTAGE OF 100% (ONLY COUNTED THE FIRST TIME THE CHART IS DRAWN)
+        chart_data = self.data_stage.get_chart_data(self.pie_chart_data, x_axis_var)
+        slices = chart_data.frame
+        data = list(slices["percentage"])
         # Basically, if the 'legend' is turned on, we're going to migrate all the labels onto that, instead of on the plot. 
         if self.legend_on == "on":
             labels = None
-            legend_labels = self.plot_funcs.create_percentage_data(self.df[x_axis_var])[1]
+            legend_labels = list(slices["label"])
         else:
-            labels = self.plot_funcs.create_percentage_data(self.df[x_axis_var])[1]
+            labels = list(slices["label"])
             legend_labels = None
         
+        # 3) APPLY ANY WEDGES OR EXPLODED SLICES AS SPECIFIED (IF ANY)
+        # Get the wedges, returns 'None', if 'donut' is 'False'
+        wedge_props = self.plot_funcs.apply_donut(self.donut, self.current_style)
+        # explode_slice (Can either be 'None' - 'Largest' - 'Smallest')
+        explode_ = self.plot_funcs.explode_slice(data, self.chosen_slice)
+        
         # 4) RETURN THE TEXT PARAMETERS FOR BOTH INSIDE THE PIE CHART AND ON THE LEGEND
         # Return the parameters as they are in proportion to the number of variables in the Pi Chart. 
-        size_params = self.plot_funcs.pie_chart_size_parameters(self.df[x_axis_var], self.donut)
+        size_params = self.plot_funcs.pie_chart_size_parameters(chart_data.aggregates["unique_values"], self.donut)
         pct, font = size_params[0], size_params[1]
         
-        legend_params = self.plot_funcs.space_legend_out(self.df[x_axis_var], self.space_legend_out)
+        legend_params = self.plot_funcs.space_legend_out(chart_data.aggregates["unique_values"], self.space_legend_out)
         legend_font, legend_bbox_anchor = legend_params[0], legend_params[1]
         
         # 5) CREATE THE PIE CHART
@@ -196,37 +227,45 @@ class PieChart:
             ax.get_legend().get_title().set_color(self.plot_funcs.define_edgecolor(self.current_style))
         
         # 9) TIGHTEN THE LAYOUT AND PLOT THE FIGURE
-        plt.tight_layout()        
+        layout_cache.tight_layout(self.chart_type, self.current_style)
         current_fig = plt.gcf()
         plt.close()
         
         return current_fig
         
         
-    def plot_multiple_charts(self):
+    def chart_specs(self):
 
-        """Creates a list of Matplotlib figures of all possible charts that can be made within the data,
-        from the user-inputted chart-type.
+        """Creates a list of chart specs (see 'support_chart_plan.ChartSpec') of all possible charts that can be made within the data,
+        from the user-inputted chart-type, without creating any of them.
         """
         
-        chart_list = []
+        chart_specs = []
         if len(self.x_list) > 0:
         
             for x_variable in self.x_list:
-                chart_list.append(self.create_chart(x_variable))
-                
-        return chart_list
+                chart_specs.append(ChartSpec('create_chart', x_variable))
                 
+        return chart_specs
+
+    @tracer.traced(category="chart")
+    def plot_multiple_charts(self):
+
+        """Creates a list of Matplotlib figures of the charts that can be made within the data, from the user-inputted chart-type, most informative first.
+        Mirrored and degenerate charts, and any charts beyond the chart budget, are left out (see 'support_chart_plan.ChartPlanner').
+        The charts are only planned once for the data stage, so restyling the charts draws the same charts again.
+        """
+        
+        return [chart_spec.create(self) for chart_spec in self.data_stage.planned_specs(self)]
+
 
-              
 #%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#            
 # if __name__ == "__main__":
     
-#     # Set the rcParams from the Python File
-#     from rcParams import RCParams
+#     # The style is only applied while each chart is created and drawn (see 'support_rcParams')
+#     from support_rcParams import RCParams
 #     params = RCParams()
-#     style = 7
-#     params.change_style(params.style_list[style])  #'dark_background'
+#     style = params.style_list[4]  #'dark_background'
 
 #     file = r'###############################################/.csv'
 #     dataframe = pd.read_csv(file)
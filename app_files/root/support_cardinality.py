@@ -0,0 +1,191 @@
+"""root.support_cardinality
+A module dedicated towards counting the unique values of a column only as far as a decision needs, so a threshold check doesn't cost a full scan:
+    - 'CardinalityEstimator.bounded_unique' counts the unique values of a column a chunk at a time, and stops as soon as the count is above the
+      threshold, so an ID-like column is known to be above it after its first chunk (whatever its length).
+    - 'HyperLogLog' is a fixed-size sketch of a column, which reports an approximate number of unique values (within around 1%) for a column
+      too large to count exactly (see 'CardinalityEstimator.approximate_unique').
+"""
+
+import os
+import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
+import math
+import numpy as np
+import pandas as pd
+
+
+class CardinalityEstimator:
+
+    """
+    A class for counting the unique values of a column up to a threshold, or approximately.
+    """
+
+    # The number of values in the first chunk counted. Each chunk after it is twice as large, up to 'max_chunk' values.
+    first_chunk = 1024
+    max_chunk = 1048576
+
+    # The number of rows above which 'approximate_unique' uses a 'HyperLogLog' sketch, rather than counting exactly.
+    sketch_rows = 1000000
+
+    @classmethod
+    def bounded_unique(cls, pd_series, limit: int):
+
+        """This function returns the number of unique values within the column (a null value counts as one, as in 'pd.unique'), if it's 'limit'
+        or less. Otherwise it stops counting as soon as the count is above 'limit', and returns the count so far (which is above 'limit').
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            The Series of interest in the DataFrame.
+        limit: int
+            The number of unique values after which the count stops.
+        """
+
+        # A 'Categorical' column is counted from its integer codes (a null value is the code -1).
+        if isinstance(pd_series.dtype, pd.CategoricalDtype):
+            values = pd_series.cat.codes.to_numpy()
+        else:
+            values = pd_series.to_numpy()
+
+        seen = set()
+        has_null = False
+        start = 0
+        chunk = cls.first_chunk
+        while start < len(values):
+            uniques = pd.unique(values[start:start + chunk])
+            if len(uniques) > limit:
+                return len(uniques)
+
+            null_mask = pd.isna(uniques)
+            has_null = has_null or bool(null_mask.any())
+            seen.update(uniques[~null_mask].tolist())
+            if len(seen) + has_null > limit:
+                return len(seen) + has_null
+
+            start += chunk
+            chunk = min(chunk * 2, cls.max_chunk)
+
+        return len(seen) + has_null
+
+    @classmethod
+    def exceeds(cls, pd_series, threshold: int):
+
+        """This function determines whether the number of unique values within the column is above the threshold (see 'bounded_unique').
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            The Series of interest in the DataFrame.
+        threshold: int
+            The number of unique values the column is compared with.
+        """
+
+        return cls.bounded_unique(pd_series, threshold) > threshold
+
+    @classmethod
+    def approximate_unique(cls, pd_series):
+
+        """This function returns the number of unique values within the column: exactly for a column of up to 'sketch_rows' rows,
+        and from a 'HyperLogLog' sketch of the column (a chunk at a time) for a larger column.
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            The Series of interest in the DataFrame.
+        """
+
+        if len(pd_series) <= cls.sketch_rows:
+            return int(pd_series.nunique(dropna=False))
+
+        sketch = HyperLogLog()
+        for start in range(0, len(pd_series), cls.max_chunk):
+            sketch.add(pd_series.iloc[start:start + cls.max_chunk])
+        return sketch.count()
+
+
+class HyperLogLog:
+
+    """
+    A class for instantiating a 'HyperLogLog' sketch, which estimates the number of unique values added to it, in a fixed amount of memory.
+    Each value is hashed: the first 'precision' bits of the hash choose a register, which keeps the longest run of leading zeros (plus one)
+    seen in the rest of the hashes it was chosen by. The relative error of the estimate is around 1.04 / sqrt(2 ** precision).
+
+    Attributes
+    ----------
+    precision: int
+        The number of bits of each hash that choose its register (16384 registers, and around 0.8% error, for a precision of 14).
+    registers: np.ndarray
+        The longest run of leading zeros (plus one) of each register.
+    """
+
+    __slots__ = ("precision", "registers")
+
+    # The number of bits of a hash (see 'pd.util.hash_pandas_object').
+    hash_bits = 64
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(2 ** precision, dtype=np.uint8)
+
+    def add(self, pd_series):
+
+        """This function adds the values of a column to the sketch, for every value at once. A null value is counted as one value.
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            The values to add.
+        """
+
+        if len(pd_series) == 0:
+            return
+
+        # The values are hashed one by one, rather than factorized first, as a sketched column mostly holds different values.
+        hashes = pd.util.hash_pandas_object(pd_series, index=False, categorize=False).to_numpy()
+        remaining_bits = self.hash_bits - self.precision
+        register_index = (hashes >> np.uint64(remaining_bits)).astype(np.int64)
+        remaining = (hashes & np.uint64((1 << remaining_bits) - 1)).astype(np.float64)
+
+        # The position of the first 1 bit of the rest of the hash (or one past its end, if every bit is 0).
+        with np.errstate(divide='ignore'):
+            ranks = np.where(remaining > 0, remaining_bits - np.floor(np.log2(remaining)), remaining_bits + 1)
+        np.maximum.at(self.registers, register_index, ranks.astype(np.uint8))
+
+    def merge(self, other):
+
+        """This function adds another sketch (of the same precision) to this sketch, e.g. the sketch of rows appended to a column.
+
+        Parameters
+        ----------
+        other: HyperLogLog
+            The other sketch.
+        """
+
+        if other.precision != self.precision:
+            raise ValueError("Only sketches of the same precision can be merged.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+
+        "This function returns the estimated number of unique values added to the sketch."
+
+        register_no = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / register_no)
+        estimate = alpha * register_no * register_no / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+        # Few unique values leave some registers empty, and are counted more accurately from the number of empty registers.
+        empty_registers = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * register_no and empty_registers > 0:
+            estimate = register_no * math.log(register_no / empty_registers)
+        return int(round(estimate))
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     ids = pd.Series(np.arange(10000000)).astype(str)
+#     print(CardinalityEstimator.exceeds(ids, 30), CardinalityEstimator.approximate_unique(ids))
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
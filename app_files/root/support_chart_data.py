@@ -0,0 +1,261 @@
+"""root.support_chart_data
+A module dedicated towards splitting every chart into a data stage and a draw stage, so that restyling charts doesn't recompute their data.
+The data stage (the 'DataframeOverview', the chart rules, the chart plan, and the aggregated 'chart data' each chart is drawn from) depends only on
+the DataFrame, the chart type and the few chart attributes that change the data (e.g. 'single_axes' or 'n_bins'). It is cached, so pressing Generate
+again after changing only the style, palette, title, legend or colour of a chart type skips it entirely and only draws the charts again.
+The cache can be switched off with the 'AUTOGRAPHICA_CHART_DATA' environment variable (e.g. 'AUTOGRAPHICA_CHART_DATA=off').
+"""
+
+import os
+import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
+import weakref
+from collections import OrderedDict
+from support_main_classes import DataframeOverview
+from support_chart_plan import ChartPlanner
+from support_tracing import tracer
+
+
+class ChartData:
+
+    """
+    A class for instantiating a 'chart data' object, which holds everything a single chart is drawn from, once it has been aggregated.
+
+    Attributes
+    ----------
+    frame: pd.DataFrame
+        The data the chart is drawn from, either aggregated (e.g. one row per bar) or the chart instance's DataFrame itself.
+    tick_values: pd.Series, None
+        The unique values along the 'x-axis', which the rotation of the ticks is chosen from.
+    aggregates: dict
+        Any other values calculated from the data (e.g. the interval between date ticks, a converted time series).
+    """
+
+    __slots__ = ("frame", "tick_values", "aggregates")
+
+    def __init__(self, frame, tick_values=None, **aggregates):
+        self.frame = frame
+        self.tick_values = tick_values
+        self.aggregates = aggregates
+
+
+class DataStage:
+
+    """
+    A class for instantiating a 'data stage' object, which holds the result of the data stage of a chart instance, so it can be shared with
+    any later chart instance of the same chart type and data.
+
+    Attributes
+    ----------
+    overview: support_main_classes.DataframeOverview
+        The overview of the DataFrame.
+    df: pd.DataFrame
+        The shallow copy of the converted DataFrame, with the columns the chart rules convert for plotting.
+    rule_lists: dict
+        The columns the chart rules found for each axis (e.g. 'x_list', 'y_list').
+    chart_specs: list, None
+        The chart specs planned (see 'support_chart_plan.ChartPlanner'), once they have been.
+    chart_data: dict
+        The 'ChartData' of every chart drawn, by the data method and the arguments it was created from.
+    """
+
+    # The attributes the chart rules of each chart class set.
+    rule_attributes = ['x_list', 'y_list', 'z_list', 'high_cardinal_x_variables']
+
+    def __init__(self, overview, df, rule_lists: dict):
+        self.overview = overview
+        self.df = df
+        self.rule_lists = rule_lists
+        self.chart_specs = None
+        self.chart_data = {}
+
+    @classmethod
+    def build(cls, chart_instance, overview):
+
+        """This function runs the data stage of a chart instance from the overview of its DataFrame, and returns it.
+
+        Parameters
+        ----------
+        chart_instance: object
+            An instance of a chart class (LineGraph, ScatterPlot, BarChart, etc.)
+        overview: support_main_classes.DataframeOverview
+            The overview of the DataFrame.
+        """
+
+        chart_instance.overview = overview
+        # A shallow copy shares the converted data with 'overview', any columns converted for plotting are only replaced in this copy.
+        chart_instance.df = overview.dataframe.copy(deep=False)
+        chart_instance.chart_rules()
+        rule_lists = {name: getattr(chart_instance, name) for name in cls.rule_attributes if hasattr(chart_instance, name)}
+        return cls(overview, chart_instance.df, rule_lists)
+
+    def restore(self, chart_instance):
+
+        "This function gives a chart instance the result of the data stage, as if it had run it itself."
+
+        chart_instance.overview = self.overview
+        chart_instance.df = self.df
+        for name, rule_list in self.rule_lists.items():
+            setattr(chart_instance, name, list(rule_list))
+        chart_instance.data_stage = self
+
+    def planned_specs(self, chart_instance):
+
+        "This function returns the chart specs the chart instance plans to create, planning them the first time."
+
+        if self.chart_specs is None:
+            self.chart_specs = ChartPlanner(self.overview).plan(chart_instance.chart_type, chart_instance.chart_specs())
+        return self.chart_specs
+
+    def get_chart_data(self, data_method, *args):
+
+        """This function returns the 'ChartData' a single chart is drawn from, aggregating it the first time.
+
+        Parameters
+        ----------
+        data_method: function
+            The (bound) method of the chart instance which aggregates the chart data.
+        args: tuple
+            The arguments the chart was created from (the names of the columns plotted, and any flags).
+        """
+
+        key = (data_method.__name__, args)
+        if key not in self.chart_data:
+            with tracer.span("chart_data", "chart", method=data_method.__name__):
+                self.chart_data[key] = data_method(*args)
+        return self.chart_data[key]
+
+
+class ChartDataCache:
+
+    """
+    A class for instantiating a 'chart data cache' object, which keeps the most recent data stages, by the DataFrame, the chart type
+    and the chart attributes that change the data.
+
+    Attributes
+    ----------
+    data_stages: collections.OrderedDict
+        The data stages cached (and a weak reference to the DataFrame each was run on), least recently used first.
+    """
+
+    # The number of data stages kept, each holds the overview (and converted DataFrame) of a file.
+    max_data_stages = 8
+
+    def __init__(self):
+        self.data_stages = OrderedDict()
+
+    @staticmethod
+    def is_enabled():
+
+        "This function determines whether the data stages are cached (on by default)."
+
+        return os.environ.get("AUTOGRAPHICA_CHART_DATA", "on") not in ["", "0", "off"]
+
+    @staticmethod
+    def data_key(chart_instance, pd_dataframe):
+
+        """This function returns the key a data stage is cached by. The chart attributes that change the data are listed in each chart class's 'data_attributes',
+        every other attribute (the style, palette, title, legend, colour, etc.) only changes how the charts are drawn."""
+
+        return (chart_instance.chart_type,
+                id(pd_dataframe),
+                pd_dataframe.shape,
+                tuple(str(getattr(chart_instance, name, None)) for name in getattr(chart_instance, "data_attributes", [])))
+
+    def get(self, key, pd_dataframe):
+
+        "This function returns the data stage cached for a key, if the DataFrame it was run on is still the same object."
+
+        entry = self.data_stages.get(key)
+        if entry is None or entry[0]() is not pd_dataframe:
+            return None
+        self.data_stages.move_to_end(key)
+        return entry[1]
+
+    def put(self, key, pd_dataframe, data_stage: DataStage):
+
+        "This function caches a data stage, dropping the least recently used once there are more than 'max_data_stages'."
+
+        self.data_stages[key] = (weakref.ref(pd_dataframe), data_stage)
+        self.data_stages.move_to_end(key)
+        while len(self.data_stages) > self.max_data_stages:
+            self.data_stages.popitem(last=False)
+
+    def load(self, chart_instance, pd_dataframe):
+
+        """This function gives a chart instance its data stage: the cached one if the DataFrame and the chart attributes that change the data are the same,
+        otherwise it runs the data stage (and caches it by both the DataFrame given and the converted DataFrame, which is what the app passes in next time).
+
+        Parameters
+        ----------
+        chart_instance: object
+            An instance of a chart class (LineGraph, ScatterPlot, BarChart, etc.), with its chart attributes set.
+        pd_dataframe: pd.DataFrame
+            The DataFrame from the file submitted by the user.
+        """
+
+        with tracer.span("data_stage", "chart", chart_type=chart_instance.chart_type) as span:
+            key = self.data_key(chart_instance, pd_dataframe)
+            data_stage = self.get(key, pd_dataframe) if self.is_enabled() is True else None
+            span.set(cached=data_stage is not None)
+
+            if data_stage is None:
+                data_stage = DataStage.build(chart_instance, DataframeOverview(pd_dataframe))
+                if self.is_enabled() is True:
+                    self.put(key, pd_dataframe, data_stage)
+                    converted_dataframe = data_stage.overview.dataframe
+                    if converted_dataframe is not pd_dataframe:
+                        self.put(self.data_key(chart_instance, converted_dataframe), converted_dataframe, data_stage)
+
+            data_stage.restore(chart_instance)
+
+    def reload(self, chart_instance):
+
+        """This function runs the data stage of a chart instance again from its overview, once the overview has changed (e.g. rows were appended in the watch mode).
+        Any data stage cached from the same overview is dropped, as its chart data is out of date."""
+
+        self.discard(chart_instance.overview)
+        DataStage.build(chart_instance, chart_instance.overview).restore(chart_instance)
+
+    def discard(self, overview):
+
+        "This function drops every data stage cached from an overview."
+
+        for key in [key for key, entry in self.data_stages.items() if entry[1].overview is overview]:
+            del self.data_stages[key]
+
+    def retain(self, pd_dataframe):
+
+        "This function drops every data stage cached from any DataFrame other than the one given (e.g. those of a file no longer open)."
+
+        for key in [key for key, entry in self.data_stages.items() if pd_dataframe is None
+                    or (entry[0]() is not pd_dataframe and entry[1].overview.dataframe is not pd_dataframe)]:
+            del self.data_stages[key]
+
+    def clear(self):
+
+        "This function drops every data stage cached."
+
+        self.data_stages.clear()
+
+
+# The cache is shared by every chart instance.
+chart_data_cache = ChartDataCache()
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     from instantiation_file_controller import FileController
+#     from instantiation_create_chart_instance import CreateChartInstance
+
+#     file = r'###############################################/.csv'
+#     dataframe = FileController(file, 'Bar').dataframe
+#     bar_instance = CreateChartInstance(dataframe, 'Bar', [None] * 7).validate_chart_attributes()
+#     # Only the style changes, so the data stage is reused and the charts are only drawn again.
+#     restyled_instance = CreateChartInstance(bar_instance.overview.dataframe, 'Bar', [None, None, None, None, 'dark_background', None, None]).validate_chart_attributes()
+#     print(restyled_instance.data_stage is bar_instance.data_stage)
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
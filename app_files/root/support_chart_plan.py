@@ -0,0 +1,293 @@
+"""root.support_chart_plan
+A module dedicated towards planning which charts are created, before any of them are drawn.
+Each chart class enumerates a 'chart spec' for every chart it could make, and the planner:
+    - removes mirrored duplicates (e.g. a Scatter Plot of (x, y) and of (y, x)),
+    - drops degenerate charts (a constant column, or an ID-like column with a different value in every row),
+    - ranks the rest with cheap, vectorized statistics (correlation, variance, group separation and balance),
+    - and keeps the top-K, so the most informative charts are drawn first and wide datasets don't create thousands of charts.
+The chart budget (K) is set with the 'AUTOGRAPHICA_CHART_BUDGET' environment variable (or by running the app with '--chart-budget K'), by default every chart is kept.
+"""
+
+import os
+import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
+import numpy as np
+import pandas as pd
+from support_tracing import tracer
+
+
+class ChartSpec:
+
+    """
+    A class for instantiating a 'chart spec' object, which describes a single chart a chart instance can create, without creating it.
+
+    Attributes
+    ----------
+    method: str
+        The name of the chart instance's method which creates the chart (e.g. 'create_chart', 'create_double_axes_chart').
+    args: tuple
+        The arguments the method is called with (the names of the columns plotted, in order, and any flags).
+    kwargs: dict
+        The keyword arguments the method is called with (e.g. 'time_var').
+    score: float, None
+        How informative the chart is expected to be (from 0 to 1), once it has been ranked by the 'ChartPlanner'.
+    """
+
+    __slots__ = ("method", "args", "kwargs", "score")
+
+    def __init__(self, method: str, *args, **kwargs):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.score = None
+
+    def __repr__(self):
+        return f"ChartSpec({self.method}, {', '.join(str(arg) for arg in self.args)}, score={self.score})"
+
+    def columns(self, dataframe_columns):
+
+        "This function returns the names of the columns the chart plots, in order."
+
+        return [arg for arg in self.args if isinstance(arg, str) and arg in dataframe_columns]
+
+    def create(self, chart_instance):
+
+        "This function creates the chart with the chart instance, and returns its figure."
+
+        return getattr(chart_instance, self.method)(*self.args, **self.kwargs)
+
+
+class ChartPlanner:
+
+    """
+    A class for instantiating a 'chart planner' object, which dedupes, filters, ranks and limits the chart specs of a chart instance.
+
+    Attributes
+    ----------
+    overview: support_main_classes.DataframeOverview
+        The overview of the chart instance, whose column profile is used to find degenerate columns.
+    sample: pd.DataFrame
+        An evenly spaced sample of the rows of the DataFrame, which the statistics are calculated from.
+    budget: int, None
+        The maximum number of charts planned. 'None' plans every chart.
+    """
+
+    # The chart types whose first two axes can be swapped without giving a different chart (only one of the pair is kept).
+    mirrored_chart_types = ['Scatter', 'MultiScatter']
+
+    # The maximum number of rows the statistics are calculated from.
+    sample_rows = 10000
+
+    # A column with a different value in every row is only considered ID-like if there are at least this many rows.
+    id_min_rows = 20
+
+    numeric_categories = ['Continuous', 'Discrete']
+    group_categories = ['Nominal', 'Nominal-Binary', 'Ordinal']
+
+    def __init__(self, overview, budget=None):
+        self.overview = overview
+        self.budget = budget if budget is not None else self.default_budget()
+        self.categories = {column_instance.column_name: column_instance.data_category for column_instance in overview.column_attributes.values()}
+        self.sample = self.sample_dataframe(overview.dataframe)
+        self.correlations = None
+        self.group_separations = {}
+        self.univariate_scores = {}
+
+    @staticmethod
+    def default_budget():
+
+        "This function returns the chart budget set by the 'AUTOGRAPHICA_CHART_BUDGET' environment variable, or 'None' if it is not set."
+
+        try:
+            budget = int(os.environ.get("AUTOGRAPHICA_CHART_BUDGET", ""))
+        except ValueError:
+            return None
+        return budget if budget > 0 else None
+
+    def sample_dataframe(self, dataframe: pd.DataFrame):
+
+        "This function returns at most 'sample_rows' evenly spaced rows of the DataFrame (every row of a smaller DataFrame)."
+
+        if len(dataframe) <= self.sample_rows:
+            return dataframe
+        return dataframe.iloc[np.linspace(0, len(dataframe) - 1, self.sample_rows).astype("int64")]
+
+    def degenerate_columns(self):
+
+        """This function returns the columns no chart should be made from:
+            - constant columns (a single unique value),
+            - ID-like columns (a different value in every row, that is either text or whole numbers in increasing order).
+        """
+
+        degenerate_columns = set()
+        rows = len(self.overview.dataframe)
+
+        for column_instance in self.overview.column_attributes.values():
+            column = column_instance.column_name
+            if column_instance.unique_values <= 1:
+                degenerate_columns.add(column)
+            elif rows >= self.id_min_rows and column_instance.unique_values == rows:
+                if column_instance.data_category in self.group_categories:
+                    degenerate_columns.add(column)
+                elif column_instance.data_category == 'Discrete' and self.overview.dataframe[column].is_monotonic_increasing:
+                    degenerate_columns.add(column)
+
+        return degenerate_columns
+
+    def mirror_key(self, chart_type: str, chart_spec: ChartSpec):
+
+        "This function returns a key which is the same for a chart spec and its mirror image (the first two axes swapped)."
+
+        args = chart_spec.args
+        if chart_type in self.mirrored_chart_types and len(args) >= 2:
+            args = (frozenset(args[:2]),) + args[2:]
+        return (chart_spec.method, args, tuple(sorted(chart_spec.kwargs.items())))
+
+    def numeric_values(self, column: str):
+
+        "This function returns the sampled values of a numeric column as floats."
+
+        return pd.to_numeric(self.sample[column], errors="coerce").to_numpy(dtype="float64")
+
+    def correlation(self, column_1: str, column_2: str):
+
+        """This function returns the absolute (Pearson) correlation between two numeric columns.
+        The correlation matrix of every numeric column is calculated in one go the first time it is needed."""
+
+        if self.correlations is None:
+            numeric_columns = [column for column, category in self.categories.items() if category in self.numeric_categories]
+            matrix = np.column_stack([self.numeric_values(column) for column in numeric_columns]) if len(numeric_columns) > 0 else np.empty((0, 0))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                correlations = np.corrcoef(matrix, rowvar=False) if matrix.shape[1] > 1 else np.ones((matrix.shape[1], matrix.shape[1]))
+            # A constant column has no correlation with anything.
+            self.correlations = pd.DataFrame(np.nan_to_num(np.abs(np.atleast_2d(correlations))), index=numeric_columns, columns=numeric_columns)
+
+        return float(self.correlations.at[column_1, column_2])
+
+    def group_separation(self, group_column: str, value_column: str):
+
+        """This function returns how well the groups of a categorical column separate the values of a numeric column,
+        as the share of the variance that lies between the groups (eta squared, from 0 to 1).
+        The separation of every numeric column is calculated in one go, the first time a categorical column is needed."""
+
+        if group_column not in self.group_separations:
+            numeric_columns = [column for column, category in self.categories.items() if category in self.numeric_categories]
+            values = pd.DataFrame({column: self.numeric_values(column) for column in numeric_columns}, index=self.sample.index)
+            grouped = values.groupby(self.sample[group_column], observed=True, sort=False)
+            group_means = grouped.mean()
+            group_counts = grouped.count()
+            between = (group_counts * (group_means - values.mean()) ** 2).sum()
+            total = ((values - values.mean()) ** 2).sum()
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self.group_separations[group_column] = (between / total).fillna(0).clip(0, 1)
+
+        return float(self.group_separations[group_column].get(value_column, 0.0))
+
+    def univariate_score(self, column: str):
+
+        """This function returns how informative a single column is expected to be:
+            - numeric columns: their coefficient of variation, scaled from 0 to 1.
+            - categorical columns: the balance of their categories (the normalised entropy), as a single dominant category says little.
+            - 'Date'/'Time' columns: 1, as any time axis is worth plotting.
+        """
+
+        if column not in self.univariate_scores:
+            category = self.categories.get(column)
+            if category in self.numeric_categories:
+                values = self.numeric_values(column)
+                mean, standard_deviation = np.nanmean(values), np.nanstd(values)
+                variation = standard_deviation / abs(mean) if mean != 0 else standard_deviation
+                score = variation / (1 + variation) if np.isfinite(variation) else 0.0
+            elif category in self.group_categories:
+                proportions = self.sample[column].value_counts(normalize=True, dropna=False).to_numpy()
+                proportions = proportions[proportions > 0]
+                score = float(-(proportions * np.log(proportions)).sum() / np.log(len(proportions))) if len(proportions) > 1 else 0.0
+            else:
+                score = 1.0
+            self.univariate_scores[column] = float(score)
+
+        return self.univariate_scores[column]
+
+    def pair_score(self, column_1: str, column_2: str):
+
+        "This function returns how informative plotting two columns together is expected to be, or 'None' if there's no statistic for the pair."
+
+        category_1, category_2 = self.categories.get(column_1), self.categories.get(column_2)
+        if category_1 in self.numeric_categories and category_2 in self.numeric_categories:
+            return self.correlation(column_1, column_2)
+        elif category_1 in self.group_categories and category_2 in self.numeric_categories:
+            return self.group_separation(column_1, column_2)
+        elif category_2 in self.group_categories and category_1 in self.numeric_categories:
+            return self.group_separation(column_2, column_1)
+        else:
+            return None
+
+    def score(self, chart_spec: ChartSpec):
+
+        """This function scores a chart spec, as the mean of the scores of every pair of columns it plots
+        (or of every column on its own, if there are no pairs with a statistic, such as a single column or a time axis)."""
+
+        columns = chart_spec.columns(self.overview.dataframe.columns)
+        pair_scores = [self.pair_score(columns[i], columns[j]) for i in range(0, len(columns)) for j in range(i + 1, len(columns))]
+        pair_scores = [pair_score for pair_score in pair_scores if pair_score is not None]
+
+        if len(pair_scores) > 0:
+            return float(np.mean(pair_scores))
+        elif len(columns) > 0:
+            return float(np.mean([self.univariate_score(column) for column in columns]))
+        return 0.0
+
+    def plan(self, chart_type: str, chart_specs: list):
+
+        """This function returns the chart specs to create, most informative first: mirrored duplicates and degenerate charts are removed,
+        the rest are ranked by their score (keeping the order they were enumerated in for equal scores), and only the top 'budget' are kept.
+
+        Parameters
+        ----------
+        chart_type: str
+            The chart type (Line, Scatter, Bar, etc.)
+        chart_specs: list
+            Every chart spec the chart instance can create.
+        """
+
+        with tracer.span("plan_charts", "chart", chart_type=chart_type, candidates=len(chart_specs)) as span:
+            degenerate_columns = self.degenerate_columns()
+            dataframe_columns = self.overview.dataframe.columns
+
+            planned_specs = []
+            mirror_keys = set()
+            for chart_spec in chart_specs:
+                if len(degenerate_columns.intersection(chart_spec.columns(dataframe_columns))) > 0:
+                    continue
+                mirror_key = self.mirror_key(chart_type, chart_spec)
+                if mirror_key in mirror_keys:
+                    continue
+                mirror_keys.add(mirror_key)
+                planned_specs.append(chart_spec)
+
+            for chart_spec in planned_specs:
+                chart_spec.score = self.score(chart_spec)
+            planned_specs.sort(key=lambda chart_spec: chart_spec.score, reverse=True)
+
+            if self.budget is not None:
+                planned_specs = planned_specs[:self.budget]
+
+            span.set(degenerate_columns=sorted(str(column) for column in degenerate_columns), planned=len(planned_specs))
+
+        return planned_specs
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     from instantiation_file_controller import FileController
+#     from instantiation_create_chart_instance import CreateChartInstance
+
+#     file = r'###############################################/.csv'
+#     chart_instance = CreateChartInstance(FileController(file, 'Scatter').dataframe, 'Scatter', [None] * 6).validate_chart_attributes()
+#     for chart_spec in ChartPlanner(chart_instance.overview, budget=10).plan('Scatter', chart_instance.chart_specs()):
+#         print(chart_spec)
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
@@ -0,0 +1,326 @@
+"""root.support_column_statistics
+A module dedicated towards profiling every column of a DataFrame at once, so that profiling scales to thousands of columns.
+The columns are grouped by the kind of values they hold (whole numbers, decimals, dates/times and text), and each block of columns in a group
+is profiled in one vectorized pass: the values of the block are factorized together (for the number of unique values), and the null count,
+whether every value is a whole number, the smallest and largest value and the lengths of the text are reduced for every column of the block at once.
+The unique values of a column of more than 'CardinalityEstimator.sketch_rows' rows, whose data category doesn't depend on them ('Continuous' or 'Date'),
+are counted approximately from a sketch instead (see 'support_cardinality'), which bounds the memory used to count them.
+The 'ColumnStatistics' of each column are cached on the 'DataframeOverview', and fill its 'ColumnAttributes' (see 'support_main_classes').
+"""
+
+import os
+import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
+import numpy as np
+import pandas as pd
+from support_tracing import tracer
+from support_cardinality import CardinalityEstimator
+
+
+class ColumnStatistics:
+
+    """
+    A class for instantiating a 'column statistics' object, which holds the statistics of a single column, as profiled by the 'StatisticsKernel'.
+
+    Attributes
+    ----------
+    column_name: str
+        The name of the column.
+    column_dtype: str
+        The data type of the column (see 'canonical_dtype').
+    rows: int
+        The number of rows in the column.
+    unique_values: int
+        The number of unique values within the column (a null value counts as one, as in 'pd.unique'). It's approximate (within around 1%)
+        for a 'Continuous' or 'Date' column of more than 'CardinalityEstimator.sketch_rows' rows.
+    null_values: int
+        The number of null values within the column.
+    integral: bool
+        Whether every (non-null) value of a numeric column is a whole number.
+    minimum, maximum: float, None
+        The smallest and largest value of a numeric column.
+    min_length, max_length, mean_length: float, None
+        The shortest, longest and mean length of the text values of a text column.
+    """
+
+    __slots__ = ("column_name", "column_dtype", "rows", "unique_values", "null_values", "integral",
+                 "minimum", "maximum", "min_length", "max_length", "mean_length")
+
+    # If there is 'x' or less unique values in a text column, it will be labelled 'ordinal'
+    threshold_value = 10
+
+    def __init__(self, column_name, column_dtype: str, rows: int):
+        self.column_name = column_name
+        self.column_dtype = column_dtype
+        self.rows = rows
+        self.unique_values = 0
+        self.null_values = 0
+        self.integral = True
+        self.minimum = None
+        self.maximum = None
+        self.min_length = None
+        self.max_length = None
+        self.mean_length = None
+
+    @staticmethod
+    def canonical_dtype(pd_series):
+
+        """This function returns the data type of the column, as it was before the DataFrame was compacted.
+        A 'Categorical' column returns the data type of its categories, and a downcast numeric column returns 'int64'/'float64',
+        so that a compacted column is given the same data category as the original column.
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            The column of interest within the DataFrame.
+        """
+
+        column_dtype = pd_series.dtype
+        if isinstance(column_dtype, pd.CategoricalDtype):
+            column_dtype = column_dtype.categories.dtype
+
+        if pd.api.types.is_integer_dtype(column_dtype):
+            return 'int64'
+        elif pd.api.types.is_float_dtype(column_dtype):
+            return 'float64'
+        else:
+            return str(column_dtype)
+
+    @classmethod
+    def categorise(cls, column_dtype: str, rows: int, unique_values: int, null_values: int, integral: bool):
+
+        """This function returns the data category of a column, which defines what charts it can make. It's shared by the 'ColumnAttributes' of the
+        overview and the 'ColumnAggregate' of the watch mode (see 'support_file_watcher'), so a column is given the same category by both.
+
+        Parameters
+        ----------
+        column_dtype: str
+            The data type of the column (see 'canonical_dtype').
+        rows: int
+            The number of rows in the column.
+        unique_values: int
+            The number of unique values within the column.
+        null_values: int
+            The number of null values within the column.
+        integral: bool
+            Whether every (non-null) value of a numeric column is a whole number.
+        """
+
+        if column_dtype == 'int64' and unique_values > 2:
+            return 'Discrete'
+        elif column_dtype == 'float64':
+            # 'Continuous' or 'Discrete', even though it's a 'float' datatype. A null value is not a whole number.
+            return 'Discrete' if integral is True and null_values == 0 else 'Continuous'
+        elif column_dtype == 'object' and (rows == unique_values or unique_values >= cls.threshold_value):
+            return 'Nominal'
+        # Check for any boolean representations
+        elif column_dtype == 'int64' and unique_values == 2:
+            return 'Nominal-Binary'
+        # If the column is categorical and contains less than the threshold value.
+        elif column_dtype == 'object' and unique_values <= cls.threshold_value:
+            return 'Ordinal'
+        elif column_dtype == 'datetime64[ns]' or column_dtype == 'datetime64[ns, UTC]':
+            return 'Date'
+        elif column_dtype == 'timedelta64[ns]':
+            return 'Time'
+        else:
+            return None
+
+    def data_category(self):
+
+        "This function returns the data category of the column (see 'categorise')."
+
+        return self.categorise(self.column_dtype, self.rows, self.unique_values, self.null_values, self.integral)
+
+
+class StatisticsKernel:
+
+    """
+    A class for profiling every column of a DataFrame at once, one block of columns of the same group at a time.
+    """
+
+    # The most values (rows x columns) profiled in one block, which bounds the memory used by the copy of the block.
+    block_cells = 4000000
+
+    @staticmethod
+    def column_values(pd_series):
+
+        """This function returns the group a column is profiled in, and its values as a NumPy array of the group's data type:
+            - 'int64': whole numbers, without any null values.
+            - 'float64': decimals (or whole numbers with null values), with a null value as NaN.
+            - 'datetime': dates and times, as the number of nanoseconds (with a null value as the smallest 'int64').
+            - 'object': text.
+            - 'other': anything else (e.g. booleans).
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            The column of interest within the DataFrame.
+        """
+
+        column_dtype = ColumnStatistics.canonical_dtype(pd_series)
+        if column_dtype == 'int64' and not pd_series.hasnans:
+            return 'int64', pd_series.to_numpy(dtype='int64')
+        elif column_dtype in ['int64', 'float64']:
+            return 'float64', pd_series.to_numpy(dtype='float64', na_value=np.nan)
+        elif not isinstance(pd_series.dtype, pd.CategoricalDtype) and pd_series.dtype.kind in 'mM':
+            return 'datetime', np.asarray(pd_series.array.asi8)
+        elif column_dtype == 'object':
+            return 'object', pd_series.to_numpy(dtype=object)
+        else:
+            return 'other', pd_series.to_numpy(dtype=object)
+
+    @classmethod
+    def profile(cls, pd_dataframe: pd.DataFrame):
+
+        """This function profiles every column of the DataFrame, and returns the 'ColumnStatistics' of each column (keyed by its name).
+
+        Parameters
+        ----------
+        pd_dataframe: pd.DataFrame
+            The DataFrame to profile.
+        """
+
+        rows = len(pd_dataframe)
+        statistics = {}
+        groups = {}
+        with tracer.span("profile_columns", "profile", rows=rows, columns=len(pd_dataframe.columns)) as span:
+            for column in pd_dataframe.columns:
+                pd_series = pd_dataframe[column]
+                statistics[column] = ColumnStatistics(column, ColumnStatistics.canonical_dtype(pd_series), rows)
+                group, values = cls.column_values(pd_series)
+                groups.setdefault(group, []).append((statistics[column], values))
+
+            block_columns = max(1, cls.block_cells // max(rows, 1))
+            for group, columns in groups.items():
+                for start in range(0, len(columns), block_columns):
+                    cls.profile_block(group, columns[start:start + block_columns], rows)
+            span.set(groups=len(groups))
+
+        return statistics
+
+    @staticmethod
+    def sketched_columns(group: str, integral: np.ndarray, null_values: np.ndarray, rows: int):
+
+        """This function returns which columns of a block have their unique values counted from a sketch (see 'CardinalityEstimator.approximate_unique'):
+        the columns of more than 'sketch_rows' rows that are given the 'Date' or 'Continuous' data category, whatever their number of unique values.
+
+        Parameters
+        ----------
+        group: str
+            The group of the columns (see 'column_values').
+        integral: np.ndarray
+            Whether every (non-null) value of each column is a whole number.
+        null_values: np.ndarray
+            The number of null values within each column.
+        rows: int
+            The number of rows in each column.
+        """
+
+        if rows <= CardinalityEstimator.sketch_rows:
+            return np.zeros(len(integral), dtype=bool)
+        elif group == 'datetime':
+            return np.ones(len(integral), dtype=bool)
+        elif group == 'float64':
+            return ~integral | (null_values > 0)
+        else:
+            return np.zeros(len(integral), dtype=bool)
+
+    @classmethod
+    def profile_block(cls, group: str, columns: list, rows: int):
+
+        """This function profiles a block of columns of the same group in one pass, filling in the 'ColumnStatistics' of each of them.
+
+        Parameters
+        ----------
+        group: str
+            The group of the columns (see 'column_values').
+        columns: list
+            The 'ColumnStatistics' and the values of each column of the block.
+        rows: int
+            The number of rows in each column.
+        """
+
+        if rows == 0:
+            return
+
+        # The columns of the block are laid end to end, so each reduction runs over every column at once.
+        values = np.concatenate([column_values for _, column_values in columns])
+        column_no = len(columns)
+        column_index = np.repeat(np.arange(column_no), rows)
+
+        if group == 'float64':
+            null_mask = np.isnan(values)
+        elif group == 'datetime':
+            null_mask = values == np.iinfo(np.int64).min
+        elif group in ['object', 'other']:
+            null_mask = pd.isna(values)
+        else:
+            null_mask = None
+        null_values = np.bincount(column_index[null_mask], minlength=column_no) if null_mask is not None else np.zeros(column_no, dtype=np.int64)
+
+        integral = np.ones(column_no, dtype=bool)
+        minimum = maximum = None
+        if group in ['int64', 'float64']:
+            block = values.reshape(column_no, rows)
+            if group == 'float64':
+                integral = np.bincount(column_index[~null_mask & (np.mod(values, 1) != 0)], minlength=column_no) == 0
+                null_block = null_mask.reshape(column_no, rows)
+                minimum = np.where(null_block, np.inf, block).min(axis=1)
+                maximum = np.where(null_block, -np.inf, block).max(axis=1)
+            else:
+                minimum = block.min(axis=1)
+                maximum = block.max(axis=1)
+
+        unique_values = np.zeros(column_no, dtype=np.int64)
+        sketched = cls.sketched_columns(group, integral, null_values, rows)
+        for position in np.flatnonzero(sketched):
+            unique_values[position] = CardinalityEstimator.approximate_unique(pd.Series(columns[position][1]))
+
+        # A null value is given the code -1, so it counts as one more unique value of its column.
+        exact = np.flatnonzero(~sketched)
+        if len(exact) > 0:
+            exact_values = values if len(exact) == column_no else values.reshape(column_no, rows)[exact].ravel()
+            codes, uniques = pd.factorize(exact_values)
+            keys = np.repeat(np.arange(len(exact)), rows) * (len(uniques) + 1) + (codes + 1)
+            unique_values[exact] = np.bincount(pd.unique(keys) // (len(uniques) + 1), minlength=len(exact))
+
+        lengths = None
+        if group == 'object':
+            try:
+                lengths = pd.Series(values).str.len().to_numpy(dtype='float64', na_value=np.nan).reshape(column_no, rows)
+            except AttributeError:
+                # None of the values are text.
+                lengths = None
+
+        if lengths is not None:
+            text_mask = ~np.isnan(lengths)
+            text_values = text_mask.sum(axis=1)
+            min_length = np.where(text_mask, lengths, np.inf).min(axis=1)
+            max_length = np.where(text_mask, lengths, -np.inf).max(axis=1)
+            total_length = np.where(text_mask, lengths, 0).sum(axis=1)
+
+        for position, (statistics, _) in enumerate(columns):
+            statistics.null_values = int(null_values[position])
+            statistics.unique_values = int(unique_values[position])
+            statistics.integral = bool(integral[position])
+            if minimum is not None and statistics.null_values < rows:
+                statistics.minimum = float(minimum[position])
+                statistics.maximum = float(maximum[position])
+            if lengths is not None and text_values[position] > 0:
+                statistics.min_length = float(min_length[position])
+                statistics.max_length = float(max_length[position])
+                statistics.mean_length = float(total_length[position] / text_values[position])
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     dataframe = pd.DataFrame(np.random.default_rng(0).integers(0, 50, size=(100000, 2000)))
+#     dataframe[0] = dataframe[0].astype(str)
+#     column_statistics = StatisticsKernel.profile(dataframe)
+#     print(column_statistics[0].unique_values, column_statistics[0].max_length, column_statistics[1].data_category())
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
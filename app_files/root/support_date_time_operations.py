@@ -3,12 +3,19 @@ Module for handling date and time operations, particularly involved in checking
 can constitute as a type of 'Date' or 'Time' and making any necessary, subsequent conversions afterwards.
 """
 
-import copy
+import os
+import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
+import weakref
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
 from dateutil.parser import parse
 from dateutil.parser import ParserError
+from support_tracing import tracer
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
@@ -19,81 +26,173 @@ class DateTimeOperations:
     Intended to be a 'component' within the 'DataFrameOverview' class in the 'main_classes' module.
     """
     
-    def return_date_format(self, pd_series):
+    # The layouts of 'date' values recognised, as a regex and the formats the values could be parsed with (in the order they are tried).
+    # Where the day and the month could be either way around, the day is taken to come first, unless the values show otherwise (see 'order_day_month').
+    date_layouts = [(r"\d{4}-\d{1,2}-\d{1,2}", ["%Y-%m-%d"]),
+                    (r"\d{4}/\d{1,2}/\d{1,2}", ["%Y/%m/%d"]),
+                    (r"\d{4}\.\d{1,2}\.\d{1,2}", ["%Y.%m.%d"]),
+                    (r"\d{1,2}/\d{1,2}/\d{4}", ["%d/%m/%Y", "%m/%d/%Y"]),
+                    (r"\d{1,2}-\d{1,2}-\d{4}", ["%d-%m-%Y", "%m-%d-%Y"]),
+                    (r"\d{1,2}\.\d{1,2}\.\d{4}", ["%d.%m.%Y", "%m.%d.%Y"]),
+                    (r"\d{1,2}/\d{1,2}/\d{2}", ["%d/%m/%y", "%m/%d/%y"]),
+                    (r"\d{1,2}-[A-Za-z]{3}-\d{4}", ["%d-%b-%Y"]),
+                    (r"\d{1,2} [A-Za-z]{3} \d{4}", ["%d %b %Y"])]
 
-        """This function is used to calculate the correct format the date is specfied as in the datetime column in the DataFrame
+    # The layouts of 'time' values recognised after a date (separated by a space or a 'T'), as a regex and the format they are parsed with.
+    time_layouts = [(r"\d{1,2}:\d{2}:\d{2}\.\d{1,9}", "%H:%M:%S.%f"),
+                    (r"\d{1,2}:\d{2}:\d{2}", "%H:%M:%S"),
+                    (r"\d{1,2}:\d{2}", "%H:%M")]
+
+    # A UTC offset at the end of a 'date and time' value (e.g. 'Z', '+01:00' or '+0100').
+    zone_layout = r"(?:Z|[+-]\d{2}:?\d{2})"
+
+    # The number of values (spread evenly through the column) the layout of a column is recognised from.
+    sample_size = 1000
+
+    def __init__(self):
+        # The layout found for each column, as {column name: (the series it was found for, 'date'/'date_time'/None, format, the series parsed with it)}.
+        self.layout_cache = {}
+
+    def sample_values(self, pd_series):
+
+        """This function returns up to 'sample_size' values of a column, spread evenly from its first value to its last.
 
         Parameters
         ----------
         pd_series: pd.Series
-            A pandas 'Datetime' series, or a 'Text' series formatted as Datetime
+            A 'Text' series.
         """
 
-        # 'date_time_separated' means wether the date and time are still in the same cell. 
-        # if the time information is right next to the date information, we need to separate them and just return the date information
+        if len(pd_series) <= self.sample_size:
+            return pd_series
+        positions = np.linspace(0, len(pd_series) - 1, self.sample_size).astype(np.int64)
+        return pd_series.iloc[positions]
 
-        # There are '10' characters in a valid date string (##/##/####)
+    @staticmethod
+    def order_day_month(sample, date_formats: list):
 
-        if all(pd_series.str.len() == 10) is True:
-            new_series = copy.copy(pd_series)
-            new_series = new_series.str.split("/")
-            # gets the length of the list that is now in each value in the series
-            date_list_len = new_series.str.len()
+        """This function orders the formats of a layout where the day and the month could be either way around: the month is taken to come first
+        only if a value of the sample has more than 12 in its second position.
 
-        else:
-            return None
-        
-        # Checks that the length of the list is always 3. 
-        if all(date_list_len == 3) is True:
-
-            # Default format to be returned
-            first = '%d'
-            second = '%m'
-            third = '%Y'
-
-            # Figure out the days 
-            # Apply a lambda function to check whether any of the values in the date list meet the requirements for day (i.e. greater than the maximum number of months).
-            day_check_1 = new_series.apply(lambda date_list: True if int(date_list[0]) > 12 and int(date_list[0]) < 31 else False).astype(str)
-            day_check_2 = new_series.apply(lambda date_list: True if int(date_list[1]) > 12 and int(date_list[1]) < 31 else False).astype(str)
-            day_check_3 = new_series.apply(lambda date_list: True if int(date_list[2]) > 12 and int(date_list[2]) < 31 else False).astype(str)
-
-            if day_check_1.str.contains('True').any():
-                first = '%d'
-            elif day_check_2.str.contains('True').any():
-                second = '%d'
-            else:
-                third  = '%d'
-
-            # Figure out the month
-            month_check_1 = new_series.apply(lambda date_list: True if int(date_list[0]) <= 12 else False).astype(str)
-            month_check_2 = new_series.apply(lambda date_list: True if int(date_list[1]) <= 12 else False).astype(str)
-            month_check_3 = new_series.apply(lambda date_list: True if int(date_list[2]) <= 12 else False).astype(str)
-
-            # must be all(), as all months are below or equal to 12, whereas not all days are below or equal to 12. 
-            if month_check_1.str.contains('True').all():
-                first = '%m'
-            elif month_check_2.str.contains('True').all():
-                second = '%m'
-            else:
-                third  = '%m'
+        Parameters
+        ----------
+        sample: pd.Series
+            The sample of values matching the layout.
+        date_formats: list
+            The formats of the layout, with the day first.
+        """
 
-            # Figure out the year
-            year_check_1 = new_series.apply(lambda date_list: True if len(date_list[0]) == 4 else False).astype(str)
-            year_check_2 = new_series.apply(lambda date_list: True if int(date_list[1]) == 4 else False).astype(str)
-            year_check_3 = new_series.apply(lambda date_list: True if int(date_list[2]) == 4 else False).astype(str)
+        if len(date_formats) < 2:
+            return date_formats
+        positions = sample.str.extract(r"^(\d{1,2})\D(\d{1,2})\D").astype(np.int64)
+        if (positions[0] <= 12).all() and (positions[1] > 12).any():
+            return date_formats[::-1]
+        return date_formats
 
-            if year_check_1.str.contains('True').all():
-                first = '%Y'
-            elif year_check_2.str.contains('True').all():
-                second = '%Y'
-            else:
-                third  = '%Y'
+    def match_layout(self, sample):
 
-            date_format = "/".join([first, second, third]) 
-            return date_format
+        """This function recognises the layout of a sample of values from the table of 'date_layouts' (and 'time_layouts'), with one vectorized
+        regex per layout. It returns whether the values are a 'date' or a 'date_time', and the formats they could be parsed with, or (None, [])
+        if no single layout matches every value of the sample.
 
-        else:
-            return None
+        Parameters
+        ----------
+        sample: pd.Series
+            The sample of values of a 'Text' column.
+        """
+
+        for date_regex, date_formats in self.date_layouts:
+            parts = sample.str.extract(r"^({})(?:([ T])(.+))?$".format(date_regex))
+            if parts[0].isna().any():
+                continue
+            date_formats = self.order_day_month(parts[0], date_formats)
+            if parts[1].isna().all():
+                return 'date', date_formats
+            if parts[1].isna().any() or parts[1].nunique() > 1:
+                return None, []
+
+            # The date is followed by a time (and possibly a UTC offset) in every value, after the same separator.
+            separator = parts[1].iloc[0]
+            for time_regex, time_format in self.time_layouts:
+                times = parts[2].str.extract(r"^({})({})?$".format(time_regex, self.zone_layout))
+                if times[0].isna().any():
+                    continue
+                if times[1].notna().all():
+                    time_format = time_format + "%z"
+                elif times[1].notna().any():
+                    return None, []
+                return 'date_time', [separator.join([date_format, time_format]) for date_format in date_formats]
+            return None, []
+        return None, []
+
+    def classify_date_layout(self, pd_series):
+
+        """This function is used to find the layout of the dates in a column, and the explicit format it's parsed with, so a column is never
+        parsed by guessing the layout of each value. The layout is recognised from a sample of the values (see 'match_layout'), and the format
+        is only taken once it parses the whole column. The answer is cached for the column, as a column is checked several times while converted,
+        along with the column parsed with the format, which the conversion then uses (see 'parse_layout'), so the column is only parsed once.
+        It returns 'date', 'date_time' or None, and the format (None if no layout was found).
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            A 'Text' series formatted as Datetime
+        """
+
+        cached = self.layout_cache.get(pd_series.name)
+        if cached is not None and cached[0]() is pd_series:
+            return cached[1], cached[2]
+
+        layout, date_format, parsed_series = None, None, None
+        # Only a column where every value is text is recognised (e.g. not one where some of the values are numbers).
+        if pd_series.dtype == 'object' and len(pd_series) > 0 and pd.api.types.infer_dtype(pd_series, skipna=False) == 'string':
+            with tracer.span("classify_date_layout", "file", column=str(pd_series.name), rows=len(pd_series)) as span:
+                kind, date_formats = self.match_layout(self.sample_values(pd_series))
+                for candidate in date_formats:
+                    try:
+                        parsed_series = pd.to_datetime(pd_series, format=candidate)
+                    except (ValueError, TypeError):
+                        continue
+                    layout, date_format = kind, candidate
+                    break
+                span.set(layout=layout, format=date_format)
+
+        self.layout_cache[pd_series.name] = (weakref.ref(pd_series), layout, date_format, parsed_series)
+        return layout, date_format
+
+    def parse_layout(self, pd_series):
+
+        """This function returns the column parsed with the explicit format of its layout (see 'classify_date_layout'). The column parsed when its
+        format was checked is handed over (and no longer cached, as it's as large as the column), rather than the column being parsed again.
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            A 'Text' series formatted as Datetime, whose layout has been recognised.
+        """
+
+        layout, date_format = self.classify_date_layout(pd_series)
+        parsed_series = self.layout_cache[pd_series.name][3]
+        self.layout_cache[pd_series.name] = (weakref.ref(pd_series), layout, date_format, None)
+        if parsed_series is None:
+            parsed_series = pd.to_datetime(pd_series, format=date_format)
+        return parsed_series
+
+    def return_date_format(self, pd_series):
+
+        """This function is used to calculate the correct format the date is specfied as in the datetime column in the DataFrame
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            A pandas 'Datetime' series, or a 'Text' series formatted as Datetime
+        """
+
+        # Only the format of 'date' values is returned, as 'date and time' values are split into two columns (see 'split_date_time').
+        layout, date_format = self.classify_date_layout(pd_series)
+        if layout == 'date':
+            return date_format
+        return None
         
         
     def check_empty_time_data(self, pd_series):
@@ -107,26 +206,22 @@ class DateTimeOperations:
         """
 
         # Only for time data that is mixed in with date data. 
-        new_series = copy.copy(pd_series)
-
-        try:
-            new_series = new_series.str.split(" ").apply(lambda x: x.pop(1)).str.split(":")
-
-            timestamp_1 = new_series.apply(lambda time_list: "True" if time_list[0] == "00" else "False").astype(str)
-            timestamp_2 = new_series.apply(lambda time_list: "True" if time_list[1] == "00" else "False").astype(str)
-            timestamp_3 = new_series.apply(lambda time_list: "True" if time_list[2] == "00" or time_list[2] == "00+00" else "False").astype(str)
+        # The time is the second word of each value, which is split into its hours, minutes and seconds for every value at once.
+        words = pd_series.str.split(" ")
+        if (words.str.len() < 2).any():
+            # There was no space in at least one value, therefore it just contained 'date' data. 
+            return False
 
-            if timestamp_1.str.contains("True").any() and timestamp_2.str.contains("True").any() and timestamp_3.str.contains("True").any():
-                # Time Data is empty
-                return True
-            else:
-                # Time Data is not empty
-                return False
+        time_parts = words.str[1].str.split(":")
+        if (time_parts.str.len() < 3).any():
+            return None
 
-        except IndexError as pop_index:
-            # Meaning that there is no second item in the list, as there was no spaces in this list, therefore it just contained 'date' data. 
-            if str(pop_index) == "pop index out of range":
-                return False
+        if (time_parts.str[0] == "00").any() and (time_parts.str[1] == "00").any() and time_parts.str[2].isin(["00", "00+00"]).any():
+            # Time Data is empty
+            return True
+        else:
+            # Time Data is not empty
+            return False
 
         
 
@@ -146,40 +241,34 @@ class DateTimeOperations:
 
         # There is a High Probability that this is 'date & time' data.
         try: 
-            temp_dataframe = copy.copy(dataframe)
-            # Extract the 'date' and 'time' into two separated series
-            date_series = pd.to_datetime(temp_dataframe[col_name]).dt.date
-            time_series = pd.to_datetime(temp_dataframe[col_name]).dt.time
+            # Parse the column once, and derive the 'date' (midnight of each day) and the 'time' (the time since midnight) from it, for every value at once.
+            # The explicit format of the layout is used where one is recognised (see 'classify_date_layout'), rather than guessing the layout of each value.
+            if self.classify_date_layout(dataframe[col_name])[0] == 'date_time':
+                datetime_series = self.parse_layout(dataframe[col_name])
+            else:
+                datetime_series = pd.to_datetime(dataframe[col_name])
+            # A timezone-aware column is split into the local date and time of each value.
+            if datetime_series.dt.tz is not None:
+                datetime_series = datetime_series.dt.tz_localize(None)
+            date_series = datetime_series.dt.normalize()
+            time_series = datetime_series - date_series
 
             # Create a new name for each new series that will be inserted back into the dataframe. 
             date_col_name = "Date_{}".format(str(count))
             time_col_name = "Time_{}".format(str(count))
             
-            # Insert the two extracted series back into the dataframe and delete the old column
-            temp_dataframe.insert(len(dataframe.columns), date_col_name, date_series)
-            temp_dataframe.insert(len(dataframe.columns), time_col_name, time_series)
-            temp_dataframe.drop(col_name, inplace=True, axis=1)
-            
-            # Convert the 'dtype' back to 'object', as we will need to assess if we can extract a 'format' from it. 
-            temp_dataframe[date_col_name] = temp_dataframe[date_col_name].astype(str)
-            temp_dataframe[time_col_name] = temp_dataframe[time_col_name].astype(str)
-
-            # convert the new columns to datetime and timedelta respectively. 
-            format_ = self.return_date_format(temp_dataframe[date_col_name])
-            if format_ is not None:
-                temp_dataframe[date_col_name] = pd.to_datetime(temp_dataframe[date_col_name], format=format_)
-            else:
-                temp_dataframe[date_col_name] = pd.to_datetime(temp_dataframe[date_col_name])
-            
-            # Convert to 'timedelta'
-            temp_dataframe[time_col_name] = pd.to_timedelta(temp_dataframe[time_col_name].str.strip())
+            # Insert the two converted series into the dataframe and delete the old column.
+            # This is done in place (only once every conversion has succeeded), rather than on a copy of the whole DataFrame.
+            position = len(dataframe.columns)
+            dataframe.insert(position, date_col_name, date_series)
+            dataframe.insert(position, time_col_name, time_series)
+            del dataframe[col_name]
             
-            return temp_dataframe
+            return dataframe
 
         except Exception as e:
             # We return the original dataframe in each alternative condition, as we don't want to return a 'None' object. 
-            print("Error for 'split_date_time' function")
-            print(str(e))
+            tracer.error("split_date_time", e)
             return dataframe
 
         
@@ -213,6 +302,10 @@ class DateTimeOperations:
             A pandas 'Datetime' series, or a 'Text' series formatted as Datetime
         """
     
+        # A recognised 'date' layout (e.g. yyyy-mm-dd, dd.mm.yyyy or dd-Mon-yyyy) is accepted straight away.
+        if self.classify_date_layout(pd_series)[0] == 'date':
+            return True
+        
         dash_count = pd_series.str.count('/')
         colon_count = pd_series.str.count(':')
         if ((dash_count == 2).all()) and ((colon_count == 0).all()):
@@ -248,6 +341,10 @@ class DateTimeOperations:
             A pandas 'Datetime' series, or a 'Text' series formatted as Datetime
         """
         
+        # A recognised 'date and time' layout (e.g. yyyy-mm-ddTHH:MM:SS) is accepted straight away.
+        if self.classify_date_layout(pd_series)[0] == 'date_time':
+            return True
+        
         dash_count = pd_series.str.count('/')
         colon_count = pd_series.str.count(':')
         if ((dash_count >= 1).all()) and ((colon_count >= 1).all()):
@@ -259,6 +356,7 @@ class DateTimeOperations:
     def determine_date(self, pd_series):
         
         """This function evaluates a final 'date' answer, by determining whether:
+            - It is a recognised 'date' layout, which parses with an explicit format (see 'classify_date_layout'). Otherwise whether:
             - dtype == 'object'
             - It is a valid 'date' format (i.e. there are 2 '/' and 0 ':')
             - Checks that each entry in the Series is a valid date
@@ -269,6 +367,10 @@ class DateTimeOperations:
             A pandas 'Datetime' series, or a 'Text' series formatted as Datetime
         """
         
+        # A recognised 'date' layout has already been confirmed, by parsing the whole series with its format.
+        if self.classify_date_layout(pd_series)[0] == 'date':
+            return True
+        
         # Just because it is in the correct format for 'date' only, we still need to confirm.
         if self.acceptable_date_format(pd_series) is True:
             # Determine if the entire series is a valid 'date' series.
@@ -321,6 +423,7 @@ class DateTimeOperations:
     def determine_date_and_time(self, pd_series):
         
         """This function evaluates a final 'date' and 'time' answer, by determining whether:
+            - It is a recognised 'date and time' layout, which parses with an explicit format (see 'classify_date_layout'). Otherwise whether:
             - dtype = 'object'
             - It is not a valid date format (on its own)
             - It is not a valid time format (on its own)
@@ -335,6 +438,9 @@ class DateTimeOperations:
         # here we are determining that the datatype must be 'object' and that the data is not just 'date' and not just 'time'. 
         # For just 'date' data, there is only '/' and no ':'. - Should return False if number of ':' != 0
         # For just 'time' data, there is only ':' and no '/'. - Should return False if number of '/' != 0
+        if self.classify_date_layout(pd_series)[0] == 'date_time':
+            return True
+        
         if self.acceptable_time_format(pd_series) is False and self.acceptable_date_format(pd_series) is False:
             
             # Now we need to check whether the data contains both 'date' and 'time' values. 
@@ -0,0 +1,130 @@
+"""root.support_display_session
+A module dedicated towards the lifecycle of the charts shown on the Display page, so that a long session runs at flat memory.
+Each time the charts are generated a 'DisplaySession' is opened, and it is closed once the Display page is left (or the charts are generated again):
+closing it gives every figure a blank canvas (so the Agg buffer and texture of its live canvas can be freed), releases the figures to the figure pool,
+stops the watch mode, and drops what the caches kept for any earlier file or chart type (see 'support_figure_pool' and 'support_chart_data').
+'DisplaySession.memory_in_use' reports the memory the process uses, and what the display and the caches hold on to.
+"""
+
+import os
+import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
+import gc
+from matplotlib.backend_bases import FigureCanvasBase
+from support_tracing import tracer
+from support_memory import memory_monitor
+from support_figure_pool import figure_pool, layout_cache
+from support_chart_data import chart_data_cache
+
+
+class DisplaySession:
+
+    """
+    A class for instantiating a 'display session' object, which owns the charts created for one visit to the Display page, and frees them once it's closed.
+
+    Attributes
+    ----------
+    chart_type: str
+        The chart type that the user has selected on the app home page.
+    chart_list: list
+        The list of Matplotlib figures displayed (shared with the app and the gallery). A figure the gallery dropped is 'None'.
+    chart_instance: object
+        The instance of a chart class (LineGraph, ScatterPlot, BarChart, etc.) the charts were created by.
+    file_refresh: support_file_watcher.IncrementalRefresh, None
+        The incremental refresh of the charts in the watch mode.
+    chart_gallery: support_gallery.ChartGallery, None
+        The gallery deciding which slides have a live canvas.
+    closed: bool
+        Whether the session has been closed.
+    """
+
+    # The number of sessions closed so far, reported alongside the memory in use.
+    sessions_closed = 0
+
+    def __init__(self, chart_type: str, chart_list=None, chart_instance=None, file_refresh=None, chart_gallery=None):
+        self.chart_type = chart_type
+        self.chart_list = chart_list if chart_list is not None else []
+        self.chart_instance = chart_instance
+        self.file_refresh = file_refresh
+        self.chart_gallery = chart_gallery
+        self.closed = False
+
+    def close(self, retain_dataframe=None):
+
+        """This function frees every figure of the session, and whatever the caches kept for any other file. The figures are released to the figure pool,
+        which only keeps the figures of this session's chart type and style, so the next charts generated can reuse them.
+
+        Parameters
+        ----------
+        retain_dataframe: pd.DataFrame, None
+            The DataFrame the app keeps hold of, whose data stages are kept (e.g. so only the style of the charts can be changed without running them again).
+        """
+
+        if self.closed is True:
+            return
+
+        with tracer.span("close_display_session", "display", chart_type=self.chart_type) as span, \
+                memory_monitor.stage("close_display_session", chart_type=self.chart_type):
+            figures = [figure for figure in self.chart_list if figure is not None]
+            for figure in figures:
+                FigureCanvasBase(figure)
+                figure_pool.release(figure)
+                memory_monitor.retained_by_figure.pop(id(figure), None)
+
+            figure_pool.retain(figures)
+            chart_data_cache.retain(retain_dataframe)
+
+            # The chart list is shared with the app and the gallery, so it is emptied in place.
+            self.chart_list.clear()
+            self.chart_instance = None
+            self.file_refresh = None
+            self.chart_gallery = None
+            self.closed = True
+            DisplaySession.sessions_closed += 1
+
+            # Figures, their artists and transforms reference each other, so they are only freed once the cycles are collected.
+            span.set(figures=len(figures), collected=gc.collect())
+
+        tracer.counter("memory_in_use", "display", **self.memory_in_use())
+
+    def live_count(self):
+
+        "This function returns the number of slides with a live canvas, and the number of figures kept."
+
+        if self.chart_gallery is not None:
+            return self.chart_gallery.live_count()
+        return 0, sum(1 for figure in self.chart_list if figure is not None)
+
+    def memory_in_use(self):
+
+        """This function returns the memory in use: the resident set size of the process (in MB), the slides with a live canvas and the figures
+        the session keeps, and what the figure pool, the layout cache and the chart data cache hold on to."""
+
+        rss = memory_monitor.current_rss()
+        live_canvases, figures = self.live_count()
+        return {"rss_mb": round(rss / 1048576, 1) if rss is not None else None,
+                "live_canvases": live_canvases,
+                "figures": figures,
+                "pooled_figures": figure_pool.pooled_count(),
+                "cached_layouts": layout_cache.cached_count(),
+                "data_stages": len(chart_data_cache.data_stages),
+                "sessions_closed": DisplaySession.sessions_closed}
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     from instantiation_file_controller import FileController
+#     from instantiation_create_chart_instance import CreateChartInstance
+
+#     file = r'###############################################/.csv'
+#     dataframe = FileController(file, 'Scatter').dataframe
+#     for session_index in range(0, 20):
+#         scatter_instance = CreateChartInstance(dataframe, 'Scatter', [None] * 6).validate_chart_attributes()
+#         session = DisplaySession('Scatter', scatter_instance.plot_multiple_charts(), scatter_instance)
+#         session.close(retain_dataframe=scatter_instance.overview.dataframe)
+#         print(session.memory_in_use())
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
@@ -0,0 +1,252 @@
+"""root.support_excel
+A module dedicated towards reading Excel workbooks (.xlsx) quickly, rather than through the full object model 'pd.read_excel' builds by default.
+Cells are streamed with python-calamine if it is installed, otherwise with openpyxl in read-only mode, and only the columns needed are kept.
+The rows are then parsed by the same parser 'pd.read_excel' uses, so the DataFrame is the same as it would otherwise be.
+Any sheet (or several sheets, which are read in parallel) can be selected, rather than only the first.
+"""
+
+import os
+import datetime
+import itertools
+import pandas as pd
+from pandas.io.parsers import TextParser
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    # openpyxl (read-only) is used instead if 'python-calamine' is not installed.
+    CalamineWorkbook = None
+
+
+class ExcelReader:
+
+    """
+    A class for instantiating an 'Excel reader' object, which reads one or more sheets of a workbook into DataFrames.
+
+    Attributes
+    ----------
+    file_path: str
+        The path to the workbook (.xlsx).
+    engine: str
+        The engine the cells are streamed with, either 'calamine' or 'openpyxl'.
+    max_workers: int, None
+        The maximum number of threads used to read several sheets in parallel (default: the number of CPUs).
+    """
+
+    def __init__(self, file_path: str, engine=None, max_workers=None):
+        self.file_path = file_path
+        self.engine = engine if engine is not None else self.available_engine()
+        self.max_workers = max_workers
+
+    @staticmethod
+    def available_engine():
+
+        "This function returns the fastest engine installed."
+
+        return "calamine" if CalamineWorkbook is not None else "openpyxl"
+
+    def sheet_names(self):
+
+        "This function returns the names of every sheet in the workbook, in order."
+
+        if self.engine == "calamine":
+            return list(CalamineWorkbook.from_path(self.file_path).sheet_names)
+
+        import openpyxl
+        workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            return list(workbook.sheetnames)
+        finally:
+            workbook.close()
+
+    def resolve_sheet_name(self, sheet_name, sheet_names: list):
+
+        """This function returns the name of a sheet selected by its name or position.
+
+        Parameters
+        ----------
+        sheet_name: str, int, None
+            The name or the position of the sheet. 'None' selects the first sheet.
+        sheet_names: list
+            The names of every sheet in the workbook.
+        """
+
+        if sheet_name is None:
+            return sheet_names[0]
+        elif isinstance(sheet_name, int):
+            return sheet_names[sheet_name]
+        elif sheet_name in sheet_names:
+            return sheet_name
+        else:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+    @staticmethod
+    def convert_cell(cell):
+
+        """This function converts a single cell the same way 'pd.read_excel' does: empty cells become empty strings (and so null values),
+        whole numbers stored as floats become integers, and dates become Timestamps.
+
+        Parameters
+        ----------
+        cell: object
+            The value of the cell, as streamed by the engine.
+        """
+
+        if cell is None:
+            return ""
+        elif isinstance(cell, float):
+            return int(cell) if cell.is_integer() else cell
+        elif isinstance(cell, datetime.date) and not isinstance(cell, datetime.datetime):
+            return pd.Timestamp(cell)
+        elif isinstance(cell, datetime.timedelta):
+            return pd.Timedelta(cell)
+        return cell
+
+    def iter_rows(self, sheet_name: str, nrows=None):
+
+        """This function streams the rows of a sheet as lists of raw cell values, without building the workbook's object model.
+
+        Parameters
+        ----------
+        sheet_name: str
+            The name of the sheet.
+        nrows: int, None
+            The number of rows to stream after the header row. 'None' streams every row.
+        """
+
+        rows_needed = None if nrows is None else nrows + 1
+
+        if self.engine == "calamine":
+            sheet = CalamineWorkbook.from_path(self.file_path).get_sheet_by_name(sheet_name)
+            yield from sheet.to_python(skip_empty_area=False, nrows=rows_needed)
+            return
+
+        import openpyxl
+        workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[sheet_name]
+            # The dimensions stored in a read-only workbook can be wrong, in which case rows would be missed.
+            sheet.reset_dimensions()
+            yield from itertools.islice(sheet.iter_rows(values_only=True), rows_needed)
+        finally:
+            workbook.close()
+
+    def read_sheet(self, sheet_name=None, nrows=None, usecols=None):
+
+        """This function reads a single sheet into a DataFrame. The first row is used as the header.
+        Only the cells of the columns in 'usecols' are converted and parsed.
+
+        Parameters
+        ----------
+        sheet_name: str, int, None
+            The name or the position of the sheet. 'None' reads the first sheet.
+        nrows: int, None
+            The number of rows to read. 'None' reads every row, '0' reads only the header.
+        usecols: list, None
+            The columns to read. 'None' reads every column.
+        """
+
+        sheet_name = self.resolve_sheet_name(sheet_name, self.sheet_names()) if not isinstance(sheet_name, str) else sheet_name
+        usecols = set(usecols) if usecols is not None else None
+        rows = self.iter_rows(sheet_name, nrows)
+
+        header_row = next(rows, None)
+        if header_row is None:
+            return pd.DataFrame()
+
+        # Parse the header on its own, so that any blank or repeated column names are given the same names as 'pd.read_excel' would give them.
+        header_row = [self.convert_cell(cell) for cell in header_row]
+        while len(header_row) > 0 and header_row[-1] == "":
+            header_row.pop()
+        columns = list(TextParser([header_row], header=0, skip_blank_lines=False).read().columns)
+
+        keep = list(range(len(columns))) if usecols is None else [index for index, column in enumerate(columns) if column in usecols]
+        convert_cell = self.convert_cell
+        data = []
+        data_rows = 0
+        for row in rows:
+            data.append([convert_cell(row[index]) if index < len(row) else "" for index in keep])
+            # Trailing empty rows (formatted, but without any values) are not part of the data. As in 'pd.read_excel', a row is only empty
+            # if every cell of it is, so the other cells are only checked when the cells kept are all empty.
+            if any(cell != "" for cell in data[-1]) or any(convert_cell(cell) != "" for cell in row):
+                data_rows = len(data)
+        del data[data_rows:]
+
+        if len(data) == 0:
+            return pd.DataFrame(columns=[columns[index] for index in keep])
+
+        # A row whose kept cells are all empty (within the data) is a row of null values, as in 'pd.read_excel'.
+        return TextParser(data, names=[columns[index] for index in keep], header=None, skip_blank_lines=False).read()
+
+    @staticmethod
+    def read_sheet_task(file_path: str, engine: str, sheet_name: str, nrows=None, usecols=None):
+
+        "This function reads a single sheet in a worker thread, with a reader of its own (see 'read_sheets')."
+
+        return ExcelReader(file_path, engine).read_sheet(sheet_name, nrows, usecols)
+
+    def read_sheets(self, sheet_names: list, nrows=None, usecols=None):
+
+        """This function reads several sheets in parallel (one thread per sheet, up to 'max_workers') and returns a DataFrame per sheet.
+        Threads are used rather than processes, as the cells are mostly streamed by I/O and C code (calamine/openpyxl read-only), and a
+        process would re-run the app's entry point in the frozen (PyInstaller) build.
+        Samples (i.e. 'nrows' is given) are read one sheet after another, as they are quicker to read than to start the threads for.
+
+        Parameters
+        ----------
+        sheet_names: list
+            The names or the positions of the sheets. 'None' reads every sheet.
+        nrows: int, None
+            The number of rows to read from each sheet. 'None' reads every row.
+        usecols: list, None
+            The columns to read from each sheet. 'None' reads every column.
+        """
+
+        all_sheet_names = self.sheet_names()
+        sheet_names = all_sheet_names if sheet_names is None else [self.resolve_sheet_name(sheet_name, all_sheet_names) for sheet_name in sheet_names]
+
+        if len(sheet_names) == 1 or nrows is not None:
+            return {sheet_name: self.read_sheet(sheet_name, nrows, usecols) for sheet_name in sheet_names}
+
+        max_workers = min(len(sheet_names), self.max_workers if self.max_workers is not None else (os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            dataframes = executor.map(self.read_sheet_task,
+                                      [self.file_path] * len(sheet_names),
+                                      [self.engine] * len(sheet_names),
+                                      sheet_names,
+                                      [nrows] * len(sheet_names),
+                                      [usecols] * len(sheet_names))
+            return dict(zip(sheet_names, dataframes))
+
+    def read(self, sheet_name=None, nrows=None, usecols=None):
+
+        """This function reads the selected sheet(s) of the workbook into a single DataFrame.
+        If several sheets are selected, they are read in parallel and stacked, with a 'Sheet' column recording the sheet each row came from.
+
+        Parameters
+        ----------
+        sheet_name: str, int, list, None
+            The name or the position of a sheet, or a list of them. 'None' reads the first sheet.
+        nrows: int, None
+            The number of rows to read (from each sheet). 'None' reads every row, '0' reads only the header.
+        usecols: list, None
+            The columns to read. 'None' reads every column.
+        """
+
+        if not isinstance(sheet_name, (list, tuple)):
+            return self.read_sheet(sheet_name, nrows, usecols)
+
+        dataframes = self.read_sheets(list(sheet_name), nrows, [column for column in usecols if column != "Sheet"] if usecols is not None else None)
+        for name, dataframe in dataframes.items():
+            dataframe.insert(0, "Sheet", name)
+        return pd.concat(list(dataframes.values()), ignore_index=True)
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     excel_reader = ExcelReader(r'###############################################/.xlsx')
+#     print(excel_reader.engine, excel_reader.sheet_names())
+#     dataframe = excel_reader.read(sheet_name=["January", "February"], usecols=["Date", "Amount"])
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
@@ -6,6 +6,7 @@ i.e. the number of rows and columns and deletion of any spare axes created.
 
 import copy
 import math
+import numpy as np
 import pandas as pd
 
 class Facets:
@@ -29,33 +30,17 @@ class Facets:
             The number of bars plotted ber facet (subplot).
         """
 
-        count = 0
-        series_list = []
         pd_series_len = len(pd_series)
 
         if n_bars_per_facet != 0:
-            # The divisor is how many times we loop by
-            divisor = math.floor(pd_series_len / n_bars_per_facet)
-            for i in range(0, divisor):
-                facet_list = ["Facet_{}".format(count)] * n_bars_per_facet
-                series_list.extend(facet_list)
-                count += 1
-
-            # Need to calculate the remainder, as we have deliberately rounded down the divisor. 
-            # So now we calculate what's left for the last few values, as we need an even series to reinsert into the dataframe. 
-            facet_string = "Facet_{}".format(count)
-            len_of_series_list = len(series_list)
-            remainder = pd_series_len - len_of_series_list
-            
-            if remainder > 0:
-                facet_list = [facet_string] * remainder
-                series_list.extend(facet_list)
-            else:
-                pass
+            # Every 'n_bars_per_facet' consecutive rows share a facet, the last facet takes whatever remains.
+            n_facets = math.ceil(pd_series_len / n_bars_per_facet)
+            facet_codes = np.arange(pd_series_len) // n_bars_per_facet
+            facet_series = pd.Series(pd.Categorical.from_codes(facet_codes, categories=["Facet_{}".format(count) for count in range(0, n_facets)]),
+                                     index=pd_series.index)
         else:
-            series_list.extend([0] * len(pd_series))
+            facet_series = pd.Series(np.zeros(pd_series_len, dtype=int), index=pd_series.index)
 
-        facet_series = pd.Series(series_list)
         return facet_series
     
     
@@ -75,9 +60,11 @@ class Facets:
         number_of_columns: int
             The number of columns within the facet plot (default is 4)."""
         
-        facet_series = Facets.facet_cardinal_series(pd_series=pd_dataframe[high_cardinal_variable],
-                                                    n_bars_per_facet=n_bars)
-        n_facets = len(facet_series.unique())
+        # The number of facets can be calculated directly, without labelling every row.
+        if n_bars != 0 and len(pd_dataframe) > 0:
+            n_facets = math.ceil(len(pd_dataframe[high_cardinal_variable]) / n_bars)
+        else:
+            n_facets = 1
         # We choose to round up, as even though only one plot might be for an entire row, we can always delete any spare axes. 
         number_of_rows = math.ceil(n_facets / number_of_columns)
         
@@ -100,20 +87,12 @@ class Facets:
             The number of bars per facet (subplot).
         """
     
-        dataframe_copy = copy.copy(pd_dataframe)
-        
-        # Create a Facet Series
-        facet_series = Facets.facet_cardinal_series(pd_series=dataframe_copy[high_cardinal_variable],
-                                                  n_bars_per_facet=n_bars)
-        
-        # Insert the 'new' Facet Series (named 'Facet_Groups') into the attribute dataframe
-        dataframe_copy.insert(len(dataframe_copy.columns), 'Facet_Groups', facet_series)
-        
-        # Create a List of DataFrames that have been partitioned from that added series 'Facet_Groups'
-        dataframes_list = [dataframe_copy.loc[dataframe_copy['Facet_Groups'] == facet] for facet in dataframe_copy['Facet_Groups'].unique()]
+        # The Facet Series is kept separate from the DataFrame (rather than inserted into a copy of it)
+        facet_series = Facets.facet_cardinal_series(pd_series=pd_dataframe[high_cardinal_variable],
+                                                    n_bars_per_facet=n_bars)
         
-        # Reset all the indexes back to 0
-        [dataframe.reset_index(inplace=True) for dataframe in dataframes_list]
+        # Create a List of DataFrames that have been partitioned by the Facet Series, each holding only the rows (and columns) of its own facet
+        dataframes_list = [facet_dataframe.reset_index() for facet, facet_dataframe in pd_dataframe.groupby(facet_series, sort=False, observed=True)]
 
         return dataframes_list
     
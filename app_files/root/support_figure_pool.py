@@ -0,0 +1,445 @@
+"""root.support_figure_pool
+A module dedicated towards cutting the fixed cost of each chart created, which is otherwise paid in full for every chart of the same layout:
+    - 'FigurePool' keeps the figures (and their axes) released by the display per chart type, style and size, and resets only what
+      drawing a chart changed (the data artists, labels, legend, title, limits, scale and ticks) rather than building a new figure.
+    - 'LayoutCache' keeps the geometry 'plt.tight_layout' computed for each chart type and style. The extents of a new chart's tick labels,
+      axis labels, title and legend are measured cheaply, and if they fit within the extents a cached geometry was computed for,
+      that geometry is reused rather than running 'tight_layout' (which measures every text several times over).
+The figure pool is switched off with 'AUTOGRAPHICA_FIGURE_POOL=off', and the layout cache with 'AUTOGRAPHICA_LAYOUT_CACHE=off'.
+"""
+
+import os
+import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
+import weakref
+import functools
+import contextlib
+import threading
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib import _pylab_helpers
+from matplotlib.transforms import Bbox
+from matplotlib.font_manager import FontProperties
+from support_tracing import tracer
+from support_rcParams import StyledFigure
+
+
+def mode_enabled(environment_variable: str):
+
+    "This function returns whether a mode which is switched on by default has been switched off with its environment variable."
+
+    return os.environ.get(environment_variable, "on") not in ["", "0", "off"]
+
+
+class FigurePool:
+
+    """
+    A class for instantiating a 'figure pool' object, which hands out a figure and axes for each chart created,
+    reusing the figures released by the display where it can. A single instance ('figure_pool') is shared by the whole app.
+
+    Attributes
+    ----------
+    enabled: bool
+        Whether released figures are reused (otherwise every chart gets a new figure).
+    max_figures: int
+        The maximum number of released figures kept per chart type, style and size.
+    released_figures: dict
+        The figures waiting to be reused, per (chart type, style, size, dpi).
+    templates: weakref.WeakKeyDictionary
+        The pool key and the state of the axes when each figure was built, which the figure is reset to before it is reused.
+    created: int
+        The number of figures built.
+    reused: int
+        The number of figures reused.
+    """
+
+    max_figures = 64
+
+    def __init__(self, enabled=None):
+        self.enabled = enabled if enabled is not None else mode_enabled("AUTOGRAPHICA_FIGURE_POOL")
+        self.released_figures = {}
+        self.templates = weakref.WeakKeyDictionary()
+        self.created = 0
+        self.reused = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def pool_key(chart_type: str, current_style, figsize: tuple):
+
+        "This function returns the key figures are pooled by: figures can only be reused for charts of the same type, style, size and dpi."
+
+        return (chart_type, current_style, tuple(figsize), plt.rcParams['figure.dpi'])
+
+    @staticmethod
+    def axis_state(axis):
+
+        "This function records the state of an axis which drawing a chart can change, and which is not reset by changing its scale."
+
+        return {"major_tick_kw": dict(axis._major_tick_kw),
+                "minor_tick_kw": dict(axis._minor_tick_kw),
+                "label_properties": {"fontsize": axis.label.get_fontsize(),
+                                     "color": axis.label.get_color(),
+                                     "fontweight": axis.label.get_fontweight(),
+                                     "rotation": axis.label.get_rotation()},
+                "labelpad": axis.labelpad,
+                "label_position": axis.get_label_position(),
+                "ticks_position": axis.get_ticks_position(),
+                "visible": axis.get_visible()}
+
+    def template_state(self, figure):
+
+        "This function records the state of a newly built figure (and its single axes), which it is reset to before it is reused."
+
+        ax = figure.axes[0]
+        return {"subplotpars": {parameter: getattr(figure.subplotpars, parameter) for parameter in ["left", "right", "bottom", "top", "wspace", "hspace"]},
+                "position": ax.get_position(original=True).frozen(),
+                "frame_on": ax.get_frame_on(),
+                "axis_on": ax.axison,
+                "aspect": ax.get_aspect(),
+                "adjustable": ax.get_adjustable(),
+                "anchor": ax.get_anchor(),
+                "margins": ax.margins(),
+                "axisbelow": ax.get_axisbelow(),
+                "facecolor": ax.get_facecolor(),
+                "spines": {name: spine.get_visible() for name, spine in ax.spines.items()},
+                "xaxis": self.axis_state(ax.xaxis),
+                "yaxis": self.axis_state(ax.yaxis)}
+
+    @staticmethod
+    def reset_axis(axis, state: dict, set_scale):
+
+        "This function resets an axis to the state recorded when its figure was built."
+
+        axis.converter = None
+        axis.units = None
+        set_scale("linear")
+        axis._major_tick_kw = dict(state["major_tick_kw"])
+        axis._minor_tick_kw = dict(state["minor_tick_kw"])
+        axis.reset_ticks()
+        axis.set_label_text("", **state["label_properties"])
+        axis.labelpad = state["labelpad"]
+        axis.set_label_position(state["label_position"])
+        axis.set_ticks_position(state["ticks_position"])
+        axis.set_visible(state["visible"])
+        axis.set_inverted(False)
+
+    def reset_figure(self, figure, template: dict):
+
+        """This function removes everything drawing a chart added to a figure, and resets its axes to the state recorded when it was built,
+        so the figure looks the same as a newly built one before the next chart is drawn on it."""
+
+        ax = figure.axes[0]
+        for extra_axes in figure.axes[1:]:
+            figure.delaxes(extra_axes)
+        # The title ('suptitle') is one of the figure's texts.
+        for artist in list(figure.legends) + list(figure.texts) + list(figure.artists) + list(figure.lines) + list(figure.patches) + list(figure.images):
+            artist.remove()
+        figure._suptitle = None
+        figure.subplots_adjust(**template["subplotpars"])
+
+        for artist in list(ax._children):
+            artist.remove()
+        ax.containers.clear()
+        if ax.get_legend() is not None:
+            ax.get_legend().remove()
+        for title in [ax.title, ax._left_title, ax._right_title]:
+            title.set_text("")
+
+        self.reset_axis(ax.xaxis, template["xaxis"], ax.set_xscale)
+        self.reset_axis(ax.yaxis, template["yaxis"], ax.set_yscale)
+
+        ax.set_position(template["position"])
+        ax.set_frame_on(template["frame_on"])
+        ax.axison = template["axis_on"]
+        ax.set_aspect(template["aspect"], adjustable=template["adjustable"], anchor=template["anchor"])
+        ax.margins(*template["margins"])
+        ax.set_axisbelow(template["axisbelow"])
+        ax.set_facecolor(template["facecolor"])
+        for name, visible in template["spines"].items():
+            ax.spines[name].set_visible(visible)
+
+        # A newly built axes has unit limits, which are ignored once data is added.
+        ax.dataLim.set(Bbox.null())
+        ax.ignore_existing_data_limits = True
+        ax.set_xlim(0, 1, auto=True)
+        ax.set_ylim(0, 1, auto=True)
+        ax.set_autoscale_on(True)
+        ax.stale = True
+
+    @staticmethod
+    def make_current(figure):
+
+        "This function hands a released figure back to pyplot (with a new canvas and manager), so that 'plt' functions draw on it until it is closed again."
+
+        manager = plt._get_backend_mod().new_figure_manager_given_figure(max(plt.get_fignums(), default=0) + 1, figure)
+        _pylab_helpers.Gcf._set_new_active_manager(manager)
+
+    def subplots(self, chart_type: str, current_style=None, figsize=(4, 3)):
+
+        """This function returns a figure and its axes to draw a chart on (in place of 'plt.subplots'), and makes the figure pyplot's current figure.
+        A released figure of the same chart type, style and size is reset and reused if there is one, otherwise a new figure is built.
+
+        Parameters
+        ----------
+        chart_type: str
+            The chart type (Line, Scatter, Bar, etc.)
+        current_style: str, int, None
+            The current Matplotlib style for all plots.
+        figsize: tuple
+            The size of the figure in inches.
+        """
+
+        key = self.pool_key(chart_type, current_style, figsize)
+        with self.lock:
+            released_figures = self.released_figures.get(key, [])
+            figure = released_figures.pop() if len(released_figures) > 0 else None
+
+        if figure is not None:
+            try:
+                self.reset_figure(figure, self.templates[figure]["state"])
+                self.make_current(figure)
+                self.reused += 1
+                return figure, figure.axes[0]
+            except Exception as e:
+                print(str(e))
+                self.templates.pop(figure, None)
+
+        figure, ax = plt.subplots(figsize=figsize, FigureClass=StyledFigure, current_style=current_style)
+        self.created += 1
+        if self.enabled is True:
+            self.templates[figure] = {"key": key, "state": self.template_state(figure)}
+        return figure, ax
+
+    def release(self, figure):
+
+        """This function closes a figure which is no longer displayed, and keeps it to be reused by the next chart of the same type and style.
+        Figures which were not built by the pool (e.g. a Facet Plot), or would exceed 'max_figures', are only closed.
+
+        Parameters
+        ----------
+        figure: plt.Figure
+            The figure of a chart which has been replaced or removed from the display.
+        """
+
+        plt.close(figure)
+        if self.enabled is False or figure not in self.templates:
+            return
+
+        with self.lock:
+            released_figures = self.released_figures.setdefault(self.templates[figure]["key"], [])
+            if len(released_figures) < self.max_figures and all(figure is not released_figure for released_figure in released_figures):
+                released_figures.append(figure)
+
+    def clear(self):
+
+        "This function drops every released figure, so their memory can be freed."
+
+        with self.lock:
+            self.released_figures.clear()
+
+    def retain(self, figures):
+
+        """This function drops the released figures of every chart type, style and size other than those of the figures given
+        (e.g. the figures of the Display page just left), so the pool only holds on to the figures the next charts are likely to reuse."""
+
+        kept_keys = {self.templates[figure]["key"] for figure in figures if figure in self.templates}
+        with self.lock:
+            for key in [key for key in self.released_figures if key not in kept_keys]:
+                del self.released_figures[key]
+
+    def pooled_count(self):
+
+        "This function returns the number of released figures waiting to be reused."
+
+        return sum(len(released_figures) for released_figures in self.released_figures.values())
+
+
+class LayoutCache:
+
+    """
+    A class for instantiating a 'layout cache' object, which lays out each chart the same way 'tight_layout' does, for a fraction of the cost,
+    and reuses the geometry of earlier charts of the same type and style whenever a new chart's labels fit within it
+    (so the axes of the charts in a gallery line up). A single instance ('layout_cache') is shared by the whole app.
+
+    Attributes
+    ----------
+    enabled: bool
+        Whether charts are laid out by the cache (otherwise 'tight_layout' is run for every chart).
+    fit_tolerance: float
+        How much further (in pixels, on any side) a cached geometry makes room for than a chart needs for it to be reused,
+        so that a chart with short labels isn't given the wide margins of a chart with long ones.
+    max_layouts: int
+        The maximum number of geometries kept per chart type and style.
+    layouts: dict
+        The cached geometries, per (chart type, style, size, dpi), as a list of (extents, subplot parameters).
+    hits: int
+        The number of charts laid out with a cached geometry.
+    misses: int
+        The number of charts laid out with a new geometry.
+    """
+
+    fit_tolerance = 6.0
+    max_layouts = 32
+
+    # The padding 'tight_layout' leaves around the edge of the figure, as a fraction of the font size.
+    pad = 1.08
+
+    def __init__(self, enabled=None):
+        self.enabled = enabled if enabled is not None else mode_enabled("AUTOGRAPHICA_LAYOUT_CACHE")
+        self.layouts = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    @contextlib.contextmanager
+    def ticks_updated_once(ax):
+
+        """This function returns a context manager within which each axis' ticks are only updated (located, formatted and positioned)
+        and their labels only measured once. Measuring an axes otherwise repeats both for every spine, label and tick label measured,
+        though nothing changes in between."""
+
+        def measured_once(ticklabel_bboxes):
+            measured = {}
+            def wrapper(ticks, renderer):
+                if id(ticks) not in measured:
+                    measured[id(ticks)] = ticklabel_bboxes(ticks, renderer)
+                return measured[id(ticks)]
+            return wrapper
+
+        axes = [axis for axis in [ax.xaxis, ax.yaxis] if "_update_ticks" not in vars(axis)]
+        for axis in axes:
+            axis._update_ticks = functools.lru_cache(maxsize=1)(axis._update_ticks)
+            axis._get_ticklabel_bboxes = measured_once(axis._get_ticklabel_bboxes)
+        try:
+            yield
+        finally:
+            for axis in axes:
+                del axis._update_ticks
+                del axis._get_ticklabel_bboxes
+
+    def measure(self, figure):
+
+        """This function returns how far (in inches) everything 'tight_layout' makes room for reaches beyond each side of the figure's subplot
+        (left, bottom, right, top), along with the height of the figure's title: the tick labels, axis labels, titles, legend and any artists which
+        are not clipped to the axes (e.g. Pie Chart labels). 'None' is returned if the figure can't be measured this way (e.g. it has several axes).
+        """
+
+        if len(figure.axes) != 1 or figure.axes[0].get_subplotspec() is None or not figure.axes[0].get_visible() \
+                or figure._supxlabel is not None or figure._supylabel is not None:
+            return None
+
+        ax = figure.axes[0]
+        renderer = figure._get_renderer()
+        with self.ticks_updated_once(ax):
+            tight_bbox = ax.get_tightbbox(renderer, for_layout_only=True)
+
+        subplot = figure.transFigure.transform_bbox(ax.get_subplotspec().get_position(figure))
+        title_height = 0.0
+        if figure._suptitle is not None and figure._suptitle.get_in_layout():
+            title_height = figure._suptitle.get_window_extent(renderer).height
+
+        return np.array([subplot.x0 - tight_bbox.x0, subplot.y0 - tight_bbox.y0, tight_bbox.x1 - subplot.x1, tight_bbox.y1 - subplot.y1, title_height]) / figure.dpi
+
+    def geometry(self, figure, extents):
+
+        """This function returns the subplot parameters 'tight_layout' gives a figure with the measured extents (see 'measure'),
+        or 'None' if the margins needed leave no room for the axes (in which case 'tight_layout' leaves the figure as it is)."""
+
+        width, height = figure.get_size_inches()
+        pad = self.pad * FontProperties(size=plt.rcParams["font.size"]).get_size_in_points() / 72
+        left, bottom, right, top, title_height = extents
+
+        margin_left = (max(left, 0) + pad) / width
+        margin_right = (max(right, 0) + pad) / width
+        margin_bottom = (max(bottom, 0) + pad) / height
+        margin_top = (max(top, 0) + pad) / height
+        if title_height > 0:
+            margin_top += (title_height + pad) / height
+
+        if margin_left + margin_right >= 1 or margin_bottom + margin_top >= 1:
+            return None
+        return {"left": margin_left, "right": 1 - margin_right, "bottom": margin_bottom, "top": 1 - margin_top}
+
+    def tight_layout(self, chart_type: str, current_style=None, figure=None):
+
+        """This function lays out a figure (in place of 'plt.tight_layout'). If the figure's extents fit within those of a cached geometry
+        of the same chart type and style (and it doesn't make room for more than 'fit_tolerance' pixels more on any side), the cached geometry is
+        applied, otherwise the geometry is computed from the figure's own extents and cached.
+
+        Parameters
+        ----------
+        chart_type: str
+            The chart type (Line, Scatter, Bar, etc.)
+        current_style: str, int, None
+            The current Matplotlib style for all plots.
+        figure: plt.Figure, None
+            The figure to lay out. 'None' lays out pyplot's current figure.
+        """
+
+        figure = figure if figure is not None else plt.gcf()
+
+        with tracer.span("tight_layout", "chart") as span:
+            extents = self.measure(figure) if self.enabled is True else None
+            if extents is None:
+                figure.tight_layout()
+                span.set(cached=False)
+                return
+
+            key = FigurePool.pool_key(chart_type, current_style, figure.get_size_inches())
+            tolerance = self.fit_tolerance / figure.dpi
+            with self.lock:
+                subplot_parameters = next((subplot_parameters for cached_extents, subplot_parameters in self.layouts.get(key, [])
+                                           if np.all(extents <= cached_extents + 1e-9) and np.all(cached_extents - extents <= tolerance)), None)
+
+            cached = subplot_parameters is not None
+            if cached is True:
+                self.hits += 1
+            else:
+                subplot_parameters = self.geometry(figure, extents)
+                if subplot_parameters is None:
+                    figure.tight_layout()
+                    span.set(cached=False)
+                    return
+                self.misses += 1
+                with self.lock:
+                    layouts = self.layouts.setdefault(key, [])
+                    if len(layouts) >= self.max_layouts:
+                        layouts.pop(0)
+                    layouts.append((extents, subplot_parameters))
+
+            figure.subplots_adjust(**subplot_parameters)
+            span.set(cached=cached)
+
+    def clear(self):
+
+        "This function drops every cached geometry (e.g. once the rcParams have changed)."
+
+        with self.lock:
+            self.layouts.clear()
+
+    def cached_count(self):
+
+        "This function returns the number of cached geometries."
+
+        return sum(len(layouts) for layouts in self.layouts.values())
+
+
+figure_pool = FigurePool()
+layout_cache = LayoutCache()
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     for chart_index in range(0, 3):
+#         fig, ax = figure_pool.subplots('Scatter', None, figsize=(4, 3))
+#         ax.scatter(range(0, 10), range(0, 10))
+#         ax.set_xlabel('x', fontsize=8)
+#         layout_cache.tight_layout('Scatter', None, fig)
+#         figure_pool.release(fig)
+#     print(figure_pool.created, figure_pool.reused, layout_cache.hits, layout_cache.misses)
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
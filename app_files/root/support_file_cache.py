@@ -0,0 +1,267 @@
+"""root.support_file_cache
+A module dedicated towards persisting the converted DataFrame of a file submitted by the user as a binary (Feather/Arrow) sidecar,
+so that any later opens of the same file can memory-map the sidecar instead of re-parsing the file and converting its datetime columns again.
+Run this module as a script with '--purge' to delete every sidecar in the cache directory.
+"""
+
+import os
+import json
+import hashlib
+import argparse
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    # The cache is simply disabled if 'pyarrow' is not installed.
+    pa = feather = None
+
+# The version of the converted DataFrame a sidecar holds. It's part of the key of every sidecar, so it must be bumped whenever the conversion
+# (filling nulls, converting/splitting date and time columns, compacting columns, see 'DataframeOverview.initialize_columns') changes its output,
+# otherwise a sidecar written by the older conversion would still be loaded (and not converted again).
+CACHE_VERSION = 1
+
+
+class FileCache:
+
+    """
+    A class for instantiating a 'cache' object, responsible for storing, loading and evicting the sidecars of parsed files.
+    Each sidecar is keyed by the absolute path of the source file, its size and its modification time, and the 'CACHE_VERSION' of the conversion,
+    so any edit to the source file (or change to how it's converted) will automatically invalidate its sidecar.
+
+    Attributes
+    ----------
+    cache_dir: str
+        The directory the sidecars are stored in (default '~/.autographica/cache', or the 'AUTOGRAPHICA_CACHE_DIR' environment variable).
+    max_bytes: int
+        The maximum total size of all the sidecars in the cache directory (default 2048 MB, or the 'AUTOGRAPHICA_CACHE_MAX_MB' environment variable).
+    """
+
+    sidecar_extension = ".feather"
+    
+    # The key of the sidecar's schema metadata which holds the conversions made to each column (see 'DataframeOverview.convert_date_time_columns').
+    conversions_key = b"autographica_column_conversions"
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+
+        if cache_dir is None:
+            cache_dir = os.environ.get("AUTOGRAPHICA_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".autographica", "cache"))
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("AUTOGRAPHICA_CACHE_MAX_MB", 2048)) * 1024 * 1024)
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def is_enabled(self):
+
+        "This function determines whether sidecars can be written and read (i.e. 'pyarrow' is installed and caching has not been switched off)."
+
+        return feather is not None and os.environ.get("AUTOGRAPHICA_CACHE", "on") != "off"
+
+    def source_key(self, source_path: str):
+
+        """This function creates a key for the source file, based only on its absolute path.
+        All sidecars of the same source file share this key as a prefix, so any stale sidecars can be found and removed.
+
+        Parameters
+        ----------
+        source_path: str
+            The path to the file (csv/xlsx) that the user has submitted.
+        """
+
+        return hashlib.sha1(os.path.abspath(source_path).encode("utf-8")).hexdigest()[:16]
+
+    def sidecar_path(self, source_path: str, columns=None, sheet_name=None):
+
+        """This function returns the path of the sidecar for the current state (size and modification time) of the source file, and the current 'CACHE_VERSION'.
+
+        Parameters
+        ----------
+        source_path: str
+            The path to the file (csv/xlsx) that the user has submitted.
+        columns: list, None
+            The subset of columns the DataFrame was loaded with. 'None' means that every column was loaded.
+        sheet_name: str, int, list, None
+            The sheet(s) of an Excel workbook the DataFrame was loaded from. 'None' means the first sheet (or a csv file).
+        """
+
+        file_stats = os.stat(source_path)
+        state = f"{CACHE_VERSION}|{file_stats.st_size}|{file_stats.st_mtime_ns}|{columns if columns is None else sorted(columns)}"
+        if sheet_name is not None:
+            state += f"|{sheet_name}"
+        state_key = hashlib.sha1(state.encode("utf-8")).hexdigest()[:16]
+
+        return os.path.join(self.cache_dir, f"{self.source_key(source_path)}_{state_key}{self.sidecar_extension}")
+
+    def load(self, source_path: str, columns=None, sheet_name=None):
+
+        """This function returns the converted DataFrame stored in the sidecar of the source file.
+        The sidecar is memory-mapped rather than read, so re-opening even very large files is close to instant.
+        If no valid sidecar exists, 'None' is returned.
+
+        Parameters
+        ----------
+        source_path: str
+            The path to the file (csv/xlsx) that the user has submitted.
+        columns: list, None
+            The subset of columns the DataFrame was loaded with. 'None' means that every column was loaded.
+        sheet_name: str, int, list, None
+            The sheet(s) of an Excel workbook the DataFrame was loaded from. 'None' means the first sheet (or a csv file).
+        """
+
+        if self.is_enabled() is False or os.path.isfile(source_path) is False:
+            return None
+
+        sidecar = self.sidecar_path(source_path, columns, sheet_name)
+        if os.path.isfile(sidecar) is False:
+            return None
+
+        try:
+            table = feather.read_table(sidecar, memory_map=True)
+            dataframe = table.to_pandas()
+            # The conversions are kept, so that any rows appended to the file later on can be converted the same way.
+            if table.schema.metadata is not None and self.conversions_key in table.schema.metadata:
+                dataframe.attrs["column_conversions"] = json.loads(table.schema.metadata[self.conversions_key])
+        except Exception as e:
+            # A corrupt or partially written sidecar is deleted, so that it can be written again.
+            print(str(e))
+            self.remove(sidecar)
+            return None
+
+        # Touch the sidecar, so that the eviction order is 'least recently used'.
+        os.utime(sidecar)
+        return dataframe
+
+    def store(self, source_path: str, dataframe: pd.DataFrame, columns=None, sheet_name=None):
+
+        """This function writes the converted DataFrame to a sidecar, removes any stale sidecars of the same source file
+        and evicts the least recently used sidecars if the cache has grown beyond its maximum size.
+
+        Parameters
+        ----------
+        source_path: str
+            The path to the file (csv/xlsx) that the user has submitted.
+        dataframe: pd.DataFrame
+            The DataFrame after all null values have been filled and all datetime columns have been converted.
+        columns: list, None
+            The subset of columns the DataFrame was loaded with. 'None' means that every column was loaded.
+        sheet_name: str, int, list, None
+            The sheet(s) of an Excel workbook the DataFrame was loaded from. 'None' means the first sheet (or a csv file).
+        """
+
+        if self.is_enabled() is False or os.path.isfile(source_path) is False:
+            return None
+
+        sidecar = self.sidecar_path(source_path, columns, sheet_name)
+        temp_sidecar = sidecar + ".tmp"
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Feather only accepts a default index and string column names.
+            sidecar_dataframe = dataframe.reset_index(drop=True)
+            sidecar_dataframe.columns = [str(column) for column in sidecar_dataframe.columns]
+            table = pa.Table.from_pandas(sidecar_dataframe, preserve_index=False)
+            if "column_conversions" in dataframe.attrs:
+                metadata = dict(table.schema.metadata or {})
+                metadata[self.conversions_key] = json.dumps(dataframe.attrs["column_conversions"]).encode("utf-8")
+                table = table.replace_schema_metadata(metadata)
+            feather.write_feather(table, temp_sidecar, compression="uncompressed")
+            # Only make the sidecar visible once it has been fully written.
+            os.replace(temp_sidecar, sidecar)
+        except Exception as e:
+            # Columns of mixed types can't be written to Arrow, in which case the file just won't be cached.
+            print(str(e))
+            self.remove(temp_sidecar)
+            return None
+
+        self.remove_stale_sidecars(source_path, keep=sidecar, columns=columns)
+        self.evict()
+        return sidecar
+
+    def remove_stale_sidecars(self, source_path: str, keep: str, columns=None):
+
+        """This function removes the sidecars of a source file that was modified since they were written.
+        Sidecars of the same state but with a different subset of columns are kept.
+
+        Parameters
+        ----------
+        source_path: str
+            The path to the file (csv/xlsx) that the user has submitted.
+        keep: str
+            The path to the sidecar that is currently valid.
+        columns: list, None
+            The subset of columns the DataFrame was loaded with. 'None' means that every column was loaded.
+        """
+
+        prefix = self.source_key(source_path) + "_"
+        keep_mtime = os.path.getmtime(keep)
+
+        for sidecar in self.list_sidecars():
+            if os.path.basename(sidecar).startswith(prefix) and sidecar != keep:
+                # Any sidecar written before the source file was last modified is stale.
+                if os.path.getmtime(sidecar) < os.path.getmtime(source_path) <= keep_mtime:
+                    self.remove(sidecar)
+
+    def list_sidecars(self):
+
+        "This function returns the paths of all sidecars in the cache directory."
+
+        if os.path.isdir(self.cache_dir) is False:
+            return []
+
+        return [os.path.join(self.cache_dir, file_name) for file_name in os.listdir(self.cache_dir)
+                if file_name.endswith(self.sidecar_extension)]
+
+    def cache_size(self):
+
+        "This function returns the total size (in bytes) of all sidecars in the cache directory."
+
+        return sum(os.path.getsize(sidecar) for sidecar in self.list_sidecars())
+
+    def evict(self):
+
+        "This function deletes the least recently used sidecars, until the total size of the cache is below its maximum size."
+
+        sidecars = sorted(self.list_sidecars(), key=os.path.getmtime)
+        total_size = sum(os.path.getsize(sidecar) for sidecar in sidecars)
+
+        # The most recently used sidecar is always kept, even if it is larger than the cache on its own.
+        while total_size > self.max_bytes and len(sidecars) > 1:
+            oldest_sidecar = sidecars.pop(0)
+            total_size -= os.path.getsize(oldest_sidecar)
+            self.remove(oldest_sidecar)
+
+    def purge(self):
+
+        "This function deletes every sidecar in the cache directory and returns the number of sidecars deleted."
+
+        sidecars = self.list_sidecars()
+        for sidecar in sidecars:
+            self.remove(sidecar)
+
+        return len(sidecars)
+
+    @staticmethod
+    def remove(file_path: str):
+
+        "This function deletes a file, ignoring the case that it has already been deleted."
+
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Manage the AutoGraphica sidecar cache of parsed csv/xlsx files.")
+    parser.add_argument("--purge", action="store_true", help="delete every sidecar in the cache directory")
+    parser.add_argument("--cache-dir", default=None, help="the cache directory (defaults to '~/.autographica/cache')")
+    args = parser.parse_args()
+
+    file_cache = FileCache(cache_dir=args.cache_dir)
+    if args.purge:
+        print(f"Purged {file_cache.purge()} sidecar(s) from '{file_cache.cache_dir}'")
+    else:
+        print(f"{len(file_cache.list_sidecars())} sidecar(s), {file_cache.cache_size() / (1024 * 1024):.1f} MB of {file_cache.max_bytes / (1024 * 1024):.0f} MB in '{file_cache.cache_dir}'")
@@ -0,0 +1,466 @@
+"""root.support_file_watcher
+A module dedicated towards the watch mode, which keeps the charts of an append-only file (e.g. a log that grows during the day) up to date.
+Each time the file grows, only the bytes appended to it are parsed and converted, and the column profile is updated from the new rows alone
+(see 'ColumnAggregate'), rather than the whole file being read, converted and profiled again.
+The rest of a refresh is a full recompute, whose cost grows with the whole file: the new rows are appended to the DataFrame (a copy of every row),
+the chart rules and the chart data of every chart are recomputed over every row (see 'chart_data_cache.reload'), and every chart is re-rendered.
+Anything other than an append (the file being rewritten, truncated or its header changed, or new rows that would change how a column is converted)
+falls back to loading the whole file again.
+The watch mode is switched on with the 'AUTOGRAPHICA_WATCH' environment variable, set to the polling interval in seconds (or to 'on' for every 2 seconds),
+or by running the app with '--watch'.
+"""
+
+import os
+import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
+import io
+import functools
+import numpy as np
+import pandas as pd
+from support_main_classes import ColumnAttributes
+from support_column_statistics import ColumnStatistics
+from support_cardinality import CardinalityEstimator, HyperLogLog
+from support_tracing import tracer
+from support_memory import memory_monitor
+from support_chart_data import chart_data_cache
+
+
+class AppendWatcher:
+
+    """
+    A class for instantiating a 'watcher' object, which detects the rows appended to a file (csv) and reads only those rows.
+
+    Attributes
+    ----------
+    file_path: str
+        The path to the file being watched.
+    offset: int, None
+        The number of bytes of the file that have been read (always the end of a complete line). 'None' means that it is unknown.
+    source_columns: list
+        The names of the columns in the header of the file.
+    usecols: list, None
+        The columns that are read from any new rows. 'None' reads every column.
+    """
+
+    # The number of bytes at the start of the file, and before the offset, which are compared on every check to detect the file being rewritten.
+    fingerprint_bytes = 4096
+
+    def __init__(self, file_path: str, offset=None, usecols=None):
+        self.file_path = file_path
+        self.usecols = usecols
+        self.offset = offset
+        self.size = None
+        self.mtime_ns = None
+        self.source_columns = list(pd.read_csv(file_path, nrows=0).columns) if file_path.endswith(".csv") else []
+        self.head_fingerprint = self.read_bytes(0, self.fingerprint_bytes) if offset is not None else None
+        self.tail_fingerprint = self.read_tail_fingerprint()
+
+    def read_bytes(self, start: int, end: int):
+
+        "This function returns the bytes of the file between two positions (or fewer, if the file is shorter)."
+
+        with open(self.file_path, "rb") as file:
+            file.seek(start)
+            return file.read(max(0, end - start))
+
+    def read_tail_fingerprint(self):
+
+        "This function returns the bytes just before the offset, which must stay the same if the file has only been appended to."
+
+        if self.offset is None:
+            return None
+        return self.read_bytes(max(0, self.offset - self.fingerprint_bytes), self.offset)
+
+    def check(self):
+
+        """This function checks how the file has changed since it was last read, and returns either:
+            - 'unchanged': nothing new to read (including a line that is still being written, or the file being missing for a moment).
+            - 'appended': at least one complete line has been appended.
+            - 'reload': the file has changed in any other way, and has to be loaded again.
+        """
+
+        try:
+            file_stats = os.stat(self.file_path)
+        except OSError:
+            return "unchanged"
+
+        if file_stats.st_size == self.size and file_stats.st_mtime_ns == self.mtime_ns:
+            return "unchanged"
+        self.size, self.mtime_ns = file_stats.st_size, file_stats.st_mtime_ns
+
+        # Workbooks are rewritten rather than appended to, and the offset is unknown if the file grew while the DataFrame was being read.
+        if self.file_path.endswith(".csv") is False or self.offset is None or file_stats.st_size < self.offset:
+            return "reload"
+
+        if self.read_bytes(0, self.fingerprint_bytes) != self.head_fingerprint or self.read_tail_fingerprint() != self.tail_fingerprint:
+            return "reload"
+
+        # The last row was still being written when the DataFrame was read (so it was read only in part).
+        if self.offset > 0 and self.tail_fingerprint[-1:] not in [b"\n", b"\r"]:
+            return "reload"
+
+        if file_stats.st_size == self.offset or b"\n" not in self.read_bytes(self.offset, file_stats.st_size):
+            return "unchanged"
+
+        return "appended"
+
+    def read_appended_rows(self, dtype=None):
+
+        """This function reads every complete line appended to the file since it was last read into a DataFrame, and moves the offset past them.
+        'None' is returned if the lines can not be parsed with the columns of the header.
+
+        Parameters
+        ----------
+        dtype: dict, None
+            The data type of any columns, which are not left to be inferred (e.g. columns of text read as 'str').
+        """
+
+        appended_bytes = self.read_bytes(self.offset, self.size if self.size is not None else os.path.getsize(self.file_path))
+        # Only complete lines are read, the rest of a line that is still being written is read the next time.
+        appended_bytes = appended_bytes[:appended_bytes.rfind(b"\n") + 1]
+
+        try:
+            new_rows = pd.read_csv(io.BytesIO(appended_bytes), header=None, names=self.source_columns, usecols=self.usecols, dtype=dtype)
+        except Exception as e:
+            print(str(e))
+            return None
+
+        self.offset += len(appended_bytes)
+        self.tail_fingerprint = self.read_tail_fingerprint()
+        return new_rows
+
+
+class ColumnAggregate:
+
+    """
+    A class for instantiating a 'column aggregate' object, which keeps the aggregations of a single column up to date as rows are appended to it,
+    so that the column profile does not need every row to be scanned again.
+
+    Attributes
+    ----------
+    numeric: bool
+        Whether the column is numeric (only a numeric column is checked for whole numbers).
+    rows: int
+        The number of rows in the column.
+    null_values: int
+        The number of null values within the column.
+    exact: bool
+        Whether the unique values of the column are always counted exactly, as its data category depends on their number (see 'exact_dtypes').
+    uniques: set
+        The unique (non-null) values within the column, while they are counted exactly.
+    sketch: support_cardinality.HyperLogLog, None
+        The sketch the unique values are counted from instead, once a column that isn't counted exactly may have more than 'sketch_values' of them.
+    integral: bool
+        Whether every value of a numeric column is a whole number.
+    """
+
+    # The data types whose data category depends on the number of unique values (see 'ColumnStatistics.categorise').
+    exact_dtypes = ['object', 'int64']
+
+    # The number of unique values above which a column of any other data type is counted from a sketch, which bounds the memory it uses.
+    sketch_values = CardinalityEstimator.sketch_rows
+
+    def __init__(self, pd_series):
+        self.numeric = pd.api.types.is_numeric_dtype(pd_series) and not pd.api.types.is_bool_dtype(pd_series)
+        self.exact = ColumnStatistics.canonical_dtype(pd_series) in self.exact_dtypes
+        self.rows = 0
+        self.null_values = 0
+        self.uniques = set()
+        self.sketch = None
+        self.integral = True
+        self.update(pd_series)
+
+    @property
+    def unique_values(self):
+
+        """This function returns the number of unique values within the column (a null value counts as one, as in 'ColumnAttributes').
+        It's approximate (within around 1%) once the unique values are counted from the sketch."""
+
+        unique_values = len(self.uniques) if self.sketch is None else self.sketch.count()
+        return unique_values + (1 if self.null_values > 0 else 0)
+
+    def update(self, pd_series):
+
+        """This function adds the values of new rows to the aggregations.
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            The new rows of the column.
+        """
+
+        if len(pd_series) == 0:
+            return
+
+        null_mask = pd_series.isnull()
+        values = pd_series[~null_mask]
+        self.rows += len(pd_series)
+        self.null_values += int(null_mask.sum())
+
+        # Only the unique values of the new rows are added, so the values are not looped over one by one.
+        new_uniques = pd.Series(values.unique())
+        if self.exact is False and self.sketch is None and len(self.uniques) + len(new_uniques) > self.sketch_values:
+            # A sketch of the unique values is the same as a sketch of every value, as a value seen again doesn't change it.
+            self.sketch = HyperLogLog()
+            self.sketch.add(pd.Series(list(self.uniques), dtype=new_uniques.dtype))
+            self.uniques = set()
+
+        if self.sketch is not None:
+            self.sketch.add(new_uniques)
+        else:
+            self.uniques.update(new_uniques.tolist())
+
+        if self.numeric is True and len(values) > 0:
+            numeric_values = values.to_numpy(dtype="float64")
+            self.integral = self.integral and bool(np.all(np.mod(numeric_values, 1) == 0))
+
+    def data_category(self, column_dtype: str):
+
+        """This function returns the data category of the column, by the same rules as 'ColumnAttributes' (see 'ColumnStatistics.categorise'),
+        but from the aggregations rather than by scanning every row.
+
+        Parameters
+        ----------
+        column_dtype: str
+            The data type of the column (see 'ColumnAttributes.canonical_dtype').
+        """
+
+        return ColumnStatistics.categorise(column_dtype, self.rows, self.unique_values, self.null_values, self.integral)
+
+
+class IncrementalRefresh:
+
+    """
+    A class for instantiating an 'incremental refresh' object, which keeps a chart instance (and the charts it created) up to date with the rows appended to its file.
+    Every chart the instance creates is recorded with the method and arguments it was created from, so it can be re-rendered in place from the new data.
+
+    Attributes
+    ----------
+    chart_instance: object
+        An instance of a chart class (LineGraph, BarChart, etc.), created from a DataFrame loaded by 'FileController'.
+    overview: support_main_classes.DataframeOverview
+        The overview of the chart instance, which the new rows are converted and appended by.
+    watcher: support_file_watcher.AppendWatcher
+        The watcher of the file the DataFrame was loaded from.
+    column_aggregates: dict
+        The aggregations of each column (see 'ColumnAggregate').
+    chart_inputs: dict
+        The create method and arguments of each chart created, keyed by the id of its figure.
+    """
+
+    # The methods each chart class creates a single chart with.
+    create_methods = ['create_chart', 'create_single_axes_chart', 'create_double_axes_chart', 'create_single_chart', 'create_multi_chart']
+
+    # The methods each chart class creates its whole list of charts with.
+    plot_methods = ['plot_multiple_charts', 'plot_facet_chart']
+
+    def __init__(self, chart_instance):
+        self.chart_instance = chart_instance
+        self.overview = chart_instance.overview
+        dataframe = self.overview.dataframe
+        self.watcher = AppendWatcher(dataframe.attrs["source_path"], dataframe.attrs.get("source_size"), dataframe.attrs.get("source_columns"))
+        self.column_aggregates = {}
+        self.chart_inputs = {}
+        self.plot_call = None
+
+        with tracer.span("aggregate_columns", "watch", rows=len(dataframe), columns=len(dataframe.columns)):
+            for column in dataframe.columns:
+                self.column_aggregates[column] = ColumnAggregate(dataframe[column])
+
+        for method_name in self.create_methods + self.plot_methods:
+            if hasattr(chart_instance, method_name):
+                setattr(chart_instance, method_name, self.recorded(method_name, getattr(chart_instance, method_name)))
+
+    @staticmethod
+    def is_enabled():
+
+        "This function determines whether the watch mode has been switched on."
+
+        return os.environ.get("AUTOGRAPHICA_WATCH", "") not in ["", "0", "off"]
+
+    @staticmethod
+    def poll_interval():
+
+        "This function returns the number of seconds between each check of the file."
+
+        interval = os.environ.get("AUTOGRAPHICA_WATCH", "")
+        try:
+            return float(interval)
+        except ValueError:
+            return 2.0
+
+    def recorded(self, method_name: str, method):
+
+        """This function returns a method of the chart instance, which records what each chart it creates was created from.
+
+        Parameters
+        ----------
+        method_name: str
+            The name of the method.
+        method: function
+            The (bound) method of the chart instance.
+        """
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            result = method(*args, **kwargs)
+            if method_name in self.plot_methods:
+                self.plot_call = (method_name, args, kwargs)
+            elif result is not None:
+                self.record_chart(result, method_name, args, kwargs)
+            return result
+
+        return wrapper
+
+    def record_chart(self, figure, method_name: str, args: tuple, kwargs: dict):
+
+        """This function records the create method and arguments a chart was created from.
+
+        Parameters
+        ----------
+        figure: plt.Figure
+            The chart created.
+        method_name: str
+            The create method the chart was created by.
+        args, kwargs: tuple, dict
+            The arguments the chart was created from.
+        """
+
+        self.chart_inputs[id(figure)] = {"method": method_name, "args": args, "kwargs": kwargs}
+
+    def chart_lists(self):
+
+        "This function returns the columns the chart instance's 'chart_rules' found for each axis, so any change to which charts can be made is detected."
+
+        return {name: list(value) for name, value in vars(self.chart_instance).items()
+                if isinstance(value, list) and (name.endswith("_list") or name == "high_cardinal_x_variables")}
+
+    def update_profile(self, new_dataframe: pd.DataFrame):
+
+        """This function updates the column profile (every 'ColumnAttributes' of the overview) and the aggregations from the new rows.
+
+        Parameters
+        ----------
+        new_dataframe: pd.DataFrame
+            The new (converted) rows.
+        """
+
+        dataframe = self.overview.dataframe
+        for column, aggregate in self.column_aggregates.items():
+            aggregate.update(new_dataframe[column])
+
+        for column_instance in self.overview.column_attributes.values():
+            aggregate = self.column_aggregates[column_instance.column_name]
+            column_instance.column_data = dataframe[column_instance.column_name]
+            column_instance.column_dtype = ColumnAttributes.canonical_dtype(column_instance.column_data)
+            column_instance.unique_values = aggregate.unique_values
+            column_instance.null_values = aggregate.null_values
+            column_instance.data_category = aggregate.data_category(column_instance.column_dtype)
+
+    def refresh(self, chart_list: list):
+
+        """This function checks the file for new rows and, if there are any, appends them and re-renders every chart from the new data,
+        replacing them in the chart list (in place). Every chart is re-rendered, as every column of a file appended to has new rows.
+        It returns the outcome and the indexes of the charts that were re-rendered:
+            - 'unchanged': there were no new rows.
+            - 'refreshed': the charts at the indexes returned were re-rendered.
+            - 'replotted': the charts that can be made changed (e.g. a column's data category changed), so every chart was created again.
+            - 'reload': the file changed in a way other than rows being appended, and has to be loaded again (see 'FileController').
+
+        Parameters
+        ----------
+        chart_list: list
+            The list of Matplotlib figures created by the chart instance ('None' for any figure dropped by the gallery).
+        """
+
+        status = self.watcher.check()
+        if status != "appended":
+            return status, []
+
+        with tracer.span("incremental_refresh", "watch") as span, memory_monitor.stage("incremental_refresh"):
+            with tracer.span("read_appended_rows", "watch"):
+                new_dataframe = self.watcher.read_appended_rows(self.overview.appended_rows_dtypes(self.watcher.source_columns))
+            if new_dataframe is None:
+                return "reload", []
+            if len(new_dataframe) == 0:
+                return "unchanged", []
+
+            with tracer.span("convert_appended_rows", "watch", rows=len(new_dataframe)):
+                new_dataframe = self.overview.convert_appended_rows(new_dataframe)
+            if new_dataframe is None:
+                return "reload", []
+
+            with tracer.span("append_rows", "watch"):
+                self.overview.append_rows(new_dataframe)
+                self.update_profile(new_dataframe)
+            span.set(rows=len(new_dataframe))
+
+            # The data stage is run again on a new shallow copy, as the chart rules convert some columns for plotting (see 'support_chart_data').
+            chart_lists = self.chart_lists()
+            chart_data_cache.reload(self.chart_instance)
+
+            # A figure dropped by the gallery ('None') is created again from the new data when its slide is next shown (see 'support_gallery').
+            if self.chart_lists() != chart_lists or any(id(figure) not in self.chart_inputs for figure in chart_list if figure is not None):
+                return self.replot(chart_list)
+
+            chart_indexes = []
+            for chart_index, figure in enumerate(chart_list):
+                if figure is None:
+                    continue
+                chart_input = self.chart_inputs.pop(id(figure))
+                chart_list[chart_index] = getattr(self.chart_instance, chart_input["method"])(*chart_input["args"], **chart_input["kwargs"])
+                chart_indexes.append(chart_index)
+                self.close_figure(figure)
+            span.set(charts=len(chart_indexes))
+
+        return "refreshed", chart_indexes
+
+    def replot(self, chart_list: list):
+
+        "This function creates every chart again (in place of the chart list), the same way they were first created."
+
+        for figure in chart_list:
+            if figure is not None:
+                self.close_figure(figure)
+        self.chart_inputs.clear()
+
+        if self.plot_call is None:
+            return "reload", []
+
+        method_name, args, kwargs = self.plot_call
+        chart_list[:] = getattr(self.chart_instance, method_name)(*args, **kwargs)
+        return "replotted", list(range(0, len(chart_list)))
+
+    def forget_chart(self, figure):
+
+        "This function stops tracking a figure which has been dropped (see 'support_gallery'), it is recorded again if it's created again."
+
+        self.chart_inputs.pop(id(figure), None)
+
+    @staticmethod
+    def close_figure(figure):
+
+        "This function releases a figure that has been replaced, so it can be reused by the next chart of the same type (see 'support_figure_pool')."
+
+        from support_figure_pool import figure_pool
+        figure_pool.release(figure)
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     from instantiation_file_controller import FileController
+#     from instantiation_create_chart_instance import CreateChartInstance
+
+#     file = r'###############################################/.csv'
+#     dataframe = FileController(file, 'Bar').dataframe
+#     chart_instance = CreateChartInstance(dataframe, 'Bar', [None] * 7).validate_chart_attributes()
+#     file_refresh = IncrementalRefresh(chart_instance)
+#     chart_list = chart_instance.plot_multiple_charts()
+
+#     # ... rows are appended to the file ...
+#     print(file_refresh.refresh(chart_list))
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
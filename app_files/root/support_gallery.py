@@ -0,0 +1,244 @@
+"""root.support_gallery
+A module dedicated towards bounding the memory the Display page holds on to, however many charts are created.
+Only the current slide and its neighbours are given a live canvas (with its Agg buffer and texture). The figures of the other slides are kept
+while they fit within a memory cap, and the least recently viewed figure over the cap is dropped: only its chart spec is kept, and the figure is created
+again on demand (from the cached data stage, see 'support_chart_data') when its slide is next shown, or when every chart is saved.
+The memory cap (in MB) is set with the 'AUTOGRAPHICA_GALLERY_MEMORY' environment variable (256 by default), 'AUTOGRAPHICA_GALLERY_MEMORY=off'
+gives every slide a live canvas and keeps every figure, as before.
+"""
+
+import os
+import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
+from collections import OrderedDict
+from matplotlib.backend_bases import FigureCanvasBase
+from matplotlib.collections import Collection
+from matplotlib.lines import Line2D
+from support_tracing import tracer
+from support_memory import memory_monitor
+
+
+class ChartGallery:
+
+    """
+    A class for instantiating a 'chart gallery' object, which decides which slides of the Display page are given a live canvas,
+    and which figures are kept, for the chart list of a chart instance.
+
+    Attributes
+    ----------
+    chart_list: list
+        The list of Matplotlib figures displayed (shared with the app, and updated in place). A figure that has been dropped is 'None'.
+    chart_specs: list
+        The chart spec each figure was created from (see 'support_chart_plan'), or 'None' for a figure that can't be created again (e.g. a Facet Plot).
+    chart_instance: object
+        The instance of a chart class (LineGraph, ScatterPlot, BarChart, etc.) the charts were created by.
+    file_refresh: support_file_watcher.IncrementalRefresh, None
+        The incremental refresh of the charts in the watch mode, which stops tracking a figure once it is dropped.
+    memory_cap: int, None
+        The memory (in bytes) the figures kept may use. 'None' keeps every figure, and gives every slide a live canvas.
+    neighbours: int
+        The number of slides either side of the current slide which are given a live canvas.
+    live_indexes: set
+        The indexes of the slides with a live canvas.
+    viewed: collections.OrderedDict
+        The indexes of the slides shown, least recently viewed first.
+    figure_bytes: dict
+        The memory each figure kept is estimated to use, by the index of its slide.
+    rehydrated: int
+        The number of figures created again after being dropped.
+    dropped: int
+        The number of figures dropped.
+    """
+
+    default_memory_cap = 256
+
+    # The memory a figure uses before anything is drawn on it (its axes, spines and ticks), and that each artist uses besides its data
+    # (its properties, transforms and path), in bytes. Both were measured with tracemalloc.
+    base_figure_bytes = 256 * 1024
+    artist_bytes = 4096
+
+    def __init__(self, chart_list: list, chart_instance=None, file_refresh=None, memory_cap=None):
+        self.chart_list = chart_list
+        self.chart_specs = self.planned_specs(chart_list, chart_instance)
+        self.chart_instance = chart_instance
+        self.file_refresh = file_refresh
+        self.memory_cap = memory_cap if memory_cap is not None else self.memory_cap_bytes()
+        self.neighbours = 1 if self.memory_cap is not None else len(chart_list)
+        self.live_indexes = set()
+        self.viewed = OrderedDict()
+        self.figure_bytes = {}
+        self.rehydrated = 0
+        self.dropped = 0
+
+    @classmethod
+    def memory_cap_bytes(cls):
+
+        "This function returns the memory cap set with 'AUTOGRAPHICA_GALLERY_MEMORY' (in MB) in bytes, or 'None' if the gallery is switched off."
+
+        memory_cap = os.environ.get("AUTOGRAPHICA_GALLERY_MEMORY", str(cls.default_memory_cap))
+        if memory_cap in ["", "0", "off"]:
+            return None
+        try:
+            return int(float(memory_cap) * 1024 * 1024)
+        except ValueError:
+            return cls.default_memory_cap * 1024 * 1024
+
+    @staticmethod
+    def planned_specs(chart_list: list, chart_instance):
+
+        """This function returns the chart spec of each figure in the chart list, in the same order. 'plot_multiple_charts' creates a figure for every chart spec
+        its data stage planned, other chart lists (e.g. from 'plot_facet_chart') have no chart specs."""
+
+        data_stage = getattr(chart_instance, "data_stage", None)
+        chart_specs = getattr(data_stage, "chart_specs", None)
+        if chart_specs is None or len(chart_specs) != len(chart_list):
+            return [None] * len(chart_list)
+        return list(chart_specs)
+
+    def window(self, current_index: int):
+
+        "This function returns the indexes of the slides which are given a live canvas: the current slide and its neighbours."
+
+        return set(range(max(current_index - self.neighbours, 0), min(current_index + self.neighbours + 1, len(self.chart_list))))
+
+    def show(self, current_index: int):
+
+        """This function moves the live canvases to the current slide and its neighbours. It returns the figures of the slides which need a live canvas,
+        as (index, figure) pairs, and the indexes of the slides whose live canvas should be removed. Any figure dropped is created again first,
+        and the figures over the memory cap are dropped afterwards.
+
+        Parameters
+        ----------
+        current_index: int
+            The index of the current slide.
+        """
+
+        window = self.window(current_index)
+        removed_indexes = sorted(self.live_indexes - window)
+        for chart_index in removed_indexes:
+            self.detach_canvas(self.chart_list[chart_index])
+
+        for chart_index in sorted(window, key=lambda chart_index: (chart_index == current_index, -abs(chart_index - current_index))):
+            self.viewed[chart_index] = None
+            self.viewed.move_to_end(chart_index)
+
+        added = [(chart_index, self.figure(chart_index)) for chart_index in sorted(window - self.live_indexes)]
+        self.live_indexes = window
+        self.trim()
+        return added, removed_indexes
+
+    def figure(self, chart_index: int):
+
+        "This function returns the figure of a slide, creating it again from its chart spec if it has been dropped."
+
+        if self.chart_list[chart_index] is None:
+            with tracer.span("rehydrate_chart", "display", chart_index=chart_index):
+                self.chart_list[chart_index] = self.chart_specs[chart_index].create(self.chart_instance)
+            self.rehydrated += 1
+        return self.chart_list[chart_index]
+
+    def figures(self):
+
+        "This function yields the figure of every slide in turn (e.g. to save every chart), dropping each again once it is over the memory cap."
+
+        for chart_index in range(0, len(self.chart_list)):
+            yield self.figure(chart_index)
+            self.trim()
+
+    def trim(self):
+
+        "This function drops the figures which are not on a live slide, least recently viewed first (slides never viewed go first), until the figures kept fit within the memory cap."
+
+        if self.memory_cap is None:
+            return
+
+        kept_indexes = [chart_index for chart_index, figure in enumerate(self.chart_list) if figure is not None]
+        kept_bytes = sum(self.estimated_bytes(chart_index) for chart_index in kept_indexes)
+        if kept_bytes <= self.memory_cap:
+            return
+
+        never_viewed = [chart_index for chart_index in reversed(kept_indexes) if chart_index not in self.viewed]
+        for chart_index in never_viewed + list(self.viewed):
+            if kept_bytes <= self.memory_cap:
+                break
+            if chart_index in self.live_indexes or self.chart_list[chart_index] is None or self.chart_specs[chart_index] is None:
+                continue
+            kept_bytes -= self.estimated_bytes(chart_index)
+            self.drop(chart_index)
+
+    def drop(self, chart_index: int):
+
+        "This function drops the figure of a slide, keeping only its chart spec."
+
+        figure = self.chart_list[chart_index]
+        self.chart_list[chart_index] = None
+        self.figure_bytes.pop(chart_index, None)
+        self.detach_canvas(figure)
+        if self.file_refresh is not None:
+            self.file_refresh.forget_chart(figure)
+        self.dropped += 1
+
+    def refreshed(self, chart_indexes: list):
+
+        "This function forgets the memory estimated for the figures replaced (e.g. by the watch mode), so it is estimated again."
+
+        for chart_index in chart_indexes:
+            self.figure_bytes.pop(chart_index, None)
+
+    def estimated_bytes(self, chart_index: int):
+
+        """This function returns the memory the figure of a slide is estimated to use. The memory retained when the figure was created is used
+        if the memory instrumentation mode is switched on (see 'support_memory'), otherwise it's estimated from the figure's artists and their data."""
+
+        if chart_index not in self.figure_bytes:
+            figure = self.chart_list[chart_index]
+            retained_bytes = memory_monitor.retained_by_figure.get(id(figure)) if memory_monitor.enabled is True else None
+            self.figure_bytes[chart_index] = retained_bytes if retained_bytes is not None else self.artist_data_bytes(figure)
+        return self.figure_bytes[chart_index]
+
+    @classmethod
+    def artist_data_bytes(cls, figure):
+
+        "This function estimates the memory a figure uses from the number of its artists, and the size of the data held by its lines and collections."
+
+        total_bytes = cls.base_figure_bytes
+        for artist in figure.findobj():
+            total_bytes += cls.artist_bytes
+            if isinstance(artist, Line2D):
+                total_bytes += artist.get_xydata().nbytes
+            elif isinstance(artist, Collection):
+                total_bytes += artist.get_offsets().nbytes + sum(path.vertices.nbytes for path in artist.get_paths())
+        return total_bytes
+
+    @staticmethod
+    def detach_canvas(figure):
+
+        "This function gives a figure a blank canvas in place of its live canvas, so the Agg buffer and texture of the live canvas can be freed."
+
+        if figure is not None:
+            FigureCanvasBase(figure)
+
+    def live_count(self):
+
+        "This function returns the number of slides with a live canvas, and the number of figures kept."
+
+        return len(self.live_indexes), sum(1 for figure in self.chart_list if figure is not None)
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     from instantiation_file_controller import FileController
+#     from instantiation_create_chart_instance import CreateChartInstance
+
+#     file = r'###############################################/.csv'
+#     dataframe = FileController(file, 'Scatter').dataframe
+#     scatter_instance = CreateChartInstance(dataframe, 'Scatter', [None] * 6).validate_chart_attributes()
+#     gallery = ChartGallery(scatter_instance.plot_multiple_charts(), scatter_instance, memory_cap=16 * 1024 * 1024)
+#     for current_index in range(0, len(gallery.chart_list)):
+#         added, removed_indexes = gallery.show(current_index)
+#     print(gallery.live_count(), gallery.rehydrated, gallery.dropped)
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
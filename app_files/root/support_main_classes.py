@@ -8,15 +8,19 @@ to determine which columns in the DataFrame get categorised as.
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 
 import copy
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
 from dateutil.parser import parse
 from dateutil.parser import ParserError
 from support_date_time_operations import DateTimeOperations
+from support_column_statistics import ColumnStatistics, StatisticsKernel
+from support_file_cache import FileCache
+from support_tracing import tracer
+from support_memory import memory_monitor
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
@@ -26,6 +30,7 @@ class ColumnAttributes:
     A class for instantiating a 'column' object, based on a Series in a Pandas DataFrame.
     This object will contain a number of attributes, but most importantly a 'data category',
     which will define what charts it can make.
+    It's filled from the statistics of the column (see 'support_column_statistics'), rather than by scanning the column again.
     
     Attributes
     ----------
@@ -39,76 +44,26 @@ class ColumnAttributes:
         The number of unique values within the column.
     null_values: int
         The number of null values within the column.
+    data_category: str, None
+        The data category of the column ('Continuous', 'Discrete', 'Nominal', 'Nominal-Binary', 'Ordinal', 'Date', 'Time' or None).
     """
     
-    def __init__(self, pd_series):
-        
-        self.column_data = pd_series
-        self.column_name = pd_series.name
-        self.column_dtype = str(pd_series.dtype)
-        self.unique_values = len(pd.unique(pd_series))
-        self.null_values = len([null_value for null_value in pd_series.isnull() if null_value is True])
-        self.create_data_category()
-        
-        
-    def quantitative_type(self):
-
-        "This function determines if a column is a quantitative type"
-    
-        if self.column_dtype == 'int64' and len(pd.unique(self.column_data)) > 2:
-            self.data_category = 'Discrete'
-            
-        # First Check
-        elif self.column_dtype == 'float64':
-            series_check = pd.Series(dtype='bool')
-            series_check = self.column_data.apply(lambda value: True if value.is_integer() else False)
-            
-            # Second Check - if column is 'Continuous' or 'Discrete', even though it's a 'float' datatype.
-            if False in series_check.values:
-                self.data_category = 'Continuous'
-            else:
-                self.data_category = 'Discrete'
-                
-        else:
-            self.data_category = None
+    __slots__ = ("column_data", "column_name", "column_dtype", "unique_values", "null_values", "data_category")
     
+    canonical_dtype = staticmethod(ColumnStatistics.canonical_dtype)
     
-    def qualitative_type(self):
-
-        "This function determines if a column is a qualitative type"
+    def __init__(self, pd_series, statistics=None):
         
-        # If there is 'x' or less unique values in the column, it will be labelled 'ordinal'
-        threshold_value = 10  
-    
-        if self.column_dtype == 'object' and len(self.column_data) == len(pd.unique(self.column_data)) or\
-        self.column_dtype == 'object' and len(pd.unique(self.column_data)) >= threshold_value:
-            self.data_category = 'Nominal'
-
-        # Check for any boolean representations
-        elif self.column_dtype == 'int64' and len(pd.unique(self.column_data)) == 2:
-            self.data_category = 'Nominal-Binary'
+        # A column profiled on its own (rather than with the rest of the DataFrame, see 'DataframeOverview.initialize_columns').
+        if statistics is None:
+            statistics = list(StatisticsKernel.profile(pd_series.to_frame()).values())[0]
         
-        # If the column is categorical and contains less than the threshold value. 
-        elif self.column_dtype == 'object' and len(pd.unique(self.column_data)) <= threshold_value:
-            self.data_category = 'Ordinal'
-            
-        elif self.column_dtype == 'datetime64[ns]' or  self.column_dtype == 'datetime64[ns, UTC]':
-            self.data_category = 'Date'
-            
-        elif self.column_dtype == 'timedelta64[ns]':
-            self.data_category = 'Time'
-            
-        else:
-            self.data_category = None
-    
-    
-    def create_data_category(self):
-
-        "This function calls the above methods on the column to determine if it is quantitative or qualitative"
-                
-        self.quantitative_type()
-        if not hasattr(self, 'data_category') or self.data_category is None:
-            self.qualitative_type()
+        self.column_data = pd_series
+        self.column_name = pd_series.name
+        self.column_dtype = statistics.column_dtype
+        self.unique_values = statistics.unique_values
+        self.null_values = statistics.null_values
+        self.data_category = statistics.data_category()
             
             
 class DataframeOverview:
@@ -124,8 +79,13 @@ class DataframeOverview:
         An instance of the DateTimeOperations class.
     dataframe: pd.DataFrame
         The DataFrame created from the file inputted by the user.
+    column_statistics: dict
+        The statistics of each column (see 'support_column_statistics'), as profiled once the columns were converted.
     """
     
+    # 'Nominal'/'Nominal-Binary'/'Ordinal' columns with a lower ratio of unique values to rows than this are stored as a 'Categorical'.
+    categorical_ratio = 0.5
+    
     def __init__(self, pd_dataframe):
         
         self.dt = DateTimeOperations()
@@ -133,77 +93,254 @@ class DataframeOverview:
         self.initialize_columns()
         
         
-    def fill_null_values(self):
+    def fill_null_values(self, dataframe=None):
+
+        """This function fills in null values in all columns.
 
-        "This function fills in null values in all columns."
+        Parameters
+        ----------
+        dataframe: pd.DataFrame, None
+            The DataFrame to fill. 'None' fills the DataFrame of the overview.
+        """
         
-        for column in list(self.dataframe.columns):
-            if self.dataframe[column].dtype == 'object':
-                self.dataframe[column].fillna("", inplace=True)
-            elif self.dataframe[column].dtype == 'int64' or self.dataframe[column].dtype == 'float64':
-                self.dataframe[column].fillna(0, inplace=True)
+        dataframe = dataframe if dataframe is not None else self.dataframe
+        for column in list(dataframe.columns):
+            if dataframe[column].dtype == 'object':
+                dataframe[column].fillna("", inplace=True)
+            elif dataframe[column].dtype == 'int64' or dataframe[column].dtype == 'float64':
+                dataframe[column].fillna(0, inplace=True)
             else:
                 pass
             
     def convert_date_time_columns(self):
 
-        "This function converts any columns that are of type 'object' with a 'Datetime' format into type 'Datetime'."
+        """This function converts any columns that are of type 'object' with a 'Datetime' format into type 'Datetime'.
+        Each conversion made is recorded in the 'column_conversions' of the DataFrame's attrs, so that any rows appended to the file later on
+        can be converted the same way (see 'convert_appended_rows')."""
         
         count = 0
+        conversions = {}
         for column in list(self.dataframe.columns):
              
             # 1). Checking to see if we convert to 'date' only (format=##/##/####, or something similar).
             if self.dt.main_converter(self.dataframe[column]) == 'Change_to_Date':
-                # If a 'format' can be found fill it in.
-                if self.dt.return_date_format(self.dataframe[column]) is not None:
-                    self.dataframe[column] = pd.to_datetime(self.dataframe[column], format=self.dt.return_date_format(self.dataframe[column]))
+                # If a 'format' can be found fill it in (the column was already parsed with it when the format was found).
+                date_format = self.dt.return_date_format(self.dataframe[column])
+                if date_format is not None:
+                    self.dataframe[column] = self.dt.parse_layout(self.dataframe[column])
                 # else if it can not be found, just convert without it. 
                 else:
                     self.dataframe[column] = pd.to_datetime(self.dataframe[column])
+                conversions[column] = ['date', date_format]
             
             # 2). Checking to see if we convert to 'time' only (format=##:##:##, or something similar).
             elif self.dt.main_converter(self.dataframe[column]) == 'Change_to_Time':
                 # Check to see if it is in a specific format. 
                 try:
                     self.dataframe[column] = pd.to_timedelta(self.dataframe[column].str.strip())
+                    conversions[column] = ['time', False]
                 # If not, add in the extra two '00's at the end. 
                 except ValueError as wrong_format: 
                     if str(wrong_format) == "expected hh:mm:ss format":
                         self.dataframe[column] = self.dataframe[column] + ':00'
                         self.dataframe[column] = pd.to_timedelta(self.dataframe[column].str.strip())
+                        conversions[column] = ['time', True]
                 except Exception as e:
                     print(str(e))
             
             # 3). Checking to see if we need to split 'date' and 'time' into two different columns. 
             elif self.dt.main_converter(self.dataframe[column]) == 'Split_&_Change_Date&Time':
                 self.dataframe = self.dt.split_date_time(self.dataframe, column, count)
+                if column not in self.dataframe.columns:
+                    conversions[column] = ['split', count]
                 count += 1
                 
             else:
                 pass
         
+        self.dataframe.attrs["column_conversions"] = conversions
+        # Any column parsed while its layout was checked, but not converted, is not kept.
+        self.dt.layout_cache.clear()
+        
         
     def initialize_columns(self): 
 
         """This function initializes all columns in the DataFrame by:
             - filling in all null values
             - converting any datetime columns.
+        Once every column has been given a data category, the DataFrame is compacted.
+        All steps are skipped if the DataFrame was loaded from a sidecar, as it has already been converted and compacted
+        (so any change to what the steps produce must bump 'support_file_cache.CACHE_VERSION').
         """
         
         count = 0
         self.column_attributes = {}
-        # Check for null values:
-        self.fill_null_values()
-        # Convert any date/time objects
-        self.convert_date_time_columns()
-        # Strip any leading or trailing spaces in the column names
-        self.dataframe.columns = self.dataframe.columns.str.strip() 
-
-        
-        for column in list(self.dataframe.columns):  
-            col_id = 'col_' + str(count)
-            self.column_attributes[col_id] = ColumnAttributes(self.dataframe[column])
-            count += 1
+        converted = self.dataframe.attrs.get("converted", False)
+        
+        with tracer.span("profile", "profile", rows=len(self.dataframe), columns=len(self.dataframe.columns), converted=converted), \
+             memory_monitor.stage("DataframeOverview", rows=len(self.dataframe), columns=len(self.dataframe.columns), converted=converted):
+            if converted is False:
+                # Check for null values:
+                with tracer.span("fill_null_values", "profile"):
+                    self.fill_null_values()
+                # Convert any date/time objects
+                with tracer.span("convert_date_time_columns", "profile"):
+                    self.convert_date_time_columns()
+                # Strip any leading or trailing spaces in the column names
+                self.dataframe.columns = self.dataframe.columns.str.strip() 
+
+            
+            # Every column is profiled at once, and each 'ColumnAttributes' is filled from its statistics.
+            self.column_statistics = StatisticsKernel.profile(self.dataframe)
+            for column in list(self.dataframe.columns):  
+                col_id = 'col_' + str(count)
+                self.column_attributes[col_id] = ColumnAttributes(self.dataframe[column], self.column_statistics[column])
+                count += 1
+            
+            if converted is False:
+                with tracer.span("compact_columns", "profile"):
+                    self.compact_columns()
+                with tracer.span("store_sidecar", "profile"):
+                    self.store_converted_dataframe()
+            
+            
+    def compact_columns(self):
+
+        """This function reduces the memory used by the DataFrame, once every column has been given a data category:
+            - 'Nominal'/'Nominal-Binary'/'Ordinal' columns with mostly repeated values are stored as a 'Categorical' (integer codes plus one copy of each value).
+            - numeric columns are downcast to the smallest data type that holds every value exactly.
+        """
+        
+        for column_instance in self.column_attributes.values():
+            column = column_instance.column_name
+            pd_series = self.dataframe[column]
+            
+            if column_instance.data_category in ['Nominal', 'Nominal-Binary', 'Ordinal']:
+                if len(pd_series) > 0 and column_instance.unique_values / len(pd_series) < self.categorical_ratio\
+                and not isinstance(pd_series.dtype, pd.CategoricalDtype):
+                    # The categories are kept in order of appearance, so the order of bars, slices and legend entries is unchanged.
+                    self.dataframe[column] = pd.Categorical(pd_series, categories=pd_series.dropna().unique())
+                    
+            elif pd.api.types.is_integer_dtype(pd_series):
+                self.dataframe[column] = pd.to_numeric(pd_series, downcast='integer')
+                
+            elif pd.api.types.is_float_dtype(pd_series) and pd_series.dtype != 'float32':
+                float32_series = pd_series.astype('float32')
+                # Only downcast if no value changes (most decimal values can't be stored exactly as a 'float32').
+                if float32_series.astype(pd_series.dtype).equals(pd_series):
+                    self.dataframe[column] = float32_series
+            
+            column_instance.column_data = self.dataframe[column]
+            
+            
+    def store_converted_dataframe(self):
+
+        """This function writes the converted DataFrame to a sidecar, if it was created from a file,
+        so that the next time the same file is opened, the conversion can be skipped."""
+        
+        source_path = self.dataframe.attrs.get("source_path")
+        if source_path is not None:
+            FileCache().store(source_path, self.dataframe, self.dataframe.attrs.get("source_columns"), self.dataframe.attrs.get("source_sheet"))
+        
+        self.dataframe.attrs["converted"] = True
+        
+        
+    @staticmethod
+    def dtype_kind(pd_series):
+
+        "This function returns the kind of data a column holds ('i'/'f' numeric, 'O' text, 'M' datetime, 'm' timedelta, 'b' boolean), looking through 'Categorical' columns."
+        
+        column_dtype = pd_series.dtype
+        if isinstance(column_dtype, pd.CategoricalDtype):
+            column_dtype = column_dtype.categories.dtype
+        return 'f' if column_dtype.kind in 'iuf' else column_dtype.kind
+        
+        
+    def appended_rows_dtypes(self, source_columns: list):
+
+        """This function returns the columns of the file that have to be read as text when reading rows appended to it,
+        i.e. every column that holds text in the DataFrame, or that was converted to a 'Date'/'Time' (see 'convert_appended_rows').
+
+        Parameters
+        ----------
+        source_columns: list
+            The names of the columns in the file, as they are in its header.
+        """
+        
+        conversions = self.dataframe.attrs.get("column_conversions", {})
+        text_columns = [column for column in self.dataframe.columns if self.dtype_kind(self.dataframe[column]) == 'O']
+        return {column: str for column in source_columns if column in conversions or str(column).strip() in text_columns}
+        
+        
+    def convert_appended_rows(self, new_dataframe):
+
+        """This function converts rows that were appended to the file after the DataFrame was loaded, the same way the DataFrame was converted
+        (null values filled and the same datetime conversions made), so that they can be appended to it without converting the whole DataFrame again.
+        'None' is returned if the rows can not be converted the same way (e.g. text in a numeric column, or a value that is not a date in a 'Date' column),
+        as converting the whole file would then give a different DataFrame, and so the whole file has to be loaded again.
+
+        Parameters
+        ----------
+        new_dataframe: pd.DataFrame
+            The rows appended to the file, read with the columns returned by 'appended_rows_dtypes' as text.
+        """
+        
+        conversions = self.dataframe.attrs.get("column_conversions")
+        if conversions is None:
+            return None
+        
+        self.fill_null_values(new_dataframe)
+        try:
+            for column, (conversion, detail) in conversions.items():
+                # An empty value means the whole column would no longer have been converted.
+                if column not in new_dataframe.columns or (new_dataframe[column] == "").any():
+                    return None
+                if conversion == 'date':
+                    new_dataframe[column] = pd.to_datetime(new_dataframe[column], format=detail)
+                elif conversion == 'time':
+                    time_series = new_dataframe[column] + ':00' if detail is True else new_dataframe[column]
+                    new_dataframe[column] = pd.to_timedelta(time_series.str.strip())
+                elif conversion == 'split':
+                    new_dataframe = self.dt.split_date_time(new_dataframe, column, detail)
+                    if column in new_dataframe.columns:
+                        return None
+        except Exception as e:
+            print(str(e))
+            return None
+        
+        new_dataframe.columns = new_dataframe.columns.str.strip()
+        if list(new_dataframe.columns) != list(self.dataframe.columns):
+            return None
+        
+        for column in self.dataframe.columns:
+            if len(new_dataframe) > 0 and self.dtype_kind(new_dataframe[column]) != self.dtype_kind(self.dataframe[column]):
+                return None
+        
+        return new_dataframe
+    
+    
+    def append_rows(self, new_dataframe):
+
+        """This function appends rows converted by 'convert_appended_rows' to the DataFrame.
+        'Categorical' columns keep their categories, and any new values are added as new categories (in order of appearance).
+
+        Parameters
+        ----------
+        new_dataframe: pd.DataFrame
+            The converted rows.
+        """
+        
+        for column in self.dataframe.columns:
+            if isinstance(self.dataframe[column].dtype, pd.CategoricalDtype):
+                categories = self.dataframe[column].cat.categories
+                new_categories = pd.Index(new_dataframe[column].dropna().unique()).difference(categories, sort=False)
+                if len(new_categories) > 0:
+                    self.dataframe[column] = self.dataframe[column].cat.add_categories(new_categories)
+                new_dataframe[column] = pd.Categorical(new_dataframe[column], categories=self.dataframe[column].cat.categories)
+        
+        attrs = self.dataframe.attrs
+        self.dataframe = pd.concat([self.dataframe, new_dataframe], ignore_index=True)
+        self.dataframe.attrs = attrs
             
             
     def print_attributes(self):
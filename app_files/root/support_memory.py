@@ -0,0 +1,342 @@
+"""root.support_memory
+A module dedicated towards accounting for the memory used by each stage of the pipeline (file load, 'DataframeOverview', each chart class,
+each chart created and the display page), so that dataset limits can be set and any memory work can be verified.
+The memory instrumentation mode is switched on with the 'AUTOGRAPHICA_MEMORY' environment variable, set to the path of the report
+(or to '1' for 'autographica_memory.json'). The report is written when the app (or script) exits, and names the top allocators.
+While the mode is switched off, every stage is the shared null span and every tracked function is left undecorated.
+"""
+
+import os
+import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
+import json
+import time
+import atexit
+import functools
+import threading
+import tracemalloc
+from support_tracing import NullSpan, tracer
+
+try:
+    import resource
+except ImportError:  # Windows has no 'resource' module, the peak RSS is then not reported.
+    resource = None
+
+
+class MemoryStage:
+
+    """
+    A class for instantiating a 'memory stage' object, which records the RSS and the tracemalloc peak of the code within a 'with' block.
+    Stages can be nested, the peak of a nested stage is also counted towards the stage it is nested in.
+
+    Attributes
+    ----------
+    monitor: support_memory.MemoryMonitor
+        The monitor the stage is recorded by.
+    record: dict
+        The measurements of the stage (name, arguments, RSS and traced memory before and after, traced peak).
+    """
+
+    def __init__(self, monitor, name: str, args: dict):
+        self.monitor = monitor
+        self.record = {"stage": name, "args": args}
+        self.peak_so_far = 0
+
+    def __enter__(self):
+        self.monitor.enter_stage(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.monitor.exit_stage(self)
+        return False
+
+    def set(self, **args):
+
+        "This function adds information to the stage once it is known (e.g. the number of charts created)."
+
+        self.record["args"].update(args)
+
+
+class MemoryMonitor:
+
+    """
+    A class for instantiating a 'memory monitor' object, which records the memory used by each stage of the pipeline and writes a report.
+    A single instance ('memory_monitor') is shared by the whole app.
+
+    Attributes
+    ----------
+    report_path: str, None
+        The path the report is written to. 'None' means that the memory instrumentation mode is switched off.
+    enabled: bool
+        Whether stages are recorded.
+    top_n: int
+        The number of top allocators named in the report.
+    stages: list
+        The record of every stage, in the order they finished.
+    figures: list
+        The record of every figure retained in a chart list (see 'record_figures').
+    high_water_snapshot: tracemalloc.Snapshot, None
+        A snapshot of the traced allocations taken the last time the traced memory reached a new high.
+    """
+
+    null_stage = NullSpan()
+
+    # The number of frames stored per allocation, so allocators can be grouped by the code in AutoGraphica that called them.
+    traceback_frames = 10
+
+    def __init__(self, report_path=None, top_n=20):
+
+        if report_path is None:
+            report_path = os.environ.get("AUTOGRAPHICA_MEMORY")
+        if report_path in ["", "0", "off"]:
+            report_path = None
+        elif report_path in ["1", "on"]:
+            report_path = os.path.abspath("autographica_memory.json")
+
+        self.report_path = report_path
+        self.enabled = report_path is not None
+        self.top_n = top_n
+        self.stages = []
+        self.figures = []
+        self.stage_stack = []
+        self.high_water = 0
+        self.high_water_stage = None
+        self.high_water_snapshot = None
+        self.retained_by_figure = {}
+        self.lock = threading.RLock()
+
+        if self.enabled is True:
+            tracemalloc.start(self.traceback_frames)
+            atexit.register(self.write_report)
+
+    @staticmethod
+    def current_rss():
+
+        "This function returns the current resident set size of the process in bytes (or 'None' if it can not be read on this platform)."
+
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    @staticmethod
+    def peak_rss():
+
+        "This function returns the peak resident set size of the process in bytes (or 'None' if it can not be read on this platform)."
+
+        if resource is None:
+            return None
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # 'ru_maxrss' is in bytes on macOS and in kilobytes everywhere else.
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    def stage(self, name: str, **args):
+
+        """This function returns a stage to be used as a context manager, or the shared null stage if the mode is switched off.
+
+        Parameters
+        ----------
+        name: str
+            The name of the stage (e.g. 'load', 'DataframeOverview').
+        args: dict
+            Any additional information stored alongside the stage.
+        """
+
+        if self.enabled is False:
+            return self.null_stage
+        return MemoryStage(self, name, args)
+
+    def tracked(self, name=None):
+
+        """This function returns a decorator which records a stage every time the decorated function is called.
+        If the function returns a Matplotlib figure, the memory it retains is remembered for 'record_figures'.
+        If the mode is switched off when the function is decorated, the function is returned as it is.
+
+        Parameters
+        ----------
+        name: str, None
+            The name of the stage. 'None' uses the qualified name of the function (e.g. 'MultiLineGraph.create_chart').
+        """
+
+        def decorator(function):
+            if self.enabled is False:
+                return function
+
+            stage_name = name if name is not None else function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.stage(stage_name, args=[str(arg)[:80] for arg in args[1:]]) as memory_stage:
+                    result = function(*args, **kwargs)
+                if any(cls.__name__ == "Figure" for cls in type(result).__mro__):
+                    self.retained_by_figure[id(result)] = memory_stage.record["retained_bytes"]
+                return result
+
+            return wrapper
+
+        return decorator
+
+    def enter_stage(self, memory_stage):
+
+        "This function records the memory at the start of a stage, and resets the traced peak so the stage's own peak can be measured."
+
+        with self.lock:
+            current, peak = tracemalloc.get_traced_memory()
+            # The peak reached so far by the enclosing stage is kept, before the peak is reset for this stage.
+            if len(self.stage_stack) > 0:
+                parent = self.stage_stack[-1]
+                parent.peak_so_far = max(parent.peak_so_far, peak)
+            tracemalloc.reset_peak()
+            memory_stage.peak_so_far = current
+            memory_stage.record.update({"start_s": time.perf_counter(),
+                                        "rss_before": self.current_rss(),
+                                        "traced_before": current})
+            self.stage_stack.append(memory_stage)
+
+    def exit_stage(self, memory_stage):
+
+        "This function records the memory at the end of a stage, and takes a snapshot if the traced memory reached a new high."
+
+        with self.lock:
+            current, peak = tracemalloc.get_traced_memory()
+            stage_peak = max(memory_stage.peak_so_far, peak)
+            if self.stage_stack and self.stage_stack[-1] is memory_stage:
+                self.stage_stack.pop()
+            if len(self.stage_stack) > 0:
+                parent = self.stage_stack[-1]
+                parent.peak_so_far = max(parent.peak_so_far, stage_peak)
+
+            record = memory_stage.record
+            record.update({"duration_s": time.perf_counter() - record.pop("start_s"),
+                           "rss_after": self.current_rss(),
+                           "peak_rss": self.peak_rss(),
+                           "traced_after": current,
+                           "traced_peak": stage_peak,
+                           "retained_bytes": current - record["traced_before"]})
+            self.stages.append(record)
+
+            if current > self.high_water:
+                self.high_water = current
+                self.high_water_stage = record["stage"]
+                self.high_water_snapshot = tracemalloc.take_snapshot()
+
+        tracer.counter("memory", "memory", rss_mb=(record["rss_after"] or 0) / 1048576, traced_mb=current / 1048576)
+
+    def record_figures(self, chart_list):
+
+        """This function records every figure retained in a chart list: the memory retained when it was created,
+        its number of axes and artists, and the size of the RGBA buffer it will be drawn into.
+
+        Parameters
+        ----------
+        chart_list: list, None
+            The list of Matplotlib figures created by 'plot_multiple_charts'/'plot_facet_chart'.
+        """
+
+        if self.enabled is False or chart_list is None:
+            return
+
+        for chart_index, figure in enumerate(chart_list):
+            width, height = figure.get_size_inches() * figure.dpi
+            self.figures.append({"chart_index": chart_index,
+                                 "axes": len(figure.axes),
+                                 "artists": sum(len(axes.get_children()) for axes in figure.axes),
+                                 "retained_bytes": self.retained_by_figure.get(id(figure)),
+                                 "rgba_buffer_bytes": int(width) * int(height) * 4})
+
+    def top_allocators(self, snapshot=None):
+
+        """This function returns the code locations that had allocated the most memory when the traced memory was at its highest.
+        Allocations are attributed to the innermost frame within AutoGraphica where possible, otherwise to the frame that allocated them.
+
+        Parameters
+        ----------
+        snapshot: tracemalloc.Snapshot, None
+            The snapshot to summarise. 'None' uses the high-water snapshot.
+        """
+
+        snapshot = snapshot if snapshot is not None else self.high_water_snapshot
+        if snapshot is None:
+            return []
+
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__),
+                                           tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                                           tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")])
+        app_dir = os.path.dirname(file_dir)
+        allocators = {}
+        for statistic in snapshot.statistics("traceback"):
+            # The frames are sorted from the oldest to the most recent call.
+            frames = list(statistic.traceback)
+            app_frames = [frame for frame in frames if frame.filename.startswith(app_dir)]
+            frame = app_frames[-1] if len(app_frames) > 0 else frames[-1]
+            location = f"{os.path.relpath(frame.filename, app_dir) if frame.filename.startswith(app_dir) else frame.filename}:{frame.lineno}"
+            allocator = allocators.setdefault(location, {"location": location, "size_bytes": 0, "count": 0, "allocated_in": frames[-1].filename})
+            allocator["size_bytes"] += statistic.size
+            allocator["count"] += statistic.count
+
+        return sorted(allocators.values(), key=lambda allocator: allocator["size_bytes"], reverse=True)[:self.top_n]
+
+    def report(self):
+
+        "This function returns the memory report as a dictionary."
+
+        with self.lock:
+            return {"peak_rss_bytes": self.peak_rss(),
+                    "traced_high_water_bytes": self.high_water,
+                    "traced_high_water_stage": self.high_water_stage,
+                    "stages": list(self.stages),
+                    "figures": list(self.figures),
+                    "top_allocators": self.top_allocators()}
+
+    def write_report(self, report_path=None):
+
+        """This function writes the memory report to a JSON file, prints a short summary to 'stderr' and returns the path of the report.
+
+        Parameters
+        ----------
+        report_path: str, None
+            The path of the report. 'None' uses the 'report_path' attribute.
+        """
+
+        report_path = report_path if report_path is not None else self.report_path
+        if report_path is None:
+            return None
+
+        report = self.report()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+            with open(report_path, "w") as report_file:
+                json.dump(report, report_file, indent=2)
+        except Exception as e:
+            print(str(e))
+            return None
+
+        megabyte = 1024 * 1024
+        print(f"=== AutoGraphica memory report ('{report_path}') ===", file=sys.stderr)
+        if report["peak_rss_bytes"] is not None:
+            print(f"peak RSS {report['peak_rss_bytes'] / megabyte:.1f} MB, traced high water {report['traced_high_water_bytes'] / megabyte:.1f} MB "
+                  f"(during '{report['traced_high_water_stage']}')", file=sys.stderr)
+        for stage in sorted(report["stages"], key=lambda stage: stage["traced_peak"], reverse=True)[:10]:
+            print(f"{stage['stage']:<45} peak {stage['traced_peak'] / megabyte:8.1f} MB   retained {stage['retained_bytes'] / megabyte:8.1f} MB", file=sys.stderr)
+        for allocator in report["top_allocators"][:10]:
+            print(f"{allocator['location']:<60} {allocator['size_bytes'] / megabyte:8.1f} MB in {allocator['count']} blocks", file=sys.stderr)
+
+        return report_path
+
+
+memory_monitor = MemoryMonitor()
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     demo_monitor = MemoryMonitor(report_path="demo_memory.json")
+
+#     with demo_monitor.stage("allocate", rows=1000000):
+#         values = list(range(1000000))
+#     demo_monitor.write_report()
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
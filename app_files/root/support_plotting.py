@@ -5,11 +5,12 @@ A module dedicated towards buffering or supporting different plotting operations
 import os
 import sys
 file_dir = os.path.dirname(__file__)
-sys.path.append(file_dir)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
 import warnings
 warnings.filterwarnings("ignore")
 
-import copy
+import numbers
 import pandas as pd
 import matplotlib
 import matplotlib.pyplot as plt
@@ -18,6 +19,7 @@ from matplotlib.lines import Line2D
 from matplotlib import patches
 import seaborn as sns
 from support_rcParams import RCParams
+from support_cardinality import CardinalityEstimator
 pd.options.mode.chained_assignment = None  # default='warn'
 
 
@@ -28,19 +30,12 @@ class Plotting:
     it will add additional methods and operations for plotting the actual charts.
     """
     
-    def set_plot_style(self, plot_style):
-        
-        if plot_style is not None:
-            plt.style.use(plot_style)
-        else:
-            pass
-    
-    
     def check_categorical_dtype(self, dataframe, column):
         
         """This function helps to avoid a 'TypeError' when using 'str' accessors. 
         We need to use a str accessor when checking the character length of a value for the x-axis rotation (str.len())
         To fully convert a column to an 'object' dtype, we actually need to convert it to 'str'.
+        A 'Categorical' column keeps its integer codes, and only its categories are converted to 'str'.
         
         Parameters
         ----------
@@ -49,7 +44,11 @@ class Plotting:
         column: str
             The name of the column of interest in the DataFrame."""
         
-        if dataframe[column].dtype != 'object':
+        if isinstance(dataframe[column].dtype, pd.CategoricalDtype):
+            if dataframe[column].cat.categories.dtype != 'object':
+                dataframe[column] = dataframe[column].cat.rename_categories([str(category) for category in dataframe[column].cat.categories])
+                
+        elif dataframe[column].dtype != 'object':
             # We need to convert to 'str' for it to fully convert the values in the series to 'object'. 
             dataframe[column] = dataframe[column].astype('str')
         
@@ -68,10 +67,34 @@ class Plotting:
             The threshold value after which the number of unique values should be considered too cardinal to plot.
         """
         
-        if len(pd_series.unique()) <= thresh_val:
+        # The count stops as soon as it's above 'thresh_val', so an ID-like column doesn't need to be scanned in full.
+        if CardinalityEstimator.exceeds(pd_series, thresh_val) is False:
             return True
         else:
             return False
+
+
+    def category_order(self, pd_series):
+
+        """This function returns the categories of a Series in the order seaborn draws them along a categorical axis, without any null values:
+            - the categories of a 'Categorical' Series, in their order.
+            - every unique value in the order it first appears (or sorted, if every value is a number).
+        Passing this order to seaborn lets a chart be drawn from aggregated data (one row per bar) exactly as it would be from every row.
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            The Series of interest in the DataFrame.
+        """
+
+        if isinstance(pd_series.dtype, pd.CategoricalDtype):
+            order = list(pd_series.cat.categories)
+        else:
+            order = list(pd_series.unique())
+            if all(isinstance(value, numbers.Number) for value in order):
+                order = sorted(value for value in order if pd.notnull(value))
+
+        return [value for value in order if pd.notnull(value)]
         
         
         
@@ -348,13 +371,8 @@ class Plotting:
             The value upon which to move the legend out in relation to the figure.
         """
         
-        if pd_series.dtype != 'object':
-            pd_series_copy = copy.copy(pd_series)
-            pd_series_copy = pd_series_copy.astype('str')
-        else:
-            pd_series_copy = copy.copy(pd_series)
-            
-        max_length = max(pd_series_copy.str.len())
+        # Only the unique values need their length checked, so there is no need to copy (or convert) the whole series.
+        max_length = max(len(str(value)) for value in pd_series.unique())
                 
         if space_legend_out_ is not None and space_legend_out_ <= 1.0:
             
@@ -487,14 +505,14 @@ class Plotting:
             return None
     
     
-    def explode_slice(self, pd_series, chosen_slice):
+    def explode_slice(self, percentages, chosen_slice):
 
         """This function allows the user the option to explode either the 'largest' or 'smallest' slice in the Pie Chart.
 
         Parameters
         ----------
-        pd_series: pd.Series
-            The Series of interest within the DataFrame. 
+        percentages: list
+            The percentage of each slice in the Pie Chart (see 'create_percentage_data').
         chosen_slice: str
             The slice selected ('largest', 'smallest') that the user wishes to explode.
         """
@@ -502,8 +520,7 @@ class Plotting:
         if chosen_slice == "none" or chosen_slice is None:
             return None
 
-        data = self.create_percentage_data(pd_series)[0]
-        data.sort(reverse=True)
+        data = sorted(percentages, reverse=True)
         explode_list = [0] * len(data)
 
         if chosen_slice == 'smallest':
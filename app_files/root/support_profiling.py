@@ -0,0 +1,209 @@
+"""root.support_profiling
+A module dedicated towards capturing a reproducible profile of each chart created, so a single pathologically slow chart can be investigated on its own.
+The per-chart profiling mode wraps every 'create' method of each 'plot_*' class in cProfile (a deterministic profiler, i.e. every call is counted),
+and dumps a pstats file per chart, named after the chart type and its (x, y, z) variables.
+When the app (or script) exits, an aggregated top-N summary across every chart profiled is written alongside them.
+The mode is switched on with the 'AUTOGRAPHICA_PROFILE' environment variable, set to the output directory (or to '1' for 'autographica_profiles'),
+or by running the app with '--profile-charts'. Run this module as a script to summarise a directory of pstats files.
+"""
+
+import os
+import re
+import sys
+import time
+import atexit
+import pstats
+import argparse
+import cProfile
+import functools
+import threading
+
+
+class ChartProfiler:
+
+    """
+    A class for instantiating a 'chart profiler' object, which profiles each chart created and writes a pstats file per chart.
+    A single instance ('chart_profiler') is shared by the whole app.
+
+    Attributes
+    ----------
+    output_dir: str, None
+        The directory the pstats files and the summary are written to. 'None' means that the per-chart profiling mode is switched off.
+    enabled: bool
+        Whether charts are profiled.
+    top_n: int
+        The number of functions listed in the aggregated summary.
+    chart_timings: list
+        The name, pstats file and wall time of every chart profiled.
+    aggregated_stats: pstats.Stats, None
+        The statistics of every chart profiled, added together.
+    """
+
+    def __init__(self, output_dir=None, top_n=30):
+
+        if output_dir is None:
+            output_dir = os.environ.get("AUTOGRAPHICA_PROFILE")
+        if output_dir in ["", "0", "off"]:
+            output_dir = None
+        elif output_dir in ["1", "on"]:
+            output_dir = os.path.abspath("autographica_profiles")
+
+        self.output_dir = output_dir
+        self.enabled = output_dir is not None
+        self.top_n = top_n
+        self.chart_timings = []
+        self.aggregated_stats = None
+        self.file_names = set()
+        self.active = False
+        self.lock = threading.Lock()
+
+        if self.enabled is True:
+            os.makedirs(self.output_dir, exist_ok=True)
+            atexit.register(self.write_summary)
+
+    @staticmethod
+    def profile_name(chart_type: str, variables: list):
+
+        """This function creates the name of a chart's pstats file from its chart type and variables (e.g. 'MultiLine__Date__Price__Region').
+        Any characters that are not valid in a file name are replaced with an underscore.
+
+        Parameters
+        ----------
+        chart_type: str
+            The chart type (Line, Scatter, Bar, etc.)
+        variables: list
+            The (x, y, z) variables the chart was created from.
+        """
+
+        parts = [str(chart_type)] + [str(variable) for variable in variables if variable is not None and not isinstance(variable, bool)]
+        return re.sub(r"[^A-Za-z0-9_\-.]+", "_", "__".join(parts))[:150]
+
+    def unique_file_name(self, name: str):
+
+        "This function returns a pstats file name which has not been used yet in this run, by numbering any repeated charts."
+
+        file_name = f"{name}.pstats"
+        repeat = 2
+        while file_name in self.file_names:
+            file_name = f"{name}__{repeat}.pstats"
+            repeat += 1
+        self.file_names.add(file_name)
+        return file_name
+
+    def profiled(self):
+
+        """This function returns a decorator which profiles every call of a chart's 'create' method and dumps its pstats file.
+        Only the outermost call is profiled if a profiled method calls another. If the mode is switched off when the method is decorated,
+        the method is returned as it is.
+        """
+
+        def decorator(function):
+            if self.enabled is False:
+                return function
+
+            @functools.wraps(function)
+            def wrapper(chart_instance, *args, **kwargs):
+                with self.lock:
+                    if self.active is True:
+                        nested = True
+                    else:
+                        nested = False
+                        self.active = True
+                if nested is True:
+                    return function(chart_instance, *args, **kwargs)
+
+                profile = cProfile.Profile()
+                start = time.perf_counter()
+                try:
+                    return profile.runcall(function, chart_instance, *args, **kwargs)
+                finally:
+                    wall_s = time.perf_counter() - start
+                    self.active = False
+                    name = self.profile_name(getattr(chart_instance, "chart_type", type(chart_instance).__name__), list(args) + list(kwargs.values()))
+                    self.store_profile(profile, name, wall_s)
+
+            return wrapper
+
+        return decorator
+
+    def store_profile(self, profile, name: str, wall_s: float):
+
+        """This function dumps the profile of a single chart to its pstats file, and adds it to the aggregated statistics.
+
+        Parameters
+        ----------
+        profile: cProfile.Profile
+            The profile of the chart.
+        name: str
+            The name of the chart (see 'profile_name').
+        wall_s: float
+            The time the chart took to create, in seconds.
+        """
+
+        with self.lock:
+            file_name = self.unique_file_name(name)
+            profile_path = os.path.join(self.output_dir, file_name)
+            try:
+                profile.dump_stats(profile_path)
+                if self.aggregated_stats is None:
+                    self.aggregated_stats = pstats.Stats(profile)
+                else:
+                    self.aggregated_stats.add(profile)
+            except Exception as e:
+                print(str(e))
+                return
+            self.chart_timings.append({"chart": name, "pstats": file_name, "wall_s": wall_s})
+
+    def write_summary(self, summary_path=None):
+
+        """This function writes the aggregated top-N summary of every chart profiled (slowest charts, then the functions with the highest cumulative time)
+        along with the aggregated pstats file, and returns the path of the summary.
+
+        Parameters
+        ----------
+        summary_path: str, None
+            The path of the summary. 'None' writes 'summary.txt' to the output directory.
+        """
+
+        if self.enabled is False or self.aggregated_stats is None:
+            return None
+
+        summary_path = summary_path if summary_path is not None else os.path.join(self.output_dir, "summary.txt")
+        with self.lock:
+            try:
+                self.aggregated_stats.dump_stats(os.path.join(self.output_dir, "all_charts.pstats"))
+                with open(summary_path, "w") as summary_file:
+                    summary_file.write(f"=== {len(self.chart_timings)} chart(s) profiled, slowest first ===\n")
+                    for chart_timing in sorted(self.chart_timings, key=lambda chart_timing: chart_timing["wall_s"], reverse=True):
+                        summary_file.write(f"{chart_timing['wall_s']:9.3f}s  {chart_timing['pstats']}\n")
+                    summary_file.write(f"\n=== Top {self.top_n} functions by cumulative time across every chart ===\n")
+                    self.aggregated_stats.stream = summary_file
+                    self.aggregated_stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+            except Exception as e:
+                print(str(e))
+                return None
+
+        print(f"Chart profiles written to '{self.output_dir}' (summary: '{summary_path}')", file=sys.stderr)
+        return summary_path
+
+
+chart_profiler = ChartProfiler()
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Summarise the pstats files written by AutoGraphica's per-chart profiling mode.")
+    parser.add_argument("directory", help="the directory of pstats files")
+    parser.add_argument("--chart", default=None, help="only include the pstats files whose name contains this text (e.g. 'MultiLine')")
+    parser.add_argument("--top", type=int, default=30, help="the number of functions listed")
+    parser.add_argument("--sort", default="cumulative", choices=["cumulative", "tottime", "calls"])
+    args = parser.parse_args()
+
+    profile_paths = sorted(os.path.join(args.directory, file_name) for file_name in os.listdir(args.directory)
+                           if file_name.endswith(".pstats") and file_name != "all_charts.pstats"
+                           and (args.chart is None or args.chart in file_name))
+    if len(profile_paths) == 0:
+        print(f"No pstats files found in '{args.directory}'")
+    else:
+        print(f"{len(profile_paths)} pstats file(s)")
+        pstats.Stats(*profile_paths).sort_stats(args.sort).print_stats(args.top)
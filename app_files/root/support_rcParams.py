@@ -1,22 +1,46 @@
 """root.support_rcParams
 A module containing the default pre-set rcparams when plotting the different charts.
+The rcParams of each style (the defaults below, with those of the style sheet on top) are compiled into a dictionary once, and only applied
+while a chart is being created (see 'RCParams.style_context'). The global rcParams are never changed, so a style chosen for one chart type
+no longer carries over to the next, and charts of different styles can be created from several threads.
+The chart data of a chart is aggregated before its style context is entered (see 'RCParams.styled'), so only the draw stage holds the lock
+(including any statistics seaborn calculates while it draws, e.g. error bars), and the data stage of charts created from several threads runs in parallel.
+Some rcParams are only read once a chart is drawn (e.g. the size of the tick labels, which the number of ticks is chosen from), so each figure
+is a 'StyledFigure', which is also drawn within the style context it was created in.
 """
 
+import inspect
+import functools
+import threading
+import contextlib
+import matplotlib
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.style.core import STYLE_BLACKLIST
 
 class RCParams:
 
     """
     A class establishing some basic rcParams universal to all plots.
-    
+
     Attributes
     ----------
     style_list: list
         A list of all matplotlib styles applicable to the plots.
     """
-    
+
+    default_rcParams = {'axes.labelpad': 15.0,
+                        'axes.labelsize': 'large',
+                        'axes.labelweight': 'heavy',  # light, normal, regular, semibold, demibold, demi, bold, heavy, extra bold, etc.
+                        'axes.grid': True,
+                        'grid.alpha': 0.4,
+                        'grid.linewidth': 0.5,
+                        'figure.dpi': 170}
+
+    # The rcParams of pyplot are shared by every thread, so only one chart is created (or drawn) within a style context at a time.
+    lock = threading.RLock()
+
     def __init__(self):
-        self.initialize_rcParams()
         self.style_list = ['Solarize_Light2',
                            '_classic_test_patch',
                            'bmh',
@@ -44,20 +68,90 @@ class RCParams:
                            'seaborn-whitegrid',
                            'tableau-colorblind10']
 
-        
-    def initialize_rcParams(self):
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def compile_style(current_style):
+
+        """This function returns the rcParams a chart of a style is created with: the default rcParams, with those of the style sheet on top.
+        Each style is only compiled the first time it is used.
+
+        Parameters
+        ----------
+        current_style: str, None
+            The current Matplotlib style for all plots. 'None' only applies the default rcParams.
+        """
+
+        style_rcParams = dict(RCParams.default_rcParams)
+        if current_style is not None:
+            # Since Matplotlib 3.6 the 'seaborn' style sheets are named 'seaborn-v0_8'.
+            style_name = current_style if current_style in plt.style.library else current_style.replace('seaborn', 'seaborn-v0_8', 1)
+            style_rcParams.update({key: value for key, value in plt.style.library[style_name].items() if key not in STYLE_BLACKLIST})
+        return style_rcParams
+
+    @classmethod
+    @contextlib.contextmanager
+    def style_context(cls, current_style):
+
+        """This function returns a context manager within which charts are created (and drawn) with the rcParams of a style.
+        The global rcParams are restored once it exits.
+
+        Parameters
+        ----------
+        current_style: str, None
+            The current Matplotlib style for all plots.
+        """
+
+        with cls.lock, matplotlib.rc_context(cls.compile_style(current_style)):
+            yield
+
+    @staticmethod
+    def styled(function=None, chart_data=None):
 
-        plt.rcParams['axes.labelpad'] = 15.0
-        plt.rcParams['axes.labelsize'] = 'large'
-        plt.rcParams['axes.labelweight'] = 'heavy'  # light, normal, regular, semibold, demibold, demi, bold, heavy, extra bold, etc.
+        """This function decorates a chart's 'create' method, so the chart is created within the style context of the chart instance's 'current_style'.
+        Used with 'chart_data', the chart data is aggregated (see 'DataStage.get_chart_data') before the style context (and its lock) is entered,
+        and the create method then finds it already cached.
 
-        plt.rcParams['axes.grid'] = True
-        plt.rcParams['grid.alpha'] = 0.4
-        plt.rcParams['grid.linewidth'] = 0.5
-        
-        plt.rcParams['figure.dpi'] = 170
+        Parameters
+        ----------
+        function: function, None
+            The create method, when the decorator is used without 'chart_data'.
+        chart_data: tuple, None
+            The name of the chart's data method, followed by the names of the create method's arguments it's called with
+            (e.g. ('x_axis_chart_data', 'x_axis_var', 'time_var')).
+        """
+
+        def decorator(function):
+            signature = inspect.signature(function)
+
+            @functools.wraps(function)
+            def wrapper(chart_instance, *args, **kwargs):
+                if chart_data is not None and getattr(chart_instance, "data_stage", None) is not None:
+                    arguments = signature.bind(chart_instance, *args, **kwargs)
+                    arguments.apply_defaults()
+                    chart_instance.data_stage.get_chart_data(getattr(chart_instance, chart_data[0]), *[arguments.arguments[name] for name in chart_data[1:]])
+                with chart_instance.rcparams.style_context(chart_instance.current_style):
+                    return function(chart_instance, *args, **kwargs)
+            return wrapper
+
+        return decorator(function) if function is not None else decorator
+
+
+class StyledFigure(Figure):
+
+    """
+    A class for instantiating a Matplotlib figure which is drawn within the style context of the style it was created with
+    (e.g. when the display resizes it), rather than with the global rcParams. Figures are built as one with 'plt.subplots(FigureClass=StyledFigure)'.
+
+    Attributes
+    ----------
+    current_style: str, None
+        The Matplotlib style the figure was created with.
+    """
 
+    def __init__(self, *args, current_style=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.current_style = current_style
 
-        
-    def change_style(self, current_style):
-        plt.style.use(current_style)
+    def draw(self, renderer):
+        with RCParams.style_context(self.current_style):
+            super().draw(renderer)
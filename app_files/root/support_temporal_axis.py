@@ -0,0 +1,125 @@
+"""root.support_temporal_axis
+A module dedicated towards preparing the 'Date' and 'Time' columns plotted along an axis (by the Line and Multi-Line Graphs), so that a chart along
+a time axis costs the same as one along a numeric axis:
+    - a 'Time' column is converted to hours in one vectorized lookup, rather than a Python call per row.
+    - the extents of the column are found once, and the tick locator is chosen from them (days, months or years between ticks),
+      rather than scanning the column for every chart.
+A 'TemporalAxis' is built once per 'x-axis' column, and shared by every chart along it through the data stage (see 'support_chart_data').
+"""
+
+import os
+import sys
+file_dir = os.path.dirname(__file__)
+if file_dir not in sys.path:
+    sys.path.append(file_dir)
+
+import math
+import functools
+import numpy as np
+import pandas as pd
+import matplotlib.ticker as ticker
+from matplotlib.dates import DayLocator, MonthLocator, YearLocator
+
+
+class TemporalAxis:
+
+    """
+    A class for instantiating a 'temporal axis' object, which holds the values a 'Date' or 'Time' column is plotted as, and its extents.
+
+    Attributes
+    ----------
+    column_name: str
+        The name of the column.
+    is_time: bool
+        Whether the column is a 'Time' column (timedelta), which is plotted in hours, rather than a 'Date' column (datetime).
+    values: pd.Series
+        The values plotted: the column in hours for a 'Time' column, otherwise the column itself.
+    tick_values: pd.Series
+        The unique values along the axis, which the rotation of the ticks is chosen from.
+    minimum: pd.Timestamp, float
+        The earliest date (or the lowest number of hours).
+    maximum: pd.Timestamp, float
+        The latest date (or the highest number of hours).
+    """
+
+    __slots__ = ("column_name", "is_time", "values", "tick_values", "minimum", "maximum")
+
+    # The number of major ticks the locator aims to fit along the axis.
+    optimal_tick_no = 20
+
+    def __init__(self, pd_series: pd.Series):
+        self.column_name = pd_series.name
+        self.is_time = pd.api.types.is_timedelta64_dtype(pd_series)
+        self.values = self.timedelta_hours(pd_series) if self.is_time is True else pd_series
+        self.tick_values = pd.Series(self.values.unique())
+        self.minimum = self.values.min()
+        self.maximum = self.values.max()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def hour_table():
+
+        """This function returns the number of hours (rounded to 2 decimal places) of every second of the day, in the same way as
+        'DateTimeOperations.convert_timedelta', so a 'Time' column is converted with a single lookup. It's only built the first time it's needed."""
+
+        return np.array([round(((seconds / 60) / 60), 2) for seconds in range(0, 24 * 60 * 60)])
+
+    @classmethod
+    def timedelta_hours(cls, pd_series: pd.Series):
+
+        """This function converts a 'Time' column to hours (the seconds component only, as 'dt.seconds' does). Any missing time stays missing.
+
+        Parameters
+        ----------
+        pd_series: pd.Series
+            A pandas 'Timedelta' series.
+        """
+
+        seconds = pd_series.dt.seconds
+        missing = seconds.isna().to_numpy()
+        hours = np.full(len(seconds), np.nan)
+        hours[~missing] = cls.hour_table()[seconds.to_numpy()[~missing].astype(np.int64)]
+        return pd.Series(hours, index=pd_series.index, name=pd_series.name)
+
+    def span_days(self):
+
+        "This function returns the number of whole days between the earliest and the latest date (0 if the column has no dates)."
+
+        if pd.isna(self.minimum) or pd.isna(self.maximum):
+            return 0
+        return int((self.maximum - self.minimum).days)
+
+    def locator_interval(self):
+
+        "This function returns the number of days between ticks, so that around 'optimal_tick_no' major ticks fit along the axis (1 tick per day for a shorter range)."
+
+        span_days = self.span_days()
+        if span_days >= self.optimal_tick_no:
+            return math.ceil(span_days / self.optimal_tick_no)
+        return max(span_days, 1)
+
+    def locator(self):
+
+        """This function returns a new tick locator for the axis. A 'Time' axis is given 'optimal_tick_no' bins, and a 'Date' axis a tick every
+        few days, months or years, whichever keeps around 'optimal_tick_no' major ticks along it."""
+
+        if self.is_time is True:
+            return ticker.MaxNLocator(nbins=self.optimal_tick_no)
+
+        interval = self.locator_interval()
+        if interval <= 31:
+            return DayLocator(interval=interval)
+
+        span_months = (self.maximum.year - self.minimum.year) * 12 + (self.maximum.month - self.minimum.month)
+        if span_months <= 12 * self.optimal_tick_no:
+            return MonthLocator(interval=math.ceil(span_months / self.optimal_tick_no))
+        return YearLocator(base=math.ceil((self.maximum.year - self.minimum.year) / self.optimal_tick_no))
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     dates = pd.Series(pd.date_range("2015-01-01", "2024-12-31", freq="D"), name="Date")
+#     times = pd.Series(pd.to_timedelta(np.arange(0, 86400, 60), unit="s"), name="Time")
+#     print(TemporalAxis(dates).locator(), TemporalAxis(times).values.head())
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
@@ -0,0 +1,295 @@
+"""root.support_tracing
+A module dedicated towards tracing where the time goes while the app loads a file and creates its charts.
+Named spans (and counters) are recorded around the hot paths (load, profile, per-column inference, chart creation, tight_layout, draw,
+texture upload and PNG encode) and exported as a Chrome trace, which can be opened in 'chrome://tracing' or 'https://ui.perfetto.dev'.
+Tracing is switched on with the 'AUTOGRAPHICA_TRACE' environment variable, set to the path of the trace file (or to '1' for 'autographica_trace.json').
+When tracing is switched off, every span is a shared no-op object and every traced function is left undecorated.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import functools
+
+
+class NullSpan:
+
+    """
+    A class for instantiating a 'null span' object, which is returned instead of a 'Span' while tracing is switched off, so that it costs next to nothing.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **args):
+
+        "This function does nothing, as the span is not recorded."
+
+        pass
+
+
+class Span:
+
+    """
+    A class for instantiating a 'span' object, which records the time spent within a 'with' block as a Chrome trace 'complete' event.
+
+    Attributes
+    ----------
+    tracer: support_tracing.Tracer
+        The tracer the span is recorded by.
+    name: str
+        The name of the span (e.g. 'load', 'tight_layout').
+    category: str
+        The category of the span (e.g. 'file', 'chart', 'display').
+    args: dict
+        Any additional information shown alongside the span in the trace viewer.
+    """
+
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name: str, category: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc_value}"
+        self.tracer.record({"name": self.name,
+                            "cat": self.category,
+                            "ph": "X",
+                            "ts": self.tracer.timestamp(self.start),
+                            "dur": (end - self.start) * 1e6,
+                            "pid": self.tracer.pid,
+                            "tid": threading.get_ident(),
+                            "args": self.args})
+        return False
+
+    def set(self, **args):
+
+        "This function adds information to the span once it is known (e.g. the number of charts created)."
+
+        self.args.update(args)
+
+
+class Tracer:
+
+    """
+    A class for instantiating a 'tracer' object, which records spans, counters and instant events, and exports them as a Chrome trace.
+    A single instance ('tracer') is shared by the whole app.
+
+    Attributes
+    ----------
+    trace_path: str, None
+        The path the trace is exported to. 'None' means that tracing is switched off.
+    enabled: bool
+        Whether spans, counters and instant events are recorded.
+    max_events: int
+        The maximum number of events kept in memory, any further events are dropped (and counted).
+    events: list
+        The recorded events, in the Chrome trace event format.
+    dropped_events: int
+        The number of events dropped once 'max_events' was reached.
+    """
+
+    null_span = NullSpan()
+
+    def __init__(self, trace_path=None, max_events=1000000):
+
+        if trace_path is None:
+            trace_path = os.environ.get("AUTOGRAPHICA_TRACE")
+        if trace_path in ["", "0", "off"]:
+            trace_path = None
+        elif trace_path in ["1", "on"]:
+            trace_path = os.path.abspath("autographica_trace.json")
+
+        self.trace_path = trace_path
+        self.enabled = trace_path is not None
+        self.max_events = max_events
+        self.events = []
+        self.dropped_events = 0
+        self.pid = os.getpid()
+        self.origin = time.perf_counter()
+        self.lock = threading.Lock()
+
+        if self.enabled is True:
+            atexit.register(self.export)
+
+    def timestamp(self, perf_counter_value: float):
+
+        "This function converts a 'time.perf_counter' value to the microseconds since the tracer was created."
+
+        return (perf_counter_value - self.origin) * 1e6
+
+    def record(self, event: dict):
+
+        "This function stores a single event, unless 'max_events' has been reached."
+
+        with self.lock:
+            if len(self.events) < self.max_events:
+                self.events.append(event)
+            else:
+                self.dropped_events += 1
+
+    def span(self, name: str, category="app", **args):
+
+        """This function returns a span to be used as a context manager, or the shared null span if tracing is switched off.
+
+        Parameters
+        ----------
+        name: str
+            The name of the span.
+        category: str
+            The category of the span.
+        args: dict
+            Any additional information shown alongside the span.
+        """
+
+        if self.enabled is False:
+            return self.null_span
+        return Span(self, name, category, args)
+
+    def counter(self, name: str, category="app", **values):
+
+        """This function records the current value of one or more counters (e.g. counter('charts', created=12)).
+
+        Parameters
+        ----------
+        name: str
+            The name of the counter track.
+        category: str
+            The category of the counter.
+        values: dict
+            The value of each series of the counter.
+        """
+
+        if self.enabled is False:
+            return
+        self.record({"name": name, "cat": category, "ph": "C", "ts": self.timestamp(time.perf_counter()),
+                     "pid": self.pid, "tid": threading.get_ident(), "args": values})
+
+    def instant(self, name: str, category="app", **args):
+
+        """This function records a single point in time (e.g. an error or a cache hit).
+
+        Parameters
+        ----------
+        name: str
+            The name of the event.
+        category: str
+            The category of the event.
+        args: dict
+            Any additional information shown alongside the event.
+        """
+
+        if self.enabled is False:
+            return
+        self.record({"name": name, "cat": category, "ph": "i", "s": "t", "ts": self.timestamp(time.perf_counter()),
+                     "pid": self.pid, "tid": threading.get_ident(), "args": args})
+
+    def error(self, function_name: str, exception: Exception):
+
+        """This function reports an exception that was handled by a function, both as an instant event in the trace and on 'stderr'.
+
+        Parameters
+        ----------
+        function_name: str
+            The name of the function that handled the exception.
+        exception: Exception
+            The exception that was handled.
+        """
+
+        self.instant("error", "error", function=function_name, error=str(exception))
+        print(f"Error for '{function_name}' function: {exception}", file=sys.stderr)
+
+    def traced(self, name=None, category="app"):
+
+        """This function returns a decorator which records a span every time the decorated function is called.
+        If tracing is switched off when the function is decorated, the function is returned as it is, so that it costs nothing.
+
+        Parameters
+        ----------
+        name: str, None
+            The name of the span. 'None' uses the qualified name of the function (e.g. 'BarChart.create_single_axes_chart').
+        category: str
+            The category of the span.
+        """
+
+        def decorator(function):
+            if self.enabled is False:
+                return function
+
+            span_name = name if name is not None else function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                # The arguments (skipping 'self') are recorded, so each chart's span shows the variables it was created from.
+                with self.span(span_name, category, args=[str(arg)[:80] for arg in args[1:]]):
+                    return function(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def export(self, trace_path=None):
+
+        """This function writes every recorded event to a Chrome trace (JSON) file and returns its path.
+
+        Parameters
+        ----------
+        trace_path: str, None
+            The path of the trace file. 'None' uses the 'trace_path' attribute.
+        """
+
+        trace_path = trace_path if trace_path is not None else self.trace_path
+        if trace_path is None:
+            return None
+
+        with self.lock:
+            events = list(self.events)
+            dropped_events = self.dropped_events
+
+        # Name the process and threads, so the trace viewer shows readable track names.
+        metadata = [{"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": "AutoGraphica"}}]
+        for thread in threading.enumerate():
+            metadata.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": thread.ident, "args": {"name": thread.name}})
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(trace_path)), exist_ok=True)
+            with open(trace_path, "w") as trace_file:
+                json.dump({"traceEvents": metadata + events,
+                           "displayTimeUnit": "ms",
+                           "otherData": {"dropped_events": dropped_events}}, trace_file)
+        except Exception as e:
+            print(str(e))
+            return None
+
+        return trace_path
+
+
+tracer = Tracer()
+
+
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
+# if __name__ == "__main__":
+
+#     demo_tracer = Tracer(trace_path="demo_trace.json")
+
+#     with demo_tracer.span("load", "file", path="demo.csv"):
+#         time.sleep(0.1)
+#     demo_tracer.counter("charts", created=3)
+#     demo_tracer.export()
+#%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%%#
@@ -0,0 +1,441 @@
+"""benchmarks.bench_components
+A micro-benchmark suite, which times each of the hot components of AutoGraphica on its own
+(file loading, profiling, each date/time detector, facet partitioning, the plotting helpers and each chart's create method),
+over a matrix of synthetic datasets (see 'synthetic_data.SyntheticDataset').
+Results are written as JSON, so that scaling curves (time vs rows, time vs columns) can be tracked,
+and a previous result file can be passed with '--compare' to flag any regressions.
+
+Example
+-------
+python benchmarks/bench_components.py --rows 1000 10000 100000 --columns 9 45 --output components.json
+python benchmarks/bench_components.py --rows 10000 --compare components.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+
+file_dir = os.path.dirname(os.path.abspath(__file__))
+app_dir = os.path.join(os.path.dirname(file_dir), "app_files")
+for path in [file_dir, app_dir, os.path.join(app_dir, "root")]:
+    if path not in sys.path:
+        sys.path.append(path)
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from synthetic_data import SyntheticDataset
+from instantiation_file_controller import FileController
+from instantiation_create_chart_instance import CreateChartInstance
+from support_main_classes import ColumnAttributes, DataframeOverview
+from support_date_time_operations import DateTimeOperations
+from support_facets import Facets
+from support_plotting import Plotting
+
+
+class FirstChartCall(Exception):
+
+    "Raised to stop 'plot_multiple_charts' once the arguments of its first chart have been recorded."
+
+    pass
+
+
+class ComponentBenchmarks:
+
+    """
+    A class for instantiating a 'component benchmarks' object, which times every component on a single synthetic dataset.
+
+    Attributes
+    ----------
+    dataset: synthetic_data.SyntheticDataset
+        The synthetic dataset the components are timed on.
+    data_dir: str
+        The directory the synthetic csv file (and its sidecar cache) is written to.
+    repeat: int
+        The number of times each component is timed.
+    groups: list, None
+        The groups of components to time ('file', 'profiling', 'datetime', 'facets', 'plotting', 'charts'). 'None' times every group.
+    results: list
+        A list of dictionaries, one per component timed.
+    """
+
+    # The create methods of each chart type, the first chart of 'plot_multiple_charts' is recorded and timed.
+    chart_create_methods = {'Line': ['create_chart'],
+                            'Scatter': ['create_chart'],
+                            'Bar': ['create_single_axes_chart', 'create_double_axes_chart'],
+                            'Box': ['create_chart'],
+                            'Pie': ['create_chart'],
+                            'Histogram': ['create_chart'],
+                            'MultiLine': ['create_chart'],
+                            'MultiScatter': ['create_chart'],
+                            'MultiBar': ['create_single_chart', 'create_multi_chart'],
+                            'Facet': ['plot_facet_chart']}
+
+    # The number of chart parameters each chart type expects (all left as 'None', i.e. the defaults).
+    chart_parameter_counts = {'Line': 8, 'Scatter': 6, 'Bar': 7, 'Box': 9, 'Pie': 8,
+                              'Histogram': 7, 'MultiLine': 7, 'MultiScatter': 7, 'MultiBar': 8, 'Facet': 8}
+
+    def __init__(self, dataset: SyntheticDataset, data_dir: str, repeat=3, groups=None):
+
+        self.dataset = dataset
+        self.data_dir = data_dir
+        self.repeat = repeat
+        self.groups = groups
+        self.results = []
+
+        # Keep the sidecars of the benchmark away from the user's cache.
+        os.environ["AUTOGRAPHICA_CACHE_DIR"] = os.path.join(self.data_dir, "cache")
+        self.file_path = self.dataset.write_file(self.data_dir)
+        self.raw_dataframe = pd.read_csv(self.file_path)
+        self.overview = DataframeOverview(self.raw_dataframe.copy())
+        self.facet_overview = None
+
+    def measure(self, group: str, component: str, function, setup=None):
+
+        """This function times a component 'repeat' times and records the result.
+        If the component raises an exception, the error is recorded instead of a time.
+
+        Parameters
+        ----------
+        group: str
+            The group the component belongs to.
+        component: str
+            The name of the component.
+        function: callable
+            The component to time. It is called with the arguments returned by 'setup'.
+        setup: callable, None
+            An untimed function called before every run, returning a tuple of arguments for 'function'.
+        """
+
+        if self.groups is not None and group not in self.groups:
+            return
+
+        timings = []
+        result = {"group": group,
+                  "component": component,
+                  "rows": self.dataset.n_rows,
+                  "columns": self.dataset.n_columns,
+                  "cardinality": self.dataset.cardinality,
+                  "date_format": self.dataset.date_format,
+                  "null_ratio": self.dataset.null_ratio,
+                  "seed": self.dataset.seed}
+
+        try:
+            for run in range(0, self.repeat):
+                arguments = setup() if setup is not None else ()
+                start = time.perf_counter()
+                output = function(*arguments)
+                timings.append(time.perf_counter() - start)
+                for figure in (output if isinstance(output, list) else [output]):
+                    if isinstance(figure, plt.Figure):
+                        plt.close(figure)
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+
+        if len(timings) > 0:
+            result.update({"repeat": len(timings),
+                           "min_s": min(timings),
+                           "median_s": statistics.median(timings),
+                           "mean_s": statistics.mean(timings)})
+
+        self.results.append(result)
+        status = f"{result['median_s']:.4f}s" if "median_s" in result else result.get("error")
+        print(f"[{group}] {component} (rows={self.dataset.n_rows}, columns={self.dataset.n_columns}): {status}", file=sys.stderr)
+
+    def skip(self, group: str, component: str, reason: str):
+
+        """This function records a component that can't be timed on the dataset, with the reason why.
+
+        Parameters
+        ----------
+        group: str
+            The group the component belongs to.
+        component: str
+            The name of the component.
+        reason: str
+            Why the component was skipped.
+        """
+
+        if self.groups is not None and group not in self.groups:
+            return
+
+        self.results.append({"group": group,
+                             "component": component,
+                             "rows": self.dataset.n_rows,
+                             "columns": self.dataset.n_columns,
+                             "cardinality": self.dataset.cardinality,
+                             "date_format": self.dataset.date_format,
+                             "null_ratio": self.dataset.null_ratio,
+                             "seed": self.dataset.seed,
+                             "skipped": reason})
+        print(f"[{group}] {component} (rows={self.dataset.n_rows}, columns={self.dataset.n_columns}): skipped ({reason})", file=sys.stderr)
+
+    def chart_dataframe(self, chart_type: str):
+
+        """This function returns the converted DataFrame a chart type is timed on. A Facet Plot is timed on its own DataFrame,
+        with a different 'x-axis' value in every row (see 'SyntheticDataset.create_facet_dataframe').
+
+        Parameters
+        ----------
+        chart_type: str
+            The chart type (Line, Scatter, Bar, etc.)
+        """
+
+        if chart_type != 'Facet':
+            return self.overview.dataframe
+        if self.facet_overview is None:
+            self.facet_overview = DataframeOverview(pd.read_csv(self.dataset.write_file(self.data_dir, facet=True)))
+        return self.facet_overview.dataframe
+
+    def columns_of_kind(self, kind: str):
+
+        "This function returns the raw columns generated as a given kind (see 'SyntheticDataset.column_kinds')."
+
+        return [column for column in self.raw_dataframe.columns if column.startswith(kind + "_")]
+
+    def bench_file(self):
+
+        "Times loading the file through the 'FileController' (without the cache, from the sidecar cache, and with column projection)."
+
+        def load_without_cache():
+            os.environ["AUTOGRAPHICA_CACHE"] = "off"
+            try:
+                return FileController(self.file_path).dataframe
+            finally:
+                os.environ.pop("AUTOGRAPHICA_CACHE", None)
+
+        def load_and_convert():
+            DataframeOverview(FileController(self.file_path).dataframe)
+
+        self.measure("file", "FileController.read_csv", load_without_cache)
+        # The first run writes the sidecar, so the warm load is timed after it.
+        load_and_convert()
+        self.measure("file", "FileController.sidecar", lambda: FileController(self.file_path).dataframe)
+        self.measure("file", "FileController.projected[Histogram]", lambda: FileController(self.file_path, "Histogram").dataframe)
+
+    def bench_profiling(self):
+
+        "Times 'DataframeOverview' on the raw DataFrame, and 'ColumnAttributes' on every converted column."
+
+        self.measure("profiling", "DataframeOverview", DataframeOverview, setup=lambda: (self.raw_dataframe.copy(),))
+
+        converted_dataframe = self.overview.dataframe
+        self.measure("profiling", "ColumnAttributes[all columns]",
+                     lambda: [ColumnAttributes(converted_dataframe[column]) for column in converted_dataframe.columns])
+
+    def bench_datetime(self):
+
+        "Times each 'DateTimeOperations' detector on the date, time and datetime columns."
+
+        dt = DateTimeOperations()
+        for kind in ['date', 'time', 'datetime']:
+            for column in self.columns_of_kind(kind)[:1]:
+                pd_series = self.raw_dataframe[column]
+                for detector in ['acceptable_date_format', 'acceptable_time_format', 'acceptable_date_time_format',
+                                 'determine_date', 'determine_time', 'determine_date_and_time', 'main_converter']:
+                    self.measure("datetime", f"DateTimeOperations.{detector}[{kind}]", getattr(dt, detector), setup=lambda: (pd_series,))
+
+                if kind == 'date':
+                    self.measure("datetime", f"DateTimeOperations.return_date_format[{kind}]", dt.return_date_format, setup=lambda: (pd_series,))
+                    self.measure("datetime", f"DateTimeOperations.is_date[{kind}]", dt.is_date, setup=lambda: (pd_series.iloc[0],))
+                if kind == 'datetime':
+                    self.measure("datetime", f"DateTimeOperations.check_empty_time_data[{kind}]", dt.check_empty_time_data, setup=lambda: (pd_series,))
+                    self.measure("datetime", f"DateTimeOperations.split_date_time[{kind}]", dt.split_date_time,
+                                 setup=lambda: (self.raw_dataframe[[column]].copy(), column, 0))
+
+    def bench_facets(self):
+
+        "Times the 'Facets' partitioning of the highest cardinality column."
+
+        nominal_columns = [column for column in self.columns_of_kind('nominal') if column in self.overview.dataframe.columns]
+        if len(nominal_columns) == 0:
+            return
+
+        dataframe = self.overview.dataframe
+        column = nominal_columns[0]
+        self.measure("facets", "Facets.facet_cardinal_series", lambda: Facets.facet_cardinal_series(dataframe[column], 10))
+        self.measure("facets", "Facets.calculate_nrows_ncols", lambda: Facets.calculate_nrows_ncols(dataframe, column, 10))
+        self.measure("facets", "Facets.create_faceted_dataframes", lambda: Facets.create_faceted_dataframes(dataframe, column, 10))
+
+    def bench_plotting(self):
+
+        "Times the 'Plotting' helpers that process a whole column."
+
+        plot_funcs = Plotting()
+        categorical_columns = [column for column in self.columns_of_kind('ordinal') + self.columns_of_kind('nominal')
+                               if column in self.overview.dataframe.columns]
+        if len(categorical_columns) == 0:
+            return
+
+        pd_series = self.overview.dataframe[categorical_columns[0]]
+        self.measure("plotting", "Plotting.unique_threshold", lambda: plot_funcs.unique_threshold(pd_series))
+        self.measure("plotting", "Plotting.set_xaxis_rotation", lambda: plot_funcs.set_xaxis_rotation(None, pd_series))
+        self.measure("plotting", "Plotting.space_legend_out", lambda: plot_funcs.space_legend_out(pd_series, None))
+        self.measure("plotting", "Plotting.create_percentage_data", lambda: plot_funcs.create_percentage_data(pd_series))
+        self.measure("plotting", "Plotting.pie_chart_size_parameters", lambda: plot_funcs.pie_chart_size_parameters(pd_series))
+        self.measure("plotting", "Plotting.explode_slice", lambda: plot_funcs.explode_slice(pd_series, "Largest"))
+        self.measure("plotting", "Plotting.check_categorical_dtype", plot_funcs.check_categorical_dtype,
+                     setup=lambda: (self.overview.dataframe[[categorical_columns[0]]].copy(deep=False), categorical_columns[0]))
+
+    def record_first_chart(self, chart_instance, chart_type: str):
+
+        """This function returns the create method and arguments of the first chart 'plot_multiple_charts' would create,
+        without creating any charts.
+
+        Parameters
+        ----------
+        chart_instance: object
+            An instance of a chart class (LineGraph, ScatterPlot, BarChart, etc.)
+        chart_type: str
+            The chart type of the instance.
+        """
+
+        if chart_type == 'Facet':
+            if len(chart_instance.high_cardinal_x_variables) == 0 or len(chart_instance.y_list) == 0:
+                return None
+            return 'plot_facet_chart', (chart_instance.high_cardinal_x_variables[0], chart_instance.y_list[0]), {}
+
+        recorded = []
+        for method_name in self.chart_create_methods[chart_type]:
+            def recorder(*args, method_name=method_name, **kwargs):
+                recorded.append((method_name, args, kwargs))
+                raise FirstChartCall()
+            setattr(chart_instance, method_name, recorder)
+
+        try:
+            chart_instance.plot_multiple_charts()
+        except FirstChartCall:
+            pass
+        finally:
+            for method_name in self.chart_create_methods[chart_type]:
+                delattr(chart_instance, method_name)
+
+        return recorded[0] if len(recorded) > 0 else None
+
+    def bench_charts(self):
+
+        """Times the creation of each chart instance, and the create method of the first chart of each chart type.
+        The Facet Plot is timed on the Facet Plot DataFrame of the dataset ('cardinality' rows), or skipped if its cardinality is too low."""
+
+        for chart_type, n_parameters in self.chart_parameter_counts.items():
+            if chart_type == 'Facet' and self.dataset.facet_compatible() is False:
+                self.skip("charts", f"{chart_type}.plot_facet_chart",
+                          f"a Facet Plot needs more than {SyntheticDataset.facet_threshold} unique values (cardinality={self.dataset.cardinality})")
+                continue
+
+            chart_parameters = [None] * n_parameters
+            dataframe = self.chart_dataframe(chart_type)
+            self.measure("charts", f"{chart_type}.__init__",
+                         lambda: CreateChartInstance(dataframe, chart_type, chart_parameters).validate_chart_attributes())
+
+            if self.groups is not None and "charts" not in self.groups:
+                continue
+
+            chart_instance = CreateChartInstance(dataframe, chart_type, chart_parameters).validate_chart_attributes()
+            first_chart = self.record_first_chart(chart_instance, chart_type) if chart_instance is not None else None
+            if first_chart is None:
+                continue
+
+            method_name, args, kwargs = first_chart
+            self.measure("charts", f"{chart_type}.{method_name}", lambda: getattr(chart_instance, method_name)(*args, **kwargs))
+
+    def run(self):
+
+        "This function times every group of components and returns the results."
+
+        self.bench_file()
+        self.bench_profiling()
+        self.bench_datetime()
+        self.bench_facets()
+        self.bench_plotting()
+        self.bench_charts()
+        return self.results
+
+
+def compare_results(results: list, baseline_path: str, threshold: float):
+
+    """This function compares the median times of two benchmark runs and returns every component that became slower by more than the threshold.
+
+    Parameters
+    ----------
+    results: list
+        The results of the current run.
+    baseline_path: str
+        The path to the JSON file of a previous run.
+    threshold: float
+        The ratio (current / baseline) above which a component is flagged as a regression.
+    """
+
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    def result_key(result):
+        return (result["component"], result["rows"], result["columns"], result["cardinality"], result["date_format"], result["null_ratio"])
+
+    baseline_medians = {result_key(result): result["median_s"] for result in baseline["results"] if "median_s" in result}
+    regressions = []
+    for result in results:
+        baseline_median = baseline_medians.get(result_key(result))
+        if baseline_median is not None and "median_s" in result and baseline_median > 0:
+            ratio = result["median_s"] / baseline_median
+            if ratio > threshold:
+                regressions.append({"component": result["component"], "rows": result["rows"], "columns": result["columns"],
+                                    "baseline_s": baseline_median, "current_s": result["median_s"], "ratio": round(ratio, 2)})
+
+    return regressions
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Time each AutoGraphica component over a matrix of synthetic datasets.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--columns", type=int, nargs="+", default=[9])
+    parser.add_argument("--cardinality", type=int, nargs="+", default=[50])
+    parser.add_argument("--date-format", nargs="+", default=["dmy"], choices=list(SyntheticDataset.date_formats.keys()))
+    parser.add_argument("--null-ratio", type=float, nargs="+", default=[0.0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--groups", nargs="+", default=None, choices=["file", "profiling", "datetime", "facets", "plotting", "charts"])
+    parser.add_argument("--data-dir", default=None, help="where the synthetic files are written (defaults to a temporary directory)")
+    parser.add_argument("--output", default=None, help="the JSON file the results are written to (defaults to stdout)")
+    parser.add_argument("--compare", default=None, help="a previous JSON result file to check for regressions against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="the slowdown ratio flagged as a regression")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir if args.data_dir is not None else tempfile.mkdtemp(prefix="autographica_bench_")
+    results = []
+    for n_rows in args.rows:
+        for n_columns in args.columns:
+            for cardinality in args.cardinality:
+                for date_format in args.date_format:
+                    for null_ratio in args.null_ratio:
+                        dataset = SyntheticDataset(n_rows=n_rows, n_columns=n_columns, cardinality=cardinality,
+                                                   date_format=date_format, null_ratio=null_ratio, seed=args.seed)
+                        results.extend(ComponentBenchmarks(dataset, data_dir, repeat=args.repeat, groups=args.groups).run())
+
+    output = {"meta": {"benchmark": "components",
+                       "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "python": platform.python_version(),
+                       "platform": platform.platform(),
+                       "pandas": pd.__version__,
+                       "matplotlib": matplotlib.__version__},
+              "results": results}
+
+    if args.compare is not None:
+        output["regressions"] = compare_results(results, args.compare, args.threshold)
+        for regression in output["regressions"]:
+            print(f"REGRESSION {regression['component']} (rows={regression['rows']}, columns={regression['columns']}): "
+                  f"{regression['baseline_s']:.4f}s -> {regression['current_s']:.4f}s (x{regression['ratio']})", file=sys.stderr)
+
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump(output, output_file, indent=2)
+    else:
+        print(json.dumps(output, indent=2))
@@ -0,0 +1,271 @@
+"""benchmarks.bench_end_to_end
+A headless, end-to-end benchmark of AutoGraphica, which runs the full path a batch reporting job takes
+(FileController -> CreateChartInstance.validate_chart_attributes -> plot_multiple_charts -> PNG encode) for every chart type,
+over a matrix of dataset sizes, widths and worker counts.
+For each combination it reports the charts per second, the p50/p95 per-chart latency, the peak RSS and the time to first chart,
+which is used to size the hardware of the batch jobs.
+
+Example
+-------
+python benchmarks/bench_end_to_end.py --rows 10000 100000 1000000 10000000 --columns 5 50 500 --workers 1 2 4 8 --output end_to_end.json
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import argparse
+import importlib
+import platform
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+file_dir = os.path.dirname(os.path.abspath(__file__))
+app_dir = os.path.join(os.path.dirname(file_dir), "app_files")
+for path in [file_dir, app_dir, os.path.join(app_dir, "root")]:
+    if path not in sys.path:
+        sys.path.append(path)
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+
+from synthetic_data import SyntheticDataset
+from bench_components import ComponentBenchmarks, FirstChartCall
+
+try:
+    import resource
+except ImportError:  # Windows has no 'resource' module, peak RSS is then not reported.
+    resource = None
+
+
+def peak_rss_mb(who=None):
+
+    """This function returns the peak resident set size (in MB) of this process, or of its finished child processes.
+
+    Parameters
+    ----------
+    who: int, None
+        Either 'resource.RUSAGE_SELF' (the default) or 'resource.RUSAGE_CHILDREN'.
+    """
+
+    if resource is None:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF if who is None else who).ru_maxrss
+    # 'ru_maxrss' is in bytes on macOS and in kilobytes everywhere else.
+    return max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+
+
+def run_chart_job(file_path: str, chart_type: str, max_charts=None):
+
+    """This function runs a single chart job end to end, in the same order as the app, and returns its timings.
+    Each create method of the chart instance is wrapped to time every chart it creates,
+    the per-chart latency is the time to create the chart plus the time to encode it as a PNG.
+
+    Parameters
+    ----------
+    file_path: str
+        The path to the file the charts are created from.
+    chart_type: str
+        The chart type (Line, Scatter, Bar, etc.)
+    max_charts: int, None
+        The maximum number of charts created by the job, as wide files can create thousands of charts per chart type.
+    """
+
+    from instantiation_file_controller import FileController
+    from instantiation_create_chart_instance import CreateChartInstance
+    import matplotlib.pyplot as plt
+
+    job = {"chart_type": chart_type, "charts": 0, "latencies_s": [], "time_to_first_chart_s": None, "error": None}
+    job_start = time.perf_counter()
+
+    try:
+        dataframe = FileController(file_path, chart_type).dataframe
+        chart_parameters = [None] * ComponentBenchmarks.chart_parameter_counts[chart_type]
+        chart_instance = CreateChartInstance(dataframe, chart_type, chart_parameters).validate_chart_attributes()
+        job["load_s"] = time.perf_counter() - job_start
+
+        if chart_instance is None:
+            job["error"] = "no chart instance was created"
+            return job
+
+        created = []
+        create_methods = ['create_chart'] if chart_type == 'Facet' else ComponentBenchmarks.chart_create_methods[chart_type]
+        for method_name in create_methods:
+            create_method = getattr(chart_instance, method_name)
+
+            def timed_create(*args, create_method=create_method, **kwargs):
+                if max_charts is not None and len(created) >= max_charts:
+                    raise FirstChartCall()
+                start = time.perf_counter()
+                figure = create_method(*args, **kwargs)
+                created.append((figure, time.perf_counter() - start))
+                return figure
+
+            setattr(chart_instance, method_name, timed_create)
+
+        try:
+            if chart_type == 'Facet':
+                chart_instance.plot_facet_chart(chart_instance.high_cardinal_x_variables[0], chart_instance.y_list[0])
+            else:
+                chart_instance.plot_multiple_charts()
+        except FirstChartCall:
+            pass
+
+        for figure, create_s in created:
+            start = time.perf_counter()
+            png_buffer = io.BytesIO()
+            figure.savefig(png_buffer, format="png")
+            plt.close(figure)
+            job["latencies_s"].append(create_s + time.perf_counter() - start)
+            if job["time_to_first_chart_s"] is None:
+                job["time_to_first_chart_s"] = time.perf_counter() - job_start
+
+        job["charts"] = len(created)
+
+    except Exception as e:
+        job["error"] = f"{type(e).__name__}: {e}"
+
+    job["job_s"] = time.perf_counter() - job_start
+    job["peak_rss_mb"] = peak_rss_mb()
+    return job
+
+
+def initialize_worker(use_cache: bool):
+
+    "This function sets up each worker process (headless backend, cache setting) and imports the app modules ahead of the first job."
+
+    matplotlib.use("Agg")
+    if use_cache is False:
+        os.environ["AUTOGRAPHICA_CACHE"] = "off"
+    for module_name in ['instantiation_file_controller', 'instantiation_create_chart_instance']:
+        importlib.import_module(module_name)
+
+
+def percentile(values: list, q: float):
+
+    "This function returns the 'q'th percentile of a list of values, or None if the list is empty."
+
+    return float(np.percentile(values, q)) if len(values) > 0 else None
+
+
+def run_scenario(file_path: str, chart_types: list, n_workers: int, jobs_per_type: int, max_charts=None, use_cache=False, facet_file_path=None):
+
+    """This function runs every chart job of a scenario through a pool of worker processes and summarises the results.
+
+    Parameters
+    ----------
+    file_path: str
+        The path to the file the charts are created from.
+    chart_types: list
+        The chart types to run a job for.
+    n_workers: int
+        The number of worker processes.
+    jobs_per_type: int
+        The number of jobs run per chart type.
+    max_charts: int, None
+        The maximum number of charts created per job.
+    use_cache: bool
+        Whether the workers may load the file from the sidecar cache (see 'support_file_cache').
+    facet_file_path: str, None
+        The path to the file the Facet Plot jobs are run on (see 'SyntheticDataset.create_facet_dataframe').
+        'None' skips the Facet Plot jobs, as no Facet Plot can be made from the dataset.
+    """
+
+    skipped_types = ['Facet'] if facet_file_path is None and 'Facet' in chart_types else []
+    jobs = [chart_type for chart_type in chart_types if chart_type not in skipped_types for job_index in range(0, jobs_per_type)]
+    job_files = [facet_file_path if chart_type == 'Facet' else file_path for chart_type in jobs]
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=initialize_worker, initargs=(use_cache,)) as executor:
+        # Warm every worker up, so the pool start-up is not timed.
+        list(executor.map(time.sleep, [0.1] * n_workers))
+        start = time.perf_counter()
+        results = list(executor.map(run_chart_job, job_files, jobs, [max_charts] * len(jobs)))
+        wall_s = time.perf_counter() - start
+
+    latencies = [latency for result in results for latency in result["latencies_s"]]
+    first_charts = [result["time_to_first_chart_s"] for result in results if result["time_to_first_chart_s"] is not None]
+    n_charts = sum(result["charts"] for result in results)
+    worker_rss = [result["peak_rss_mb"] for result in results if result.get("peak_rss_mb") is not None]
+
+    summary = {"workers": n_workers,
+               "jobs": len(jobs),
+               "charts": n_charts,
+               "wall_s": wall_s,
+               "charts_per_s": n_charts / wall_s if wall_s > 0 else None,
+               "latency_p50_s": percentile(latencies, 50),
+               "latency_p95_s": percentile(latencies, 95),
+               "time_to_first_chart_p50_s": percentile(first_charts, 50),
+               "time_to_first_chart_min_s": min(first_charts) if len(first_charts) > 0 else None,
+               "peak_rss_mb": max(worker_rss) if len(worker_rss) > 0 else None,
+               "chart_types": {}}
+
+    for chart_type in skipped_types:
+        summary["chart_types"][chart_type] = {"skipped": f"a Facet Plot needs more than {SyntheticDataset.facet_threshold} unique values in a column"}
+
+    for chart_type in [chart_type for chart_type in chart_types if chart_type not in skipped_types]:
+        type_results = [result for result in results if result["chart_type"] == chart_type]
+        type_latencies = [latency for result in type_results for latency in result["latencies_s"]]
+        summary["chart_types"][chart_type] = {"charts": sum(result["charts"] for result in type_results),
+                                              "latency_p50_s": percentile(type_latencies, 50),
+                                              "latency_p95_s": percentile(type_latencies, 95),
+                                              "errors": sorted(set(result["error"] for result in type_results if result["error"] is not None))}
+
+    return summary
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Run AutoGraphica end to end (file -> charts -> PNG) over a matrix of dataset sizes and worker counts.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--columns", type=int, nargs="+", default=[5, 50])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--chart-types", nargs="+", default=list(ComponentBenchmarks.chart_parameter_counts.keys()),
+                        choices=list(ComponentBenchmarks.chart_parameter_counts.keys()))
+    parser.add_argument("--jobs-per-type", type=int, default=1)
+    parser.add_argument("--max-charts", type=int, default=50, help="the maximum number of charts per job (0 for no limit)")
+    parser.add_argument("--cardinality", type=int, default=50)
+    parser.add_argument("--date-format", default="dmy", choices=list(SyntheticDataset.date_formats.keys()))
+    parser.add_argument("--null-ratio", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="let the workers load the files from the sidecar cache")
+    parser.add_argument("--data-dir", default=None, help="where the synthetic files are written (defaults to a temporary directory)")
+    parser.add_argument("--output", default=None, help="the JSON file the results are written to (defaults to stdout)")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir if args.data_dir is not None else tempfile.mkdtemp(prefix="autographica_bench_")
+    os.environ["AUTOGRAPHICA_CACHE_DIR"] = os.path.join(data_dir, "cache")
+    max_charts = args.max_charts if args.max_charts > 0 else None
+
+    results = []
+    for n_rows in args.rows:
+        for n_columns in args.columns:
+            dataset = SyntheticDataset(n_rows=n_rows, n_columns=n_columns, cardinality=args.cardinality,
+                                       date_format=args.date_format, null_ratio=args.null_ratio, seed=args.seed)
+            file_path = dataset.write_file(data_dir)
+            # The Facet Plot jobs are run on a file a Facet Plot can be made from (one row per 'x-axis' value).
+            facet_file_path = dataset.write_file(data_dir, facet=True) if dataset.facet_compatible() is True else None
+            for n_workers in args.workers:
+                summary = run_scenario(file_path, args.chart_types, n_workers, args.jobs_per_type, max_charts, args.cache, facet_file_path)
+                summary.update({"rows": n_rows, "columns": n_columns, "file_mb": os.path.getsize(file_path) / (1024 * 1024)})
+                results.append(summary)
+                print(f"rows={n_rows} columns={n_columns} workers={n_workers}: {summary['charts']} charts, "
+                      f"{summary['charts_per_s']:.2f} charts/s, p50={summary['latency_p50_s']}s, p95={summary['latency_p95_s']}s, "
+                      f"peak RSS={summary['peak_rss_mb']}MB", file=sys.stderr)
+
+    output = {"meta": {"benchmark": "end_to_end",
+                       "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "python": platform.python_version(),
+                       "platform": platform.platform(),
+                       "cpu_count": os.cpu_count(),
+                       "max_charts_per_job": max_charts,
+                       "cache": args.cache},
+              "results": results}
+
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump(output, output_file, indent=2)
+    else:
+        print(json.dumps(output, indent=2))
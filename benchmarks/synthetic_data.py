@@ -0,0 +1,183 @@
+"""benchmarks.synthetic_data
+A module for generating seeded, synthetic datasets that look like the files AutoGraphica is given by its users,
+so that the benchmarks can measure how each component scales with the number of rows, columns, the cardinality
+of the categorical columns, the date format used and the ratio of null values.
+Run as a script to write a dataset to disk.
+"""
+
+import os
+import argparse
+import numpy as np
+import pandas as pd
+
+
+class SyntheticDataset:
+
+    """
+    A class for instantiating a 'synthetic dataset' object, which generates a DataFrame with a mix of columns of every data category
+    (see 'support_main_classes.ColumnAttributes'). The same seed always generates the same DataFrame.
+
+    Attributes
+    ----------
+    n_rows: int
+        The number of rows in the DataFrame.
+    n_columns: int
+        The number of columns in the DataFrame. The column kinds are cycled through (see 'column_kinds'), starting with a date column.
+    cardinality: int
+        The number of unique values in each 'Nominal' column.
+    date_format: str
+        The format of the date columns, one of the keys of 'date_formats'.
+    null_ratio: float
+        The ratio of values (0.0 - 1.0) that are null in the numeric and text columns.
+        The date and time columns never contain nulls, as AutoGraphica only converts complete date/time columns.
+    seed: int
+        The seed of the random number generator.
+    """
+
+    date_formats = {'dmy': '%d/%m/%Y',
+                    'mdy': '%m/%d/%Y',
+                    'iso': '%Y-%m-%d',
+                    'dotted': '%d.%m.%Y'}
+
+    column_kinds = ['date', 'continuous', 'nominal', 'discrete', 'ordinal', 'binary', 'time', 'continuous', 'datetime']
+
+    # A Facet Plot is only made from a column with more unique values than this (see 'support_plotting.Plotting.unique_threshold').
+    facet_threshold = 30
+
+    def __init__(self, n_rows=10000, n_columns=9, cardinality=50, date_format='dmy', null_ratio=0.0, seed=0):
+
+        if date_format not in self.date_formats:
+            raise ValueError(f"'date_format' must be one of {list(self.date_formats.keys())}")
+
+        self.n_rows = n_rows
+        self.n_columns = n_columns
+        self.cardinality = cardinality
+        self.date_format = date_format
+        self.null_ratio = null_ratio
+        self.seed = seed
+
+    def create_column(self, kind: str, rng):
+
+        """This function creates the values of a single column.
+
+        Parameters
+        ----------
+        kind: str
+            The kind of column, one of 'column_kinds'.
+        rng: np.random.Generator
+            The random number generator shared by all columns.
+        """
+
+        if kind == 'date':
+            # Consecutive days, like a daily export.
+            dates = pd.Timestamp("2015-01-01") + pd.to_timedelta(np.arange(self.n_rows) % 3650, unit="D")
+            return dates.strftime(self.date_formats[self.date_format])
+        elif kind == 'time':
+            seconds = rng.integers(0, 24 * 60 * 60, self.n_rows)
+            return pd.to_datetime(seconds, unit="s").strftime('%H:%M:%S')
+        elif kind == 'datetime':
+            datetimes = pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.integers(0, 3650 * 24 * 60, self.n_rows), unit="min")
+            return datetimes.strftime(self.date_formats[self.date_format] + ' %H:%M:%S')
+        elif kind == 'continuous':
+            return rng.normal(100, 25, self.n_rows).round(3)
+        elif kind == 'discrete':
+            return rng.integers(0, 1000, self.n_rows)
+        elif kind == 'nominal':
+            return np.array([f"Item_{value}" for value in range(max(self.cardinality, 10))])[rng.integers(0, max(self.cardinality, 10), self.n_rows)]
+        elif kind == 'ordinal':
+            return np.array(["Low", "Medium", "High", "Very High"])[rng.integers(0, 4, self.n_rows)]
+        elif kind == 'binary':
+            return rng.integers(0, 2, self.n_rows)
+        else:
+            raise ValueError(f"'kind' must be one of {self.column_kinds}")
+
+    def create_dataframe(self):
+
+        "This function returns the synthetic DataFrame, as it would be read from a csv file (i.e. before any conversion)."
+
+        rng = np.random.default_rng(self.seed)
+        columns = {}
+
+        for column_index in range(0, self.n_columns):
+            kind = self.column_kinds[column_index % len(self.column_kinds)]
+            values = pd.Series(self.create_column(kind, rng))
+
+            if self.null_ratio > 0 and kind not in ['date', 'time', 'datetime', 'binary']:
+                values = values.mask(rng.random(self.n_rows) < self.null_ratio)
+
+            # Lowercase names, so they never clash with the 'Date_n'/'Time_n' columns created when a datetime column is split.
+            columns[f"{kind}_{column_index}"] = values
+
+        return pd.DataFrame(columns)
+
+    def create_facet_dataframe(self):
+
+        """This function returns a DataFrame a Facet Plot can be made from, as it would be read from a csv file.
+        A Facet Plot draws one bar per row of each facet, so its 'x-axis' column must hold a different value in every row
+        (like a summary table, e.g. one row per generator), which none of the columns of 'create_dataframe' do.
+        It has one row per unique value ('cardinality' rows), and a 'Continuous' and a 'Discrete' column to plot along the 'y-axis'."""
+
+        rng = np.random.default_rng(self.seed)
+        labels = np.array([f"Item_{value}" for value in range(self.cardinality)])
+        return pd.DataFrame({"nominal_0": labels,
+                             "continuous_1": rng.normal(100, 25, self.cardinality).round(3),
+                             "discrete_2": rng.integers(0, 1000, self.cardinality)})
+
+    def facet_compatible(self):
+
+        "This function determines whether a Facet Plot can be made from the dataset, i.e. whether its cardinality is high enough."
+
+        return self.cardinality > self.facet_threshold
+
+    def write_file(self, directory: str, extension='.csv', facet=False):
+
+        """This function writes the synthetic DataFrame to a file and returns the path to the file.
+        The name of the file records every parameter, so the same dataset is only written once per directory.
+
+        Parameters
+        ----------
+        directory: str
+            The directory the file is written to.
+        extension: str
+            The file extension, either '.csv' or '.xlsx'.
+        facet: bool
+            Whether to write the Facet Plot DataFrame (see 'create_facet_dataframe'), rather than the main DataFrame.
+        """
+
+        prefix = "synthetic_facet" if facet is True else "synthetic"
+        file_name = f"{prefix}_r{self.n_rows}_c{self.n_columns}_k{self.cardinality}_{self.date_format}_n{self.null_ratio}_s{self.seed}{extension}"
+        file_path = os.path.join(directory, file_name)
+
+        if os.path.isfile(file_path) is False:
+            os.makedirs(directory, exist_ok=True)
+            dataframe = self.create_facet_dataframe() if facet is True else self.create_dataframe()
+            if extension == '.csv':
+                dataframe.to_csv(file_path, index=False)
+            elif extension == '.xlsx':
+                dataframe.to_excel(file_path, index=False)
+            else:
+                raise ValueError("'extension' must be either '.csv' or '.xlsx'")
+
+        return file_path
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic dataset for benchmarking AutoGraphica.")
+    parser.add_argument("directory", help="the directory the file is written to")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--columns", type=int, default=9)
+    parser.add_argument("--cardinality", type=int, default=50)
+    parser.add_argument("--date-format", default="dmy", choices=list(SyntheticDataset.date_formats.keys()))
+    parser.add_argument("--null-ratio", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--extension", default=".csv", choices=[".csv", ".xlsx"])
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(n_rows=args.rows,
+                               n_columns=args.columns,
+                               cardinality=args.cardinality,
+                               date_format=args.date_format,
+                               null_ratio=args.null_ratio,
+                               seed=args.seed)
+    print(dataset.write_file(args.directory, args.extension))
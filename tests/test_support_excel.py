@@ -0,0 +1,44 @@
+"""tests.test_support_excel
+Checks that 'ExcelReader' reads a workbook into the same DataFrame as 'pd.read_excel', including the rows of null values within the data.
+"""
+
+import os
+import sys
+root_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app_files", "root")
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
+
+import pandas as pd
+import pandas.testing as tm
+import pytest
+from support_excel import ExcelReader
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+
+    "This function writes a workbook of two sheets, whose columns hold null values (including whole rows of them within the data)."
+
+    dataframe = pd.DataFrame({"A": [1, 2, None, 4, None, 6],
+                              "B": ["x", None, None, "y", None, "z"],
+                              "C": [None, None, None, 3.5, None, None]})
+    file_path = str(tmp_path / "nulls.xlsx")
+    with pd.ExcelWriter(file_path) as writer:
+        dataframe.to_excel(writer, sheet_name="First", index=False)
+        dataframe.to_excel(writer, sheet_name="Second", index=False)
+    return file_path
+
+
+@pytest.mark.parametrize("usecols", [["A"], ["B"], ["C"], ["A", "B"], None])
+def test_read_keeps_null_rows(workbook_path, usecols):
+    result = ExcelReader(workbook_path).read(usecols=usecols)
+    expected = pd.read_excel(workbook_path, usecols=usecols)
+    tm.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("usecols", [["A"], ["B"], None])
+def test_read_sheets_keeps_null_rows(workbook_path, usecols):
+    result = ExcelReader(workbook_path).read(["First", "Second"], usecols=usecols)
+    expected = pd.concat([pd.read_excel(workbook_path, sheet_name=sheet_name, usecols=usecols) for sheet_name in ["First", "Second"]], ignore_index=True)
+    tm.assert_frame_equal(result.drop(columns="Sheet"), expected)
+    assert list(result["Sheet"]) == ["First"] * 6 + ["Second"] * 6